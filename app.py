@@ -1,4 +1,4 @@
-from flask import Flask, render_template, session, redirect, url_for
+from flask import Flask, render_template, session, redirect, url_for, request
 from controllers.employee_controller import employee_controller
 from controllers.schedule_controller import schedule_controller
 from controllers.client_controller import client_controller
@@ -14,10 +14,27 @@ from controllers.pass_rental_usage_controller import pass_rental_usage_controlle
 from controllers.rental_controller import rental_controller
 from controllers.rental_equipment_controller import rental_equipment_controller
 from controllers.reports_controller import report_controller
+from controllers.gate_controller import gate_controller
 from middlewares.authentication_middleware import require_login_middleware
+from middlewares.query_plans import query_plan_middleware
+from middlewares.statement_budget import statement_budget_middleware
 from models import db, mail
 from models.saved_view import SavedView
+from models.saved_view_snapshot import SavedViewSnapshot
+from models.scan_journal import ScanJournalCheckpoint
 from config import Config
+from services.lift_usage_import_service import import_lift_usages_command
+from services.lift_usage_rollup_service import LiftUsageRollupService, rebuild_rollups_command
+from services.report_job_service import ReportJobService
+from services.report_service import compare_lift_backends_command
+from services.sales_cube_service import SalesCubeService, rebuild_sales_cube_command
+from services.saved_view_service import SavedViewService
+from services.scan_buffer_service import ScanBufferService
+from utils.indexes import create_indexes_command
+from utils.pass_validity_cache import PassValidityCache
+from utils.query_helper import QueryHelper
+from utils.report_executor import supports_concurrent_sessions
+from utils.text_search import TextSearch
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -32,8 +49,45 @@ app.secret_key = os.getenv('SESSION_SECRET_KEY')
 db.init_app(app)
 mail.init_app(app)
 
+models = [mapper.class_ for mapper in db.Model.registry.mappers]
+TextSearch.attach(models)
+
 with app.app_context():
     db.create_all()
+    TextSearch.install(db.engine, models)
+    LiftUsageRollupService.ensure_built()
+    SalesCubeService.ensure_built()
+    ReportJobService.resume_pending()
+    PassValidityCache.warm()
+    # Планувальник знімків збережених переглядів; SQLite у пам'яті (тести) ділити з потоком не можна
+    if app.config.get('SAVED_VIEW_SCHEDULER') and supports_concurrent_sessions(db.engine):
+        SavedViewService.start_scheduler(app)
+    if app.config.get('GATE_SCAN_MODE') == 'buffered':
+        ScanBufferService.start(app)
+
+QueryHelper.register_models(models)
+
+app.cli.add_command(create_indexes_command)
+app.cli.add_command(rebuild_rollups_command)
+app.cli.add_command(rebuild_sales_cube_command)
+app.cli.add_command(compare_lift_backends_command)
+app.cli.add_command(import_lift_usages_command)
+
+@app.template_global()
+def page_url(cursor):
+    """Посилання на поточну сторінку списку з іншим курсором (фільтри та сортування зберігаються)."""
+    args = request.args.to_dict(flat=False)
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+@app.template_global()
+def export_url(fmt):
+    """Посилання на експорт поточного відфільтрованого списку (без пагінації)."""
+    args = request.args.to_dict(flat=False)
+    args.pop('cursor', None)
+    args.pop('page_size', None)
+    args['export'] = fmt
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
 
 @app.route('/')
 def index():
@@ -42,6 +96,8 @@ def index():
     return render_template('index.html')
 
 require_login_middleware(app)
+query_plan_middleware(app)
+statement_budget_middleware(app)
 
 app.register_blueprint(employee_controller, url_prefix='/employees')
 app.register_blueprint(schedule_controller, url_prefix='/schedules')
@@ -71,6 +127,8 @@ app.register_blueprint(rental_equipment_controller, url_prefix='/rental_equipmen
 
 app.register_blueprint(report_controller, url_prefix='/reports')
 
+app.register_blueprint(gate_controller, url_prefix='/gates')
+
 if __name__ == '__main__':
     # Quick test: print all schedules for the first employee
     with app.app_context():
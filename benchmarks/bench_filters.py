@@ -0,0 +1,52 @@
+"""
+Мікробенчмарк побудови фільтрів у QueryHelper.
+
+Порівнює "холодну" побудову (план компілюється щоразу) з "теплою",
+коли план уже є в LRU-кеші і на запит лишається лише підставити значення.
+
+Запуск:  SQLALCHEMY_DATABASE_URI=sqlite:///:memory: python -m benchmarks.bench_filters
+"""
+import timeit
+
+from app import app
+from models.client import Client
+from models.key import Key
+from models.lift_usage import LiftUsage
+from utils.query_helper import QueryHelper
+
+ROUNDS = 2000
+
+CASES = {
+    'lift_usages': (
+        LiftUsage, {'LiftUsage': LiftUsage},
+        ['lift_id', 'usage_date', 'usage_time_start'], ['eq', 'gte', 'lt'], ['2', '2025-01-01', '12:00'],
+    ),
+    'clients': (
+        Client, {'Client': Client, 'Key': Key},
+        ['full_name', 'access_right', 'id'], ['like', 'in', 'gt'], ['ova', 'AUTHORIZED', '10'],
+    ),
+}
+
+
+def _build(model_class, models_map, cols, ops, vals):
+    return QueryHelper.apply_filters(model_class.query, models_map, cols, ops, vals)
+
+
+def _cold(*args):
+    QueryHelper.compile_filter_plan.cache_clear()
+    _build(*args)
+
+
+def main():
+    with app.app_context():
+        print(f'{"case":<14}{"cold, us":>12}{"warm, us":>12}{"speedup":>10}')
+        for name, args in CASES.items():
+            cold = timeit.timeit(lambda: _cold(*args), number=ROUNDS) / ROUNDS * 1e6
+            _build(*args)
+            warm = timeit.timeit(lambda: _build(*args), number=ROUNDS) / ROUNDS * 1e6
+            print(f'{name:<14}{cold:>12.1f}{warm:>12.1f}{cold / warm:>9.1f}x')
+        print(QueryHelper.compile_filter_plan.cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+Бенчмарк на синтетичному сезоні: генерація даних, усі звіти ReportService,
+усі сторінки-списки (через тестовий клієнт Flask) та шляхи запису абонементів і поїздок.
+
+Результат — JSON (--output), щоб порівнювати прогони на 10k, 1M і 10M поїздок між собою
+(--compare попередній.json друкує відношення медіан).
+
+Запуск (файлова БД — генератор її очищає лише з --reset):
+    SQLALCHEMY_DATABASE_URI=sqlite:////tmp/season.db python -m benchmarks.bench_season \\
+        --reset --lift-usages 1000000 --clients 50000 --output season-1m.json
+Повторний прогін на тих самих даних: без --reset (генерація пропускається).
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from app import app
+from benchmarks.season import SEASON_DAYS, SEASON_START, generate_season
+from models import db
+from models.client import Client
+from models.employee import Employee
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.pass_type import PassType
+from models.passes import Pass
+from services.gate_scan_service import GateScanService
+from services.lift_usage_service import LiftUsageService
+from services.pass_lift_usage_service import PassLiftUsageService
+from services.pass_service import PassService
+from services.report_service import ReportService, comparison_windows
+from utils.pass_validity_cache import PassValidityCache
+from utils.report_cache import ReportCache
+
+LIST_PAGES = (
+    '/employees/browse', '/schedules/', '/clients/', '/equipment_types/', '/equipment/list', '/tariffs/',
+    '/pass_types/', '/pass/', '/lifts/', '/lift_usages/', '/pass_lift_usages/', '/pass_rental_usages/',
+    '/rentals/', '/rental_equipment/',
+)
+
+
+def _timed(fn, repeat):
+    """Запускає fn repeat разів; повертає (тривалості в мс, результат останнього запуску)."""
+    durations, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations, result
+
+
+def _record(results, group, name, durations, rows=None):
+    results.append({
+        'group': group,
+        'name': name,
+        'runs': len(durations),
+        'min_ms': round(min(durations), 3),
+        'median_ms': round(statistics.median(durations), 3),
+        'max_ms': round(max(durations), 3),
+        'rows': rows,
+    })
+    print(f'{group:<8}{name:<46}{statistics.median(durations):>12.2f} ms'
+          f'{"" if rows is None else f"{rows:>10} rows"}', file=sys.stderr)
+
+
+def _report_scenarios():
+    """Назва -> виклик кожного методу ReportService з параметрами в межах згенерованого сезону."""
+    service = ReportService()
+    week_start = SEASON_START + datetime.timedelta(days=SEASON_DAYS // 2)
+    week_end = week_start + datetime.timedelta(days=6)
+    season_end = SEASON_START + datetime.timedelta(days=SEASON_DAYS - 1)
+    employee_id = db.session.scalar(select(func.min(Employee.id)))
+    pass_name = db.session.scalar(select(PassType.name).order_by(PassType.id))
+    return {
+        'get_clients_and_passes': lambda: service.get_clients_and_passes(),
+        'get_most_rented_equipment_weekly': lambda: service.get_most_rented_equipment_weekly(week_start, week_end),
+        'get_equipment_count_by_type_daily': lambda: service.get_equipment_count_by_type_daily(week_start),
+        'get_pass_sales_by_day': lambda: service.get_pass_sales_by_day(SEASON_START, season_end),
+        'get_pass_sales_by_type': lambda: service.get_pass_sales_by_type(SEASON_START, season_end),
+        'get_most_used_lifts_by_period': lambda: service.get_most_used_lifts_by_period(week_start, week_end),
+        'get_rental_revenue_by_month': lambda: service.get_rental_revenue_by_month(SEASON_START, season_end),
+        'get_rental_revenue_by_quarter': lambda: service.get_rental_revenue_by_quarter(SEASON_START, season_end),
+        'get_clients_with_exhausted_passes': lambda: service.get_clients_with_exhausted_passes(),
+        'get_clients_with_over_15_lifts_daily': lambda: service.get_clients_with_over_15_lifts_daily(week_start),
+        'get_clients_bought_pass_by_month': lambda: service.get_clients_bought_pass_by_month(
+            pass_name, week_start.year, week_start.month),
+        'get_equipment_tariffs_with_weekday_discount': lambda: service.get_equipment_tariffs_with_weekday_discount(),
+        'get_clients_visited_in_date_range': lambda: service.get_clients_visited_in_date_range(week_start, week_end),
+        'get_clients_visited_more_than_x_times': lambda: service.get_clients_visited_more_than_x_times(10),
+        'get_employee_rental_details': lambda: service.get_employee_rental_details(week_start, week_end),
+        'get_employee_rental_summary': lambda: service.get_employee_rental_summary(SEASON_START, season_end),
+        'get_employee_rentals_page': lambda: service.get_employee_rentals_page(employee_id),
+        'get_employees_working_on_date': lambda: service.get_employees_working_on_date(week_start),
+        'get_lift_usage_comparison': lambda: service.get_lift_usage_comparison(
+            comparison_windows(week_start, week_end)),
+        'get_pass_sales_comparison': lambda: service.get_pass_sales_comparison(
+            comparison_windows(week_start, week_end)),
+        'get_lift_load_by_time': lambda: service.get_lift_load_by_time(SEASON_START, season_end, 15),
+        'get_dashboard_kpis': lambda: service.get_dashboard_kpis(week_end),
+    }
+
+
+def bench_reports(results, repeat):
+    for name, call in _report_scenarios().items():
+        def cold():
+            # Кожен прогін — без кешу звітів, інакше вимірювався б лише пошук у словнику
+            ReportCache.clear()
+            return call()
+        durations, rows = _timed(cold, repeat)
+        _record(results, 'report', name, durations, len(rows))
+
+
+def bench_list_pages(results, repeat):
+    app.secret_key = app.secret_key or 'bench'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = db.session.scalar(select(func.min(Client.id)))
+        session['access_right'] = 'admin'
+    for url in LIST_PAGES:
+        durations, response = _timed(lambda: client.get(url), repeat)
+        if response.status_code != 200:
+            print(f'{url}: HTTP {response.status_code}', file=sys.stderr)
+        _record(results, 'page', url, durations)
+
+
+def bench_writes(results, operations):
+    """Шляхи запису через сервіси (з перерахунком агрегатів і кубу), по operations операцій кожен."""
+    client_id = db.session.scalar(select(func.min(Client.id)))
+    lift_id = db.session.scalar(select(func.min(Lift.id)))
+    lift_pass_type = db.session.scalar(select(PassType.id).where(PassType.limit_lifts > 0).order_by(PassType.id))
+    day = SEASON_START + datetime.timedelta(days=SEASON_DAYS // 2)
+    minutes = iter(range(10 ** 9))
+
+    def add_lift_usage():
+        minute = next(minutes) % (8 * 60)
+        return LiftUsageService.add(client_id, lift_id, day,
+                                    datetime.time(8 + minute // 60, minute % 60),
+                                    datetime.time(8 + minute // 60, minute % 60, 30))
+
+    durations, _ = _timed(add_lift_usage, operations)
+    _record(results, 'write', 'LiftUsageService.add', durations)
+
+    durations, _ = _timed(lambda: PassService.add(client_id, lift_pass_type, day, day, day), operations)
+    _record(results, 'write', 'PassService.add', durations)
+
+    # Кожна поїздка списується з власного свіжого абонемента з лімітом поїздок
+    pairs = iter([(PassService.add(client_id, lift_pass_type, day, day, day).id, add_lift_usage().id)
+                  for _ in range(operations)])
+    durations, _ = _timed(lambda: PassLiftUsageService.add(*next(pairs)), operations)
+    _record(results, 'write', 'PassLiftUsageService.add', durations)
+
+    # Той самий прохід через турнікет одним викликом: списання, поїздка та зв'язок в одній транзакції
+    scan_passes = iter([PassService.add(client_id, lift_pass_type, day, day, day).id for _ in range(operations)])
+    scan_times = iter(datetime.datetime.combine(day, datetime.time(9, 0)) + datetime.timedelta(seconds=i)
+                      for i in range(operations))
+    durations, _ = _timed(lambda: GateScanService.record_scan(next(scan_passes), lift_id, next(scan_times)),
+                          operations)
+    _record(results, 'write', 'GateScanService.record_scan', durations)
+
+
+def bench_gate_checks(results, operations):
+    """Перевірка абонемента на турнікеті: промах (читання з БД) і влучання в прогрітий кеш."""
+    rows = db.session.execute(select(Pass.id, Pass.valid_from).limit(operations)).all()
+    checks = [(pass_id, valid_from) for pass_id, valid_from in rows]
+
+    def validate_all():
+        for pass_id, day in checks:
+            try:
+                GateScanService.validate(pass_id, day)
+            except ValueError:
+                pass
+
+    def cold():
+        PassValidityCache.clear()
+        validate_all()
+
+    durations, _ = _timed(cold, 1)
+    _record(results, 'gate', 'validate (cache miss)', [d / max(len(checks), 1) for d in durations])
+    durations, _ = _timed(validate_all, 3)
+    _record(results, 'gate', 'validate (cache hit)', [d / max(len(checks), 1) for d in durations])
+
+
+def _table_counts():
+    return {model.__tablename__: db.session.scalar(select(func.count()).select_from(model))
+            for model in (Client, Lift, LiftUsage, Pass)}
+
+
+def _print_comparison(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['group'], r['name']): r['median_ms'] for r in json.load(f)['results']}
+    print(f'\n{"scenario":<54}{"base, ms":>12}{"now, ms":>12}{"ratio":>9}', file=sys.stderr)
+    for r in results:
+        before = baseline.get((r['group'], r['name']))
+        if before:
+            print(f'{r["group"] + " " + r["name"]:<54}{before:>12.2f}{r["median_ms"]:>12.2f}'
+                  f'{r["median_ms"] / before:>8.2f}x', file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark reports, list pages and write paths on a synthetic season.')
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables, then generate a season')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--lifts', type=int, default=12)
+    parser.add_argument('--lift-usages', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per read scenario')
+    parser.add_argument('--writes', type=int, default=100, help='operations per write scenario')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='previous JSON output to compare medians against')
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        meta = {
+            'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'database': db.engine.url.get_backend_name(),
+            'python': platform.python_version(),
+            'params': vars(args),
+        }
+        results = []
+
+        if args.reset:
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            meta['generated'] = generate_season(args.clients, args.lifts, args.lift_usages, seed=args.seed)
+            _record(results, 'setup', 'generate_season', [(time.perf_counter() - started) * 1000],
+                    meta['generated']['lift_usage'])
+        meta['tables'] = _table_counts()
+
+        bench_reports(results, args.repeat)
+        bench_list_pages(results, args.repeat)
+        bench_writes(results, args.writes)
+        bench_gate_checks(results, args.writes)
+
+    document = {'meta': meta, 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2, default=str)
+    else:
+        json.dump(document, sys.stdout, ensure_ascii=False, indent=2, default=str)
+    if args.compare:
+        _print_comparison(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Генератор синтетичного сезону для бенчмарків: N клієнтів, M підйомників, реалістичний
+розподіл поїздок за днями сезону, абонементи, прокати, працівники та графіки.
+
+Рядки вставляються масово (insert(...) пачками по BATCH_SIZE), без ORM-об'єктів і коміту
+на кожен запис, як у seed.py, тож 1M поїздок генерується за хвилини, а не години.
+Денні агрегати та куб продажів після вставки перераховуються один раз.
+"""
+import datetime
+import math
+import random
+
+from sqlalchemy import func, insert, select
+
+from models import db
+from models.client import Client
+from models.employee import Employee
+from models.equipment import Equipment
+from models.equipment_type import EquipmentType
+from models.key import AccessRight, Key
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.pass_type import PassType
+from models.passes import Pass
+from models.rental import Rental
+from models.rental_equipment import RentalEquipment
+from models.schedule import Schedule
+from models.tariff import Tariff
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from services.sales_cube_service import SalesCubeService
+from utils.lift_usage_snapshot import LiftUsageSnapshot
+from utils.report_cache import ReportCache
+
+BATCH_SIZE = 10000
+
+SEASON_START = datetime.date(2025, 12, 1)
+SEASON_DAYS = 120
+
+# Середня кількість поїздок клієнта за день катання
+RIDES_PER_VISIT = 8
+
+# Перший підйомник — з цього часу, останній — не пізніше
+LIFTS_OPEN = 8 * 60 + 30
+LIFTS_CLOSE = 16 * 60 + 30
+
+# (назва, ліміт поїздок, ліміт годин, ціна, днів дії)
+PASS_TYPES = (
+    ('Day Pass', 0, 8, 900, 1),
+    ('10 Rides', 10, 0, 1200, 30),
+    ('Week Pass', 0, 56, 4500, 7),
+    ('Season Unlimited', 0, 0, 18000, SEASON_DAYS),
+)
+
+EQUIPMENT_TYPES = ('Skis', 'Snowboard', 'Boots', 'Helmet', 'Poles')
+
+
+def _time(minute):
+    return datetime.time(minute // 60, minute % 60)
+
+
+def _insert(model_class, rows) -> int:
+    """Масова вставка пачками; повертає кількість вставлених рядків."""
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(insert(model_class), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model_class), batch)
+        total += len(batch)
+    db.session.commit()
+    return total
+
+
+def _ids(model_class) -> list:
+    return list(db.session.scalars(select(model_class.id).order_by(model_class.id)))
+
+
+def _day_weights(days):
+    """Вага дня: пік у середині сезону та вдвічі більше відвідувачів у вихідні."""
+    weights = []
+    for offset in range(days):
+        day = SEASON_START + datetime.timedelta(days=offset)
+        curve = 0.4 + math.sin(math.pi * (offset + 0.5) / days)
+        weights.append(curve * (2.0 if day.weekday() >= 5 else 1.0))
+    return weights
+
+
+def _lift_usage_rows(rng, client_ids, lift_ids, lift_usages, days):
+    """
+    Поїздки сезону: кількість відвідувачів на день пропорційна вазі дня, активність
+    клієнтів нерівномірна (Парето), популярність підйомників — за законом Ципфа,
+    а поїздки одного клієнта йдуть послідовно протягом дня.
+    """
+    day_weights = _day_weights(days)
+    total_weight = sum(day_weights)
+    client_weights = [rng.paretovariate(1.5) for _ in client_ids]
+    lift_weights = [1 / rank for rank in range(1, len(lift_ids) + 1)]
+
+    produced = 0
+    for offset, weight in enumerate(day_weights):
+        day = SEASON_START + datetime.timedelta(days=offset)
+        remaining_days_share = weight / total_weight
+        total_weight -= weight
+        day_rides = round((lift_usages - produced) * remaining_days_share)
+        visitors = rng.choices(client_ids, weights=client_weights, k=max(1, day_rides // RIDES_PER_VISIT))
+
+        day_produced = 0
+        for client_id in visitors:
+            if day_produced >= day_rides:
+                break
+            minute = rng.randint(LIFTS_OPEN, LIFTS_OPEN + 150)
+            for _ in range(max(1, round(rng.gauss(RIDES_PER_VISIT, 3)))):
+                ride = rng.randint(5, 15)
+                if minute + ride > LIFTS_CLOSE or day_produced >= day_rides:
+                    break
+                yield {
+                    'client_id': client_id,
+                    'lift_id': rng.choices(lift_ids, weights=lift_weights)[0],
+                    'usage_date': day,
+                    'usage_time_start': _time(minute),
+                    'usage_time_end': _time(minute + ride),
+                }
+                day_produced += 1
+                minute += ride + rng.randint(0, 20)
+        produced += day_produced
+
+
+def generate_season(clients=1000, lifts=12, lift_usages=10000, employees=10, seed=42) -> dict:
+    """
+    Заповнює порожню БД синтетичним сезоном. Повертає {таблиця: кількість рядків}.
+    Клієнтів з абонементом — близько 60%, з прокатом — близько 30%.
+    """
+    if db.session.scalar(select(func.count(LiftUsage.id))) or db.session.scalar(select(func.count(Client.id))):
+        raise ValueError('The season generator needs an empty database (run it with --reset).')
+
+    rng = random.Random(seed)
+    counts = {}
+    last_day = SEASON_START + datetime.timedelta(days=SEASON_DAYS - 1)
+
+    # Один хеш пароля на всіх: PBKDF2 на кожного клієнта зайняв би більше часу, ніж решта генерації
+    template_key = Key(login='template', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    template_key.set_password('bench')
+    counts['keys'] = _insert(Key, ({'login': f'bench{i}', 'password_hash': template_key.password_hash,
+                                    'access_right': AccessRight.AUTHORIZED, 'is_approved': i % 20 != 0}
+                                   for i in range(clients)))
+    counts['client'] = _insert(Client, ({'full_name': f'Client {i:07d}', 'document_id': f'DOC{i:07d}',
+                                         'date_of_birth': datetime.date(1960 + i % 45, 1 + i % 12, 1 + i % 28),
+                                         'phone_number': f'+380{i:09d}', 'email': f'bench{i}@example.com',
+                                         'authorization_fkey': key_id}
+                                        for i, key_id in enumerate(_ids(Key))))
+    client_ids = _ids(Client)
+
+    counts['lift'] = _insert(Lift, ({'name': f'Lift {i + 1:02d}', 'height': rng.randint(150, 900)}
+                                    for i in range(lifts)))
+    counts['employee'] = _insert(Employee, ({'full_name': f'Employee {i:03d}', 'position': 'Rental Staff',
+                                             'salary': 30000, 'phone_number': f'+38050{i:07d}',
+                                             'email': f'staff{i}@example.com'} for i in range(employees)))
+    employee_ids = _ids(Employee)
+    counts['schedule'] = _insert(Schedule, ({'employee_id': employee_id,
+                                             'work_date': SEASON_START + datetime.timedelta(days=offset),
+                                             'shift_start': datetime.time(8, 0), 'shift_end': datetime.time(17, 0)}
+                                            for offset in range(SEASON_DAYS)
+                                            for employee_id in employee_ids if (offset + employee_id) % 3))
+
+    counts['pass_type'] = _insert(PassType, ({'name': name, 'limit_lifts': limit_lifts, 'limit_hours': limit_hours,
+                                              'price': price} for name, limit_lifts, limit_hours, price, _ in PASS_TYPES))
+    pass_types = list(zip(_ids(PassType), PASS_TYPES))
+
+    def pass_rows():
+        for client_id in client_ids:
+            if rng.random() >= 0.6:
+                continue
+            pass_type_id, (_, limit_lifts, limit_hours, _, valid_days) = rng.choice(pass_types)
+            purchase = SEASON_START + datetime.timedelta(days=rng.randrange(SEASON_DAYS))
+            yield {'client_id': client_id, 'pass_type_id': pass_type_id, 'purchase_date': purchase,
+                   'valid_from': purchase, 'valid_to': min(purchase + datetime.timedelta(days=valid_days - 1), last_day),
+                   'remaining_lifts': rng.randint(0, limit_lifts), 'remaining_hours': limit_hours}
+    counts['pass'] = _insert(Pass, pass_rows())
+
+    counts['equipment_type'] = _insert(EquipmentType, ({'name': name, 'description': f'{name} for rent'}
+                                                       for name in EQUIPMENT_TYPES))
+    type_ids = _ids(EquipmentType)
+    counts['tariff'] = _insert(Tariff, ({'equipment_type_id': type_id, 'price_per_hour': 100 + 20 * i,
+                                         'price_per_day': 500 + 100 * i, 'weekday_discount': 10 * (i % 3)}
+                                        for i, type_id in enumerate(type_ids)))
+    counts['equipment'] = _insert(Equipment, ({'type_id': type_ids[i % len(type_ids)], 'model': f'Model {i:04d}',
+                                               'is_available': True} for i in range(max(50, clients // 20))))
+    equipment_ids = _ids(Equipment)
+
+    rental_clients = [client_id for client_id in client_ids if rng.random() < 0.3]
+    counts['rental'] = _insert(Rental, ({'client_id': client_id, 'employee_id': rng.choice(employee_ids),
+                                         'rental_date': SEASON_START + datetime.timedelta(days=rng.randrange(SEASON_DAYS)),
+                                         'start_time': datetime.time(9, 0), 'end_time': datetime.time(16, 0),
+                                         'rental_type': rng.choice(('daily', 'hourly')),
+                                         'total_price': rng.randint(300, 2500)}
+                                        for client_id in rental_clients))
+    counts['rental_equipment'] = _insert(RentalEquipment, (
+        {'rental_id': rental_id, 'equipment_id': equipment_id}
+        for rental_id in _ids(Rental)
+        for equipment_id in rng.sample(equipment_ids, rng.randint(1, 3))))
+
+    counts['lift_usage'] = _insert(LiftUsage, _lift_usage_rows(rng, client_ids, _ids(Lift), lift_usages, SEASON_DAYS))
+
+    # Масова вставка обходить сервіси, тож похідні таблиці перераховуються з нуля
+    counts.update(LiftUsageRollupService.rebuild())
+    counts.update(SalesCubeService.rebuild())
+    ReportCache.clear()
+    LiftUsageSnapshot.reset()
+    return counts
@@ -9,4 +9,15 @@ class Config:
     MAIL_USE_TLS = True
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
-    MAIL_DEFAULT_SENDER = os.getenv('MAIL_USERNAME')
\ No newline at end of file
+    MAIL_DEFAULT_SENDER = os.getenv('MAIL_USERNAME')
+    # 'sql' або 'columnar' (звіти про підйомники зі знімка lift_usage у NumPy, див. utils/lift_usage_snapshot.py)
+    LIFT_ANALYTICS_BACKEND = os.getenv('LIFT_ANALYTICS_BACKEND', 'sql')
+    # Фоновий планувальник знімків збережених переглядів (hourly/nightly); вимкнути: SAVED_VIEW_SCHEDULER=0
+    SAVED_VIEW_SCHEDULER = os.getenv('SAVED_VIEW_SCHEDULER', '1') != '0'
+    # 'sync' — кожен прохід турнікета комітиться одразу; 'buffered' — підтверджується одразу,
+    # а записується пачками у фоні з локальним журналом (див. services/scan_buffer_service.py)
+    GATE_SCAN_MODE = os.getenv('GATE_SCAN_MODE', 'sync')
+    SCAN_BUFFER_FLUSH_MS = int(os.getenv('SCAN_BUFFER_FLUSH_MS', '200'))
+    SCAN_BUFFER_MAX_ROWS = int(os.getenv('SCAN_BUFFER_MAX_ROWS', '500'))
+    SCAN_JOURNAL_PATH = os.getenv('SCAN_JOURNAL_PATH', 'scan_journal.ndjson')
+    SCAN_JOURNAL_FSYNC = os.getenv('SCAN_JOURNAL_FSYNC', '1') != '0'
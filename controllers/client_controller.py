@@ -2,16 +2,24 @@ from flask import Blueprint, render_template, request, redirect, url_for, sessio
 from flask_mail import Message
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from models.client import Client
 from models.key import AccessRight, Key
 from services.client_service import ClientService
-from services.saved_view_service import SavedViewService
+from services.report_service import ReportService
+from services.saved_view_service import SNAPSHOT_SCHEDULES, SavedViewService, supports_snapshot
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 from models import db, mail
 
 client_service = ClientService()
 saved_view_service = SavedViewService()
+report_service = ReportService()
 
 client_controller = Blueprint('client', __name__)
+
+LIST_COLUMNS = ('id', 'full_name', 'document_id', 'date_of_birth', 'phone_number', 'email', 'access_right')
+
 @client_controller.route('/register', methods=['POST'])
 def register():
     full_name = request.form['full_name']
@@ -58,7 +66,15 @@ def logout():
 def dashboard():
     if 'client_id' not in session:
         return redirect(url_for('index'))
-    return render_template('dashboard.html')
+    # Панель показників — для адміністраторів і модераторів: один дешевий запит, далі кеш на DASHBOARD_KPI_TTL
+    kpis = report_service.get_dashboard_kpis() if session.get('access_right') in ('admin', 'moderator') else None
+    return render_template('dashboard.html', kpis=kpis)
+
+
+@client_controller.route('/dashboard/kpis')
+@roles_required('admin', 'moderator')
+def dashboard_kpis():
+    return report_service.get_dashboard_kpis()._asdict()
 
 
 @client_controller.route('/save_view', methods=['POST'])
@@ -86,7 +102,66 @@ def saved_views():
         return redirect(url_for('index'))
 
     views = saved_view_service.get_by_client_id(client_id)
-    return render_template('saved_views.html', saved_views=views)
+    snapshot_view_ids = {view.id for view in views if supports_snapshot(view.url)}
+    return render_template('saved_views.html', saved_views=views, schedules=SNAPSHOT_SCHEDULES,
+                           snapshot_view_ids=snapshot_view_ids)
+
+
+@client_controller.route('/saved_views/<int:view_id>')
+def open_view(view_id):
+    client_id = session.get('client_id')
+    if not client_id:
+        return redirect(url_for('index'))
+
+    view = saved_view_service.get_for_client(view_id, client_id)
+    if view is None:
+        flash('Saved report not found.', 'error')
+        return redirect(url_for('client.saved_views'))
+    # Без знімка перегляд відкривається як звичайний живий список
+    if view.snapshot is None or view.snapshot.computed_at is None:
+        return redirect(view.url)
+    return render_template('saved_view_snapshot.html', view=view, snapshot=view.snapshot,
+                           **saved_view_service.get_snapshot_data(view.snapshot))
+
+
+@client_controller.route('/saved_views/<int:view_id>/refresh', methods=['POST'])
+def refresh_view(view_id):
+    client_id = session.get('client_id')
+    if not client_id:
+        return redirect(url_for('index'))
+
+    view = saved_view_service.get_for_client(view_id, client_id)
+    if view is None:
+        flash('Saved report not found.', 'error')
+        return redirect(url_for('client.saved_views'))
+
+    snapshot = saved_view_service.refresh(view)
+    if snapshot.error:
+        flash(f'Could not refresh the snapshot: {snapshot.error}', 'error')
+    else:
+        flash(f'Snapshot of "{view.name}" refreshed.')
+    return redirect(url_for('client.open_view', view_id=view.id))
+
+
+@client_controller.route('/saved_views/<int:view_id>/schedule', methods=['POST'])
+def schedule_view(view_id):
+    client_id = session.get('client_id')
+    if not client_id:
+        return redirect(url_for('index'))
+
+    view = saved_view_service.get_for_client(view_id, client_id)
+    schedule = request.form.get('schedule') or None
+    if view is None or (schedule is not None and schedule not in SNAPSHOT_SCHEDULES):
+        flash('Error updating the snapshot schedule.', 'error')
+        return redirect(url_for('client.saved_views'))
+
+    try:
+        saved_view_service.set_schedule(view, schedule)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('client.saved_views'))
+    flash(f'Snapshot for "{view.name}" is now {schedule or "off"}.')
+    return redirect(url_for('client.saved_views'))
 
 
 @client_controller.route('/delete_view/<int:view_id>', methods=['POST'])
@@ -103,7 +178,9 @@ def delete_view(view_id):
     return redirect(url_for('client.saved_views'))
 
 @client_controller.route('/')
+@statement_budget(LIST_STATEMENT_BUDGET)
 @roles_required('admin', 'moderator')
+@exportable
 def list_clients():
     # Отримуємо параметри сортування
     sort_by = request.args.get('sort_by')
@@ -113,6 +190,10 @@ def list_clients():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     # Старі 'filter_by' та 'filter_value' нам більше не потрібні
 
@@ -121,9 +202,15 @@ def list_clients():
         sort_order=sort_order,
         filter_cols=filter_cols,
         filter_ops=filter_ops,
-        filter_vals=filter_vals
+        filter_vals=filter_vals,
+        cursor=cursor,
+        page_size=page_size,
+        yield_per=yield_per,
+        columns=LIST_COLUMNS
         # Старі параметри не передаємо
     )
+    if yield_per:
+        return export_response(clients_with_keys, export_format, 'clients')
 
     # Збираємо активні фільтри, щоб передати їх у шаблон
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
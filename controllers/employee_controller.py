@@ -1,14 +1,21 @@
 from flask import Blueprint, render_template, request, redirect, url_for
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.employee_service import EmployeeService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 employee_service = EmployeeService()
 
 employee_controller = Blueprint('employee', __name__)
 
+LIST_COLUMNS = ('id', 'full_name', 'position', 'salary', 'phone_number', 'email')
+
 
 @employee_controller.route('/browse', methods=['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def browse_employees():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order', 'asc')
@@ -19,6 +26,10 @@ def browse_employees():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     # Старий стиль (для authorized)
     filter_by = request.args.get('filter_by')
@@ -32,8 +43,14 @@ def browse_employees():
         filter_ops=filter_ops,
         filter_vals=filter_vals,
         filter_by=filter_by,
-        filter_value=filter_value
+        filter_value=filter_value,
+        cursor=cursor,
+        page_size=page_size,
+        yield_per=yield_per,
+        columns=LIST_COLUMNS
     )
+    if yield_per:
+        return export_response(employees, export_format, 'employees')
 
     # Ми все одно передаємо ВСІ параметри в шаблон,
     # щоб він міг відновити стан форми (і старої, і нової)
@@ -1,14 +1,21 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.equipment_service import EquipmentService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 equipment_service = EquipmentService()
 
 equipment_controller = Blueprint('equipment', __name__)
 
+LIST_COLUMNS = ('id', 'type_id', 'model', 'is_available')
+
 
 @equipment_controller.route('/list', methods=['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def list_equipment():
     #just authorized
     sort_by = request.args.get('sort_by')
@@ -20,6 +27,10 @@ def list_equipment():
     filter_cols = request.args.getlist('filter_cols')
     filter_ops = request.args.getlist('filter_ops')
     filter_vals = request.args.getlist('filter_vals')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     #servise will figure out
     equipment = equipment_service.get_all(
@@ -30,7 +41,13 @@ def list_equipment():
         filter_cols=filter_cols,
         filter_ops=filter_ops,
         filter_vals=filter_vals,
+        cursor=cursor,
+        page_size=page_size,
+        yield_per=yield_per,
+        columns=LIST_COLUMNS,
     )
+    if yield_per:
+        return export_response(equipment, export_format, 'equipment')
 
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
     return render_template('equipment.html', equipment=equipment,
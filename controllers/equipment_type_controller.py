@@ -1,13 +1,20 @@
 from flask import Blueprint, render_template, request, redirect, url_for
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.equipment_type_service import EquipmentTypeService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 equipment_type_service = EquipmentTypeService()
 
 equipment_type_controller = Blueprint('equipment_type', __name__)
 
+LIST_COLUMNS = ('id', 'name', 'description')
+
 @equipment_type_controller.route('/', methods = ['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def list_equipment_types():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
@@ -15,12 +22,19 @@ def list_equipment_types():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     filter_by = request.args.get('filter_by')
     filter_value = request.args.get('filter_value')
 
     equipment_types = equipment_type_service.get_all(sort_by=sort_by, sort_order=sort_order, filter_by=filter_by, filter_value=filter_value,
-                                                     filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals)
+                                                     filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals,
+                                                     cursor=cursor, page_size=page_size, yield_per=yield_per, columns=LIST_COLUMNS)
+    if yield_per:
+        return export_response(equipment_types, export_format, 'equipment_types')
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
     return render_template('equipment_types.html', equipment_types = equipment_types,
                            active_filters = active_filters,
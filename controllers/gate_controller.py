@@ -0,0 +1,42 @@
+from flask import Blueprint, current_app, request
+
+from middlewares.authorization import roles_required
+from middlewares.statement_budget import statement_budget
+from services.gate_scan_service import GateScanService, ScanRejected
+from services.scan_buffer_service import ScanBufferService
+
+gate_scan_service = GateScanService()
+
+gate_controller = Blueprint('gate', __name__)
+
+
+@gate_controller.route('/scan', methods=['POST'])
+@statement_budget(8)
+@roles_required('admin', 'moderator')
+def scan():
+    """
+    Прохід через турнікет. Тіло — JSON (або форма): pass_id, lift_id, scanned_at (ISO),
+    необов'язковий ended_at. 201 — прохід зараховано, 202 — прохід підтверджено й поставлено
+    в чергу (GATE_SCAN_MODE='buffered'), 409 — абонемент не можна використати, 400 — некоректні дані.
+    """
+    data = request.get_json(silent=True) or request.form
+    buffered = current_app.config.get('GATE_SCAN_MODE') == 'buffered'
+    try:
+        pass_id = int(data['pass_id'])
+        lift_id = int(data['lift_id'])
+        record = ScanBufferService.enqueue if buffered else gate_scan_service.record_scan
+        result = record(pass_id, lift_id, data['scanned_at'], data.get('ended_at'))
+    except ScanRejected as e:
+        return {'accepted': False, 'error': str(e)}, 409
+    except KeyError as e:
+        return {'accepted': False, 'error': f'Missing field {e}.'}, 400
+    except (TypeError, ValueError) as e:
+        return {'accepted': False, 'error': str(e)}, 400
+    return {'accepted': True, 'queued': buffered, **result._asdict()}, 202 if buffered else 201
+
+
+@gate_controller.route('/buffer', methods=['GET'])
+@roles_required('admin')
+def buffer_stats():
+    """Метрики буферизованого режиму: глибина черги, затримка запису пачок, повтор журналу."""
+    return ScanBufferService.stats()
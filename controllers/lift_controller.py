@@ -1,13 +1,20 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.lift_service import LiftService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 lift_service = LiftService()
 
 lift_controller = Blueprint('lift', __name__)
 
+LIST_COLUMNS = ('id', 'name', 'height')
+
 @lift_controller.route('/', methods=['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def list_lifts():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
@@ -18,12 +25,22 @@ def list_lifts():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     lifts = lift_service.get_all(
         sort_by=sort_by, sort_order=sort_order,
         filter_by=filter_by, filter_value=filter_value,
-        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals
+        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals,
+        cursor=cursor,
+        page_size=page_size,
+        yield_per=yield_per,
+        columns=LIST_COLUMNS
     )
+    if yield_per:
+        return export_response(lifts, export_format, 'lifts')
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
 
     return render_template('lifts.html', lifts=lifts,
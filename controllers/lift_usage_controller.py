@@ -1,13 +1,23 @@
+import io
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
+from services.lift_usage_import_service import LiftUsageImportService
 from services.lift_usage_service import LiftUsageService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 lift_usage_service = LiftUsageService()
 
 lift_usage_controller = Blueprint('lift_usage', __name__)
 
+LIST_COLUMNS = ('id', 'client_id', 'lift_id', 'usage_date', 'usage_time_start', 'usage_time_end')
+
 @lift_usage_controller.route('/', methods=['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def list_lift_usages():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
@@ -15,9 +25,16 @@ def list_lift_usages():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     lift_usages = lift_usage_service.get_all(sort_by=sort_by, sort_order=sort_order,
-                                        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals)
+                                        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals,
+                                        cursor=cursor, page_size=page_size, yield_per=yield_per, columns=LIST_COLUMNS)
+    if yield_per:
+        return export_response(lift_usages, export_format, 'lift_usages')
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
 
     return render_template('lift_usages.html', lift_usages=lift_usages,
@@ -42,6 +59,21 @@ def add():
 
     return redirect(url_for('lift_usage.list_lift_usages'))
 
+@lift_usage_controller.route('/import', methods=['POST'])
+@roles_required('admin')
+def import_log():
+    log_file = request.files.get('log_file')
+    if not log_file or not log_file.filename:
+        flash('Choose a turnstile log file to import.', 'warning')
+        return redirect(url_for('lift_usage.list_lift_usages'))
+    try:
+        # Файл читається потоково, без завантаження в пам'ять цілком
+        result = LiftUsageImportService.import_csv(io.TextIOWrapper(log_file.stream, encoding='utf-8', newline=''))
+    except (UnicodeDecodeError, ValueError) as e:
+        flash(f'Error: {e}', 'danger')
+        return redirect(url_for('lift_usage.list_lift_usages'))
+    return render_template('lift_usage_import.html', filename=log_file.filename, result=result)
+
 @lift_usage_controller.route('/edit/<int:id>', methods=['GET'])
 @roles_required('admin', 'moderator')
 def edit_lift_usage(id):
@@ -1,13 +1,20 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.pass_lift_usage_service import PassLiftUsageService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 pass_lift_usage_service = PassLiftUsageService()
 
 pass_lift_usage_controller = Blueprint('pass_lift_usage', __name__)
 
+LIST_COLUMNS = ('pass_id', 'lift_usage_id')
+
 @pass_lift_usage_controller.route('/', methods=['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def list_pass_lift_usages():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
@@ -15,9 +22,16 @@ def list_pass_lift_usages():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     pass_lift_usages = pass_lift_usage_service.get_all(sort_by=sort_by, sort_order=sort_order,
-                                        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals)
+                                        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals,
+                                        cursor=cursor, page_size=page_size, yield_per=yield_per, columns=LIST_COLUMNS)
+    if yield_per:
+        return export_response(pass_lift_usages, export_format, 'pass_lift_usages')
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
 
     return render_template('pass_lift_usages.html', pass_lift_usages=pass_lift_usages,
@@ -27,6 +41,7 @@ def list_pass_lift_usages():
                            )
 
 @pass_lift_usage_controller.route('/add', methods = ['POST'])
+@statement_budget(4)
 @roles_required('admin', 'moderator')
 def add():
     pass_id = request.form['pass_id']
@@ -48,6 +63,7 @@ def edit_pass_lift_usage(pass_id, lift_usage_id):
     return render_template('pass_lift_usage_edit.html', pass_lift_usage = pass_lift_usage)
 
 @pass_lift_usage_controller.route('/update/<int:old_pass_id>/<int:old_lift_usage_id>', methods=['POST'])
+@statement_budget(8)
 @roles_required('admin', 'moderator')
 def update(old_pass_id, old_lift_usage_id):
     new_pass_id = request.form['pass_id']
@@ -66,6 +82,7 @@ def update(old_pass_id, old_lift_usage_id):
     return redirect(url_for('pass_lift_usage.list_pass_lift_usages'))
 
 @pass_lift_usage_controller.route('/delete/<int:pass_id>/<int:lift_usage_id>', methods=['POST'])
+@statement_budget(4)
 @roles_required('admin', 'moderator')
 def delete(pass_id, lift_usage_id):
     pass_lift_usage_service.delete(pass_id, lift_usage_id)
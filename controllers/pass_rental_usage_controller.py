@@ -1,25 +1,42 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.pass_rental_usage_service import PassRentalUsageService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 pass_rental_usage_service = PassRentalUsageService()
 
 pass_rental_usage_controller = Blueprint('pass_rental_usage', __name__)
 
+LIST_COLUMNS = ('pass_id', 'rental_id', 'hours_deducted')
+
 
 @pass_rental_usage_controller.route('/', methods=['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
 @roles_required('admin', 'moderator')
+@exportable
 def list_pass_rental_usages():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
 
     usages = pass_rental_usage_service.get_all(
         sort_by=sort_by, sort_order=sort_order,
-        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals
+        filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals,
+        cursor=cursor,
+        page_size=page_size,
+        yield_per=yield_per,
+        columns=LIST_COLUMNS
     )
+    if yield_per:
+        return export_response(usages, export_format, 'pass_rental_usages')
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
 
     return render_template('pass_rental_usages.html',
@@ -30,6 +47,7 @@ def list_pass_rental_usages():
 
 
 @pass_rental_usage_controller.route('/add', methods=['POST'])
+@statement_budget(5)
 @roles_required('admin', 'moderator')
 def add():
     pass_id = request.form['pass_id']
@@ -53,6 +71,7 @@ def edit_pass_rental_usage(pass_id, rental_id):
 
 
 @pass_rental_usage_controller.route('/update/<int:old_pass_id>/<int:old_rental_id>', methods=['POST'])
+@statement_budget(10)
 @roles_required('admin', 'moderator')
 def update(old_pass_id, old_rental_id):
     new_pass_id = request.form['pass_id']
@@ -72,6 +91,7 @@ def update(old_pass_id, old_rental_id):
 
 
 @pass_rental_usage_controller.route('/delete/<int:pass_id>/<int:rental_id>', methods=['POST'])
+@statement_budget(4)
 @roles_required('admin', 'moderator')
 def delete(pass_id, rental_id):
     try:
@@ -1,13 +1,42 @@
 # controllers/reports_controller.py
-from flask import Blueprint, render_template, flash, redirect, url_for
-from services.report_service import ReportService
+from flask import Blueprint, render_template, flash, redirect, url_for, session
+from services.report_service import ReportService, comparison_windows, lift_load_heatmap
+from services.query_plan_service import QueryPlanService
+from services.report_job_service import ReportJobService
+from services.employee_service import EmployeeService
 from middlewares.authorization import roles_required
+from utils.report_cache import ReportCache
+from utils.report_executor import ReportExecutor
 from flask import Blueprint, render_template, request, flash
 import datetime
 
 report_controller = Blueprint('report', __name__)
 report_service = ReportService()
 
+# Шаблони результатів звітів, які можна обчислити у фоні (див. ReportJobService.REPORT_JOBS)
+JOB_TEMPLATES = {
+    'equipment_rental_stats': 'report_results/equipment_stats.html',
+    'pass_sales_stats': 'report_results/pass_sales_stats.html',
+    'most_used_lifts': 'report_results/most_used_lifts_stats.html',
+    'rental_revenue_stats': 'report_results/rental_revenue_stats.html',
+    'client_pass_stats': 'report_results/client_pass_stats.html',
+    'february_unlimited_clients': 'report_results/february_unlimited_clients_stats.html',
+    'client_visit_stats': 'report_results/client_visit_stats.html',
+    'employee_work_stats': 'report_results/employee_work_stats.html',
+    'period_comparison': 'report_results/period_comparison.html',
+    'lift_heatmap': 'report_results/lift_heatmap.html',
+}
+
+
+def _background_requested():
+    return request.form.get('background') in ('1', 'on', 'true')
+
+
+def _submit_job(report, **params):
+    """Ставить звіт у фонову чергу і перенаправляє на сторінку очікування результату."""
+    job = ReportJobService.submit(report, params, session.get('client_id'))
+    return redirect(url_for('report.report_job', job_id=job.id))
+
 @report_controller.route('/')
 @roles_required('admin', 'moderator', 'authorized')
 def index():
@@ -45,12 +74,18 @@ def equipment_rental_stats():
 
             end_date = start_date + datetime.timedelta(days=6)
 
-            most_rented_weekly = report_service.get_most_rented_equipment_weekly(start_date, end_date)
-            count_by_type_daily = report_service.get_equipment_count_by_type_daily(specific_date)
+            if _background_requested():
+                return _submit_job('equipment_rental_stats', start_date=start_date, end_date=end_date,
+                                   specific_date=specific_date)
+
+            # Обидві панелі звіту незалежні — виконуються паралельно
+            results = ReportExecutor.run(
+                most_rented_weekly=(report_service.get_most_rented_equipment_weekly, start_date, end_date),
+                count_by_type_daily=(report_service.get_equipment_count_by_type_daily, specific_date),
+            )
 
             return render_template('report_results/equipment_stats.html',
-                                   most_rented_weekly=most_rented_weekly,
-                                   count_by_type_daily=count_by_type_daily,
+                                   **results,
                                    start_date=start_date,
                                    end_date=end_date,
                                    specific_date=specific_date)
@@ -97,14 +132,18 @@ def pass_sales_stats():
                                        start_date=start_date_str,
                                        end_date=end_date_str)
 
-            # Викликаємо методи сервісу
-            sales_by_day = report_service.get_pass_sales_by_day(start_date, end_date)
-            sales_by_type = report_service.get_pass_sales_by_type(start_date, end_date)
+            if _background_requested():
+                return _submit_job('pass_sales_stats', start_date=start_date, end_date=end_date)
+
+            # Обидві панелі звіту незалежні — виконуються паралельно
+            results = ReportExecutor.run(
+                sales_by_day=(report_service.get_pass_sales_by_day, start_date, end_date),
+                sales_by_type=(report_service.get_pass_sales_by_type, start_date, end_date),
+            )
 
             # Рендеримо шаблон з результатами
             return render_template('report_results/pass_sales_stats.html',
-                                   sales_by_day=sales_by_day,
-                                   sales_by_type=sales_by_type,
+                                   **results,
                                    start_date=start_date,
                                    end_date=end_date)
         except ValueError:
@@ -151,6 +190,9 @@ def most_used_lifts():
                                        start_date=start_date_str,
                                        end_date=end_date_str)
 
+            if _background_requested():
+                return _submit_job('most_used_lifts', start_date=start_date, end_date=end_date)
+
             # Викликаємо метод сервісу
             report_data = report_service.get_most_used_lifts_by_period(start_date, end_date)
 
@@ -202,14 +244,18 @@ def rental_revenue_stats():
                                        start_date=start_date_str,
                                        end_date=end_date_str)
 
-            # Викликаємо нові методи сервісу
-            revenue_by_month = report_service.get_rental_revenue_by_month(start_date, end_date)
-            revenue_by_quarter = report_service.get_rental_revenue_by_quarter(start_date, end_date)
+            if _background_requested():
+                return _submit_job('rental_revenue_stats', start_date=start_date, end_date=end_date)
+
+            # Обидві панелі звіту незалежні — виконуються паралельно
+            results = ReportExecutor.run(
+                revenue_by_month=(report_service.get_rental_revenue_by_month, start_date, end_date),
+                revenue_by_quarter=(report_service.get_rental_revenue_by_quarter, start_date, end_date),
+            )
 
             # Рендеримо шаблон з результатами
             return render_template('report_results/rental_revenue_stats.html',
-                                   revenue_by_month=revenue_by_month,
-                                   revenue_by_quarter=revenue_by_quarter,
+                                   **results,
                                    start_date=start_date,
                                    end_date=end_date)
         except ValueError:
@@ -247,14 +293,18 @@ def client_pass_stats():
 
             specific_date = datetime.datetime.strptime(specific_date_str, '%Y-%m-%d').date()
 
-            # Викликаємо методи сервісу
-            exhausted_passes_clients = report_service.get_clients_with_exhausted_passes()
-            over_15_lifts_clients = report_service.get_clients_with_over_15_lifts_daily(specific_date)
+            if _background_requested():
+                return _submit_job('client_pass_stats', specific_date=specific_date)
+
+            # Обидві панелі звіту незалежні — виконуються паралельно
+            results = ReportExecutor.run(
+                exhausted_passes_clients=(report_service.get_clients_with_exhausted_passes,),
+                over_15_lifts_clients=(report_service.get_clients_with_over_15_lifts_daily, specific_date),
+            )
 
             # Рендеримо шаблон з результатами
             return render_template('report_results/client_pass_stats.html',
-                                   exhausted_passes_clients=exhausted_passes_clients,
-                                   over_15_lifts_clients=over_15_lifts_clients,
+                                   **results,
                                    specific_date=specific_date)
         except ValueError:
             flash('Invalid date format. Please use YYYY-MM-DD.', 'danger')
@@ -291,6 +341,9 @@ def february_unlimited_clients():
 
             year = int(year_str)
 
+            if _background_requested():
+                return _submit_job('february_unlimited_clients', pass_name=PASS_NAME, year=year, month=MONTH)
+
             # Викликаємо метод сервісу
             clients = report_service.get_clients_bought_pass_by_month(PASS_NAME, year, MONTH)
 
@@ -366,13 +419,18 @@ def client_visit_stats():
                                        end_date=end_date_str,
                                        visit_threshold=visit_threshold)
 
-            # Call service methods
-            clients_in_range = report_service.get_clients_visited_in_date_range(start_date, end_date)
-            clients_frequent = report_service.get_clients_visited_more_than_x_times(visit_threshold)
+            if _background_requested():
+                return _submit_job('client_visit_stats', start_date=start_date, end_date=end_date,
+                                   visit_threshold=visit_threshold)
+
+            # Обидві панелі звіту незалежні — виконуються паралельно
+            results = ReportExecutor.run(
+                clients_in_range=(report_service.get_clients_visited_in_date_range, start_date, end_date),
+                clients_frequent=(report_service.get_clients_visited_more_than_x_times, visit_threshold),
+            )
 
             return render_template('report_results/client_visit_stats.html',
-                                   clients_in_range=clients_in_range,
-                                   clients_frequent=clients_frequent,
+                                   **results,
                                    start_date=start_date,
                                    end_date=end_date,
                                    visit_threshold=visit_threshold)
@@ -398,6 +456,145 @@ def client_visit_stats():
                                end_date=f"{default_year}-01-12",
                                visit_threshold=3)
 
+# Порівняльні звіти: назва -> метод сервісу (кілька вікон дат за один прохід)
+COMPARISON_REPORTS = {
+    'lift_usage': 'get_lift_usage_comparison',
+    'pass_sales': 'get_pass_sales_comparison',
+}
+
+COMPARISON_LABELS = ('Selected period', 'Previous period', 'Same period last season')
+
+
+@report_controller.route('/period_comparison', methods=['GET', 'POST'])
+@roles_required('admin', 'moderator', 'authorized')
+def period_comparison():
+    """Порівняння періоду з попереднім і з тим самим періодом минулого сезону (Запити 3 і 4)."""
+
+    def params_page():
+        return render_template('report_results/period_comparison_params.html',
+                               report=request.form.get('report', 'lift_usage'),
+                               start_date=request.form.get('start_date'),
+                               end_date=request.form.get('end_date'),
+                               previous=bool(request.form.get('previous')),
+                               last_season=bool(request.form.get('last_season')))
+
+    if request.method == 'POST':
+        try:
+            report = request.form.get('report')
+            start_date_str = request.form.get('start_date')
+            end_date_str = request.form.get('end_date')
+            previous = bool(request.form.get('previous'))
+            last_season = bool(request.form.get('last_season'))
+
+            if report not in COMPARISON_REPORTS or not start_date_str or not end_date_str:
+                flash('Please select a report and both a start and end date.', 'warning')
+                return params_page()
+            if not previous and not last_season:
+                flash('Select at least one period to compare with.', 'warning')
+                return params_page()
+
+            start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').date()
+
+            if end_date < start_date:
+                flash('End date cannot be earlier than start date.', 'warning')
+                return params_page()
+
+            windows = comparison_windows(start_date, end_date, previous, last_season)
+            labels = [COMPARISON_LABELS[0]] + [label for label, selected
+                                               in zip(COMPARISON_LABELS[1:], (previous, last_season)) if selected]
+
+            if _background_requested():
+                return _submit_job('period_comparison', comparison=report, windows=windows, labels=labels)
+
+            rows = getattr(report_service, COMPARISON_REPORTS[report])(windows)
+            return render_template('report_results/period_comparison.html',
+                                   rows=rows, comparison=report, windows=windows, labels=labels)
+
+        except ValueError:
+            flash('Invalid date format. Please use YYYY-MM-DD.', 'danger')
+            return params_page()
+        except Exception as e:
+            flash(f'Error generating report: {e}', 'danger')
+            return params_page()
+
+    else:
+        # GET request: поточний тиждень з понеділка
+        today = datetime.date.today()
+        monday = today - datetime.timedelta(days=today.weekday())
+        return render_template('report_results/period_comparison_params.html',
+                               report='lift_usage',
+                               start_date=monday.strftime('%Y-%m-%d'),
+                               end_date=(monday + datetime.timedelta(days=6)).strftime('%Y-%m-%d'),
+                               previous=True, last_season=True)
+
+
+# Допустима ширина слоту теплової карти, хв (кратна кошику агрегату)
+HEATMAP_BUCKETS = (15, 30, 60)
+
+
+@report_controller.route('/lift_heatmap', methods=['GET', 'POST'])
+@roles_required('admin', 'moderator', 'authorized')
+def lift_heatmap():
+    """Теплова карта навантаження: підйоми на кожному підйомнику за часом доби за період."""
+
+    def params_page():
+        return render_template('report_results/lift_heatmap_params.html',
+                               start_date=request.form.get('start_date'),
+                               end_date=request.form.get('end_date'),
+                               bucket_minutes=request.form.get('bucket_minutes', type=int),
+                               buckets=HEATMAP_BUCKETS)
+
+    if request.method == 'POST':
+        try:
+            start_date_str = request.form.get('start_date')
+            end_date_str = request.form.get('end_date')
+            bucket_minutes = request.form.get('bucket_minutes', type=int)
+
+            if not start_date_str or not end_date_str or bucket_minutes not in HEATMAP_BUCKETS:
+                flash('Please select a start date, an end date and a time slot.', 'warning')
+                return params_page()
+
+            start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').date()
+
+            if end_date < start_date:
+                flash('End date cannot be earlier than start date.', 'warning')
+                return params_page()
+
+            if _background_requested():
+                return _submit_job('lift_heatmap', start_date=start_date, end_date=end_date,
+                                   bucket_minutes=bucket_minutes)
+
+            rows = report_service.get_lift_load_by_time(start_date, end_date, bucket_minutes)
+            return render_template('report_results/lift_heatmap.html',
+                                   heatmap=lift_load_heatmap(rows, bucket_minutes),
+                                   start_date=start_date,
+                                   end_date=end_date,
+                                   bucket_minutes=bucket_minutes)
+
+        except ValueError:
+            flash('Invalid date format. Please use YYYY-MM-DD.', 'danger')
+            return params_page()
+        except Exception as e:
+            flash(f'Error generating report: {e}', 'danger')
+            return params_page()
+
+    else:
+        # GET request: поточний місяць
+        today = datetime.date.today()
+        return render_template('report_results/lift_heatmap_params.html',
+                               start_date=today.replace(day=1).strftime('%Y-%m-%d'),
+                               end_date=today.strftime('%Y-%m-%d'),
+                               bucket_minutes=60,
+                               buckets=HEATMAP_BUCKETS)
+
+
+def _optional_date(value):
+    """Необов'язкова дата з форми чи рядка запиту: порожнє значення -> None."""
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
 @report_controller.route('/employee_work_stats', methods=['GET', 'POST'])
 @roles_required('admin', 'moderator', 'authorized')
 def employee_work_stats():
@@ -408,33 +605,136 @@ def employee_work_stats():
     if request.method == 'POST':
         try:
             specific_date_str = request.form.get('specific_date')
+            start_date_str = request.form.get('start_date')
+            end_date_str = request.form.get('end_date')
 
             if not specific_date_str:
                 flash('Please select a specific day.', 'warning')
                 return render_template('report_results/employee_work_stats_params.html',
-                                       specific_date=specific_date_str)
+                                       specific_date=specific_date_str,
+                                       start_date=start_date_str,
+                                       end_date=end_date_str)
 
             specific_date = datetime.datetime.strptime(specific_date_str, '%Y-%m-%d').date()
+            # Період підсумків за працівниками необов'язковий: без меж — за весь час
+            start_date = _optional_date(start_date_str)
+            end_date = _optional_date(end_date_str)
 
-            # Call service methods
-            employees_on_date = report_service.get_employees_working_on_date(specific_date)
-            employee_rentals = report_service.get_employee_rental_details() # This report is for all time
+            if start_date and end_date and end_date < start_date:
+                flash('End date cannot be earlier than start date.', 'warning')
+                return render_template('report_results/employee_work_stats_params.html',
+                                       specific_date=specific_date_str,
+                                       start_date=start_date_str,
+                                       end_date=end_date_str)
+
+            if _background_requested():
+                return _submit_job('employee_work_stats', specific_date=specific_date,
+                                   start_date=start_date, end_date=end_date)
+
+            # Обидві панелі звіту незалежні — виконуються паралельно
+            results = ReportExecutor.run(
+                employees_on_date=(report_service.get_employees_working_on_date, specific_date),
+                employee_summary=(report_service.get_employee_rental_summary, start_date, end_date),
+            )
 
             return render_template('report_results/employee_work_stats.html',
-                                   employees_on_date=employees_on_date,
-                                   employee_rentals=employee_rentals,
-                                   specific_date=specific_date)
+                                   **results,
+                                   specific_date=specific_date,
+                                   start_date=start_date,
+                                   end_date=end_date)
 
         except ValueError:
             flash('Invalid date format. Please use YYYY-MM-DD.', 'danger')
             return render_template('report_results/employee_work_stats_params.html',
-                                   specific_date=request.form.get('specific_date'))
+                                   specific_date=request.form.get('specific_date'),
+                                   start_date=request.form.get('start_date'),
+                                   end_date=request.form.get('end_date'))
         except Exception as e:
             flash(f'Error generating report: {e}', 'danger')
             return render_template('report_results/employee_work_stats_params.html',
-                                   specific_date=request.form.get('specific_date'))
+                                   specific_date=request.form.get('specific_date'),
+                                   start_date=request.form.get('start_date'),
+                                   end_date=request.form.get('end_date'))
 
     else:
         # GET request
         return render_template('report_results/employee_work_stats_params.html',
-                               specific_date=datetime.date.today().strftime('%Y-%m-%d'))
\ No newline at end of file
+                               specific_date=datetime.date.today().strftime('%Y-%m-%d'))
+
+
+@report_controller.route('/employee_work_stats/<int:employee_id>/rentals')
+@roles_required('admin', 'moderator', 'authorized')
+def employee_rentals(employee_id):
+    """Запит 10 (деталізація): видане працівником спорядження посторінково за курсором."""
+    employee = EmployeeService.get_by_id(employee_id)
+    if not employee:
+        flash('Employee not found.', 'warning')
+        return redirect(url_for('report.employee_work_stats'))
+
+    try:
+        start_date = _optional_date(request.args.get('start_date'))
+        end_date = _optional_date(request.args.get('end_date'))
+        page = report_service.get_employee_rentals_page(employee_id, start_date, end_date,
+                                                        cursor=request.args.get('cursor'),
+                                                        page_size=request.args.get('page_size', type=int))
+    except ValueError as e:
+        flash(f'Invalid parameters: {e}', 'danger')
+        return redirect(url_for('report.employee_work_stats'))
+
+    return render_template('report_results/employee_rentals.html',
+                           employee=employee, page=page,
+                           start_date=start_date, end_date=end_date)
+
+
+@report_controller.route('/plans')
+@roles_required('admin')
+def query_plans():
+    """Плани запитів, зняті в режимі explain (параметр explain=1 на звіті чи збереженому поданні)."""
+    plans = QueryPlanService.get_latest()
+    return render_template('report_results/query_plans.html', plans=plans)
+
+
+@report_controller.route('/plans/<statement_hash>')
+@roles_required('admin')
+def query_plan_history(statement_hash):
+    """Історія планів одного запиту та різниця між двома останніми знімками."""
+    history = QueryPlanService.get_history(statement_hash)
+    if not history:
+        flash('No plans captured for this statement.', 'warning')
+        return redirect(url_for('report.query_plans'))
+    diff = QueryPlanService.diff(history[1], history[0]) if len(history) > 1 else None
+    return render_template('report_results/query_plan_history.html', history=history, diff=diff)
+
+
+@report_controller.route('/cache', methods=['GET', 'POST'])
+@roles_required('admin')
+def cache_stats():
+    """Метрики кешу звітів; POST очищає кеш і обнуляє лічильники."""
+    if request.method == 'POST':
+        ReportCache.clear()
+        ReportCache.reset_stats()
+        flash('Report cache cleared.', 'success')
+        return redirect(url_for('report.cache_stats'))
+    return render_template('report_results/cache_stats.html', stats=ReportCache.stats())
+
+
+@report_controller.route('/jobs')
+@roles_required('admin', 'moderator', 'authorized')
+def report_jobs():
+    """Фонові звіти поточного користувача (адміністратор бачить усі)."""
+    client_id = None if session.get('access_right') == 'admin' else session.get('client_id')
+    jobs = ReportJobService.get_recent(client_id)
+    return render_template('report_results/report_jobs.html', jobs=jobs)
+
+
+@report_controller.route('/jobs/<job_id>')
+@roles_required('admin', 'moderator', 'authorized')
+def report_job(job_id):
+    """Результат фонового звіту або сторінка очікування, що оновлюється сама."""
+    job = ReportJobService.get_by_id(job_id)
+    if not job or (session.get('access_right') != 'admin' and job.client_id != session.get('client_id')):
+        flash('Report job not found.', 'warning')
+        return redirect(url_for('report.report_jobs'))
+    if job.status == 'done':
+        return render_template(JOB_TEMPLATES[job.report], **ReportJobService.get_result(job))
+    return render_template('report_results/report_job.html', job=job)
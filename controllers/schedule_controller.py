@@ -1,13 +1,20 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 
 from middlewares.authorization import roles_required
+from middlewares.statement_budget import LIST_STATEMENT_BUDGET, statement_budget
 from services.schedule_service import ScheduleService
+from utils.export import EXPORT_FORMATS, export_response, exportable
+from utils.query_helper import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE
 
 schedule_service = ScheduleService()
 
 schedule_controller = Blueprint('schedule', __name__)
 
+LIST_COLUMNS = ('id', 'employee_id', 'work_date', 'shift_start', 'shift_end')
+
 @schedule_controller.route('/', methods = ['GET'])
+@statement_budget(LIST_STATEMENT_BUDGET)
+@exportable
 def list_schedules():
     sort_by = request.args.get('sort_by')
     sort_order = request.args.get('sort_order')
@@ -15,8 +22,15 @@ def list_schedules():
     filter_cols = request.args.getlist('filter_col')
     filter_ops = request.args.getlist('filter_op')
     filter_vals = request.args.getlist('filter_val')
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    export_format = request.args.get('export')
+    yield_per = EXPORT_BATCH_SIZE if export_format in EXPORT_FORMATS else None
     schedules = schedule_service.get_all(sort_by = sort_by, sort_order = sort_order,
-                                         filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals)
+                                         filter_cols=filter_cols, filter_ops=filter_ops, filter_vals=filter_vals,
+                                         cursor=cursor, page_size=page_size, yield_per=yield_per, columns=LIST_COLUMNS)
+    if yield_per:
+        return export_response(schedules, export_format, 'schedules')
     active_filters = list(zip(filter_cols, filter_ops, filter_vals))
     return render_template('schedules.html', schedules = schedules,
                            active_filters = active_filters,
@@ -0,0 +1,66 @@
+import os
+import time
+import traceback
+
+from flask import g, request, session, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from services.query_plan_service import QueryPlanService
+
+
+def _capturing():
+    return has_request_context() and 'query_plans' in g and not g.get('explaining')
+
+
+def _statement_source():
+    """Метод сервісу, який видав запит (перший кадр стеку з каталогу services)."""
+    for frame in reversed(traceback.extract_stack()):
+        if f'{os.sep}services{os.sep}' in frame.filename:
+            return f'{os.path.splitext(os.path.basename(frame.filename))[0]}.{frame.name}'
+    return None
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if _capturing():
+        conn.info.setdefault('query_plan_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _capture_plan(conn, cursor, statement, parameters, context, executemany):
+    if not _capturing():
+        return
+    duration_ms = (time.perf_counter() - conn.info['query_plan_start'].pop()) * 1000
+    if executemany or not QueryPlanService.is_explainable(statement):
+        return
+
+    # EXPLAIN-запити самі проходять через ці ж події — не знімаємо з них плани
+    g.explaining = True
+    try:
+        plan = QueryPlanService.explain(conn, statement, parameters)
+    finally:
+        g.explaining = False
+    if plan:
+        g.query_plans.append(dict(plan, statement=statement, duration_ms=duration_ms,
+                                  source=_statement_source()))
+
+
+def query_plan_middleware(app):
+    """
+    Режим explain для адміністратора: з параметром explain=1 (у рядку запиту або формі)
+    кожен SELECT запиту проганяється через EXPLAIN, а плани з часом виконання
+    зберігаються в query_plan, щоб регресії можна було порівняти з попередніми знімками.
+    """
+    @app.before_request
+    def start_plan_capture():
+        if session.get('access_right') == 'admin' and request.values.get('explain') in ('1', 'on', 'true'):
+            g.query_plans = []
+
+    @app.after_request
+    def save_query_plans(response):
+        captured = g.pop('query_plans', None)
+        if captured:
+            QueryPlanService.save_all(request.endpoint, request.full_path, captured)
+            response.headers['X-Query-Plans'] = str(len(captured))
+        return response
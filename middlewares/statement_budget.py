@@ -0,0 +1,50 @@
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Сторінка списку: один SELECT сторінки (+ кілька запитів, якщо довгий список 'in' іде через
+# тимчасову таблицю). N+1 на сторінці з DEFAULT_PAGE_SIZE рядків перевищує його в рази.
+LIST_STATEMENT_BUDGET = 10
+
+
+def statement_budget(max_statements):
+    """
+    Декоратор, що задає максимальну кількість SQL-запитів, яку може виконати ендпоінт.
+    Перевіряється лише в режимі налагодження (див. statement_budget_middleware).
+    """
+    def wrapper(fn):
+        fn.statement_budget = max_statements
+        return fn
+    return wrapper
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    # Запити режиму explain (див. middlewares.query_plans) не належать ендпоінту
+    if has_request_context() and 'statement_count' in g and not g.get('explaining'):
+        g.statement_count += 1
+
+
+def statement_budget_middleware(app):
+    """
+    У режимі налагодження (або з STATEMENT_BUDGET_CHECK=True) рахує SQL-запити кожного
+    HTTP-запиту і кидає AssertionError, якщо ендпоінт перевищив свій бюджет —
+    так N+1 у шаблонах і сервісах видно одразу, а не на продакшн-даних.
+    """
+    def enabled():
+        return app.debug or app.config.get('STATEMENT_BUDGET_CHECK', False)
+
+    @app.before_request
+    def start_statement_count():
+        if enabled():
+            g.statement_count = 0
+
+    @app.after_request
+    def check_statement_budget(response):
+        count = g.pop('statement_count', None)
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'statement_budget', None)
+        if count is not None and budget is not None and count > budget:
+            raise AssertionError(
+                f"{request.endpoint} executed {count} SQL statements, budget is {budget}.")
+        return response
@@ -3,6 +3,8 @@ from sqlalchemy.orm import backref
 
 class Client(db.Model):
     __tablename__ = 'client'
+    # Колонки з індексом пошуку підрядка (див. utils.text_search)
+    __searchable__ = ('full_name', 'email')
 
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
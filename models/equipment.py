@@ -2,6 +2,8 @@ from models import db
 
 class Equipment(db.Model):
     __tablename__ = 'equipment'
+    # Колонки з індексом пошуку підрядка (див. utils.text_search)
+    __searchable__ = ('model',)
 
     id = db.Column(db.Integer, primary_key=True)
     type_id = db.Column(db.Integer, db.ForeignKey('equipment_type.id'), nullable=False)
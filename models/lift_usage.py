@@ -12,6 +12,13 @@ class LiftUsage(db.Model):
     usage_time_start = db.Column(db.Time, nullable=False)
     usage_time_end = db.Column(db.Time, nullable=False)
 
+    # Індекси під звіти: період + підйомник, історія клієнта, FK підйомника
+    __table_args__ = (
+        db.Index('ix_lift_usage_date_lift', 'usage_date', 'lift_id'),
+        db.Index('ix_lift_usage_client_date', 'client_id', 'usage_date'),
+        db.Index('ix_lift_usage_lift_id', 'lift_id'),
+    )
+
     def __init__(self, client_id, lift_id, usage_date, usage_time_start, usage_time_end):
         self.client_id = client_id
         self.lift_id = lift_id
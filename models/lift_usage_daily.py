@@ -0,0 +1,66 @@
+import datetime
+
+from . import db
+
+
+class LiftDailyRides(db.Model):
+    """Кількість підйомів на підйомнику за день (агрегат lift_usage, див. LiftUsageRollupService)."""
+    __tablename__ = 'lift_daily_rides'
+
+    usage_date = db.Column(db.Date, primary_key=True)
+    lift_id = db.Column(db.Integer, db.ForeignKey('lift.id'), primary_key=True)
+    rides = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, usage_date, lift_id, rides=0):
+        self.usage_date = usage_date
+        self.lift_id = lift_id
+        self.rides = rides
+
+
+class ClientDailyRides(db.Model):
+    """Кількість підйомів клієнта за день (агрегат lift_usage, див. LiftUsageRollupService)."""
+    __tablename__ = 'client_daily_rides'
+
+    usage_date = db.Column(db.Date, primary_key=True)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), primary_key=True)
+    rides = db.Column(db.Integer, nullable=False, default=0)
+
+    # Звіт "відвідування клієнта" групує за клієнтом
+    __table_args__ = (
+        db.Index('ix_client_daily_rides_client_date', 'client_id', 'usage_date'),
+    )
+
+    def __init__(self, usage_date, client_id, rides=0):
+        self.usage_date = usage_date
+        self.client_id = client_id
+        self.rides = rides
+
+
+# Ширина часового кошика агрегату навантаження: 96 кошиків на добу
+BUCKET_MINUTES = 15
+
+
+def time_bucket(value) -> int:
+    """Час початку підйому (time або рядок 'HH:MM' з форми) -> номер 15-хвилинного кошика доби (0..95)."""
+    if isinstance(value, str):
+        value = datetime.time.fromisoformat(value)
+    return (value.hour * 60 + value.minute) // BUCKET_MINUTES
+
+
+class LiftBucketRides(db.Model):
+    """
+    Кількість підйомів на підйомнику за день у 15-хвилинному кошику часу початку
+    (агрегат lift_usage для теплової карти навантаження, див. LiftUsageRollupService).
+    """
+    __tablename__ = 'lift_bucket_rides'
+
+    usage_date = db.Column(db.Date, primary_key=True)
+    lift_id = db.Column(db.Integer, db.ForeignKey('lift.id'), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)
+    rides = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, usage_date, lift_id, bucket, rides=0):
+        self.usage_date = usage_date
+        self.lift_id = lift_id
+        self.bucket = bucket
+        self.rides = rides
@@ -10,6 +10,8 @@ class PassLiftUsage(db.Model):
 
     __table_args__ = (
         db.PrimaryKeyConstraint('pass_id', 'lift_usage_id'),
+        # pass_id покритий первинним ключем, lift_usage_id — ні
+        db.Index('ix_pass_lift_usage_lift_usage_id', 'lift_usage_id'),
     )
 
     def __init__(self, pass_id, lift_usage_id):
@@ -14,6 +14,8 @@ class PassRentalUsage(db.Model):
 
     __table_args__ = (
         db.PrimaryKeyConstraint('pass_id', 'rental_id'),
+        # pass_id покритий первинним ключем, rental_id — ні
+        db.Index('ix_pass_rental_usage_rental_id', 'rental_id'),
     )
 
     def __init__(self, pass_id, rental_id, hours_deducted):
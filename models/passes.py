@@ -14,6 +14,12 @@ class Pass(db.Model):
     remaining_lifts = db.Column(db.Integer, nullable=False)
     remaining_hours = db.Column(db.Integer, nullable=False)
 
+    # Індекси під звіти: продажі за період (по днях і типах), абонементи клієнта
+    __table_args__ = (
+        db.Index('ix_pass_purchase_date_type', 'purchase_date', 'pass_type_id'),
+        db.Index('ix_pass_client_id', 'client_id'),
+    )
+
     def __init__(self, client_id, pass_type_id, purchase_date, valid_from, valid_to, remaining_lifts, remaining_hours):
         self.client_id = client_id
         self.pass_type_id = pass_type_id
@@ -0,0 +1,36 @@
+import datetime
+
+from . import db
+
+
+class QueryPlan(db.Model):
+    """План виконання одного SQL-запиту, знятий у режимі explain (див. middlewares.query_plans)."""
+    __tablename__ = 'query_plan'
+
+    id = db.Column(db.Integer, primary_key=True)
+    endpoint = db.Column(db.String(150), nullable=False)
+    url = db.Column(db.Text, nullable=False)
+    source = db.Column(db.String(200))
+    statement_hash = db.Column(db.String(16), nullable=False, index=True)
+    statement = db.Column(db.Text, nullable=False)
+    plan = db.Column(db.Text, nullable=False)
+    estimated_rows = db.Column(db.Float)
+    actual_rows = db.Column(db.Float)
+    duration_ms = db.Column(db.Float, nullable=False)
+    planning_ms = db.Column(db.Float)
+    execution_ms = db.Column(db.Float)
+    captured_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.now)
+
+    def __init__(self, endpoint, url, source, statement_hash, statement, plan, duration_ms,
+                 estimated_rows=None, actual_rows=None, planning_ms=None, execution_ms=None):
+        self.endpoint = endpoint
+        self.url = url
+        self.source = source
+        self.statement_hash = statement_hash
+        self.statement = statement
+        self.plan = plan
+        self.duration_ms = duration_ms
+        self.estimated_rows = estimated_rows
+        self.actual_rows = actual_rows
+        self.planning_ms = planning_ms
+        self.execution_ms = execution_ms
@@ -13,6 +13,13 @@ class Rental(db.Model):
     rental_type = db.Column(db.String(100), nullable=False)
     total_price = db.Column(db.Integer, nullable=False)
 
+    # Індекси під звіти: виручка за період, видачі працівника, прокати клієнта
+    __table_args__ = (
+        db.Index('ix_rental_date', 'rental_date'),
+        db.Index('ix_rental_employee_date', 'employee_id', 'rental_date'),
+        db.Index('ix_rental_client_id', 'client_id'),
+    )
+
     def __init__(self, client_id, employee_id, rental_date, start_time, end_time, rental_type, total_price):
         self.client_id = client_id
         self.employee_id = employee_id
@@ -10,6 +10,8 @@ class RentalEquipment(db.Model):
 
     __table_args__ = (
         db.PrimaryKeyConstraint('rental_id', 'equipment_id'),
+        # rental_id покритий первинним ключем, equipment_id — ні
+        db.Index('ix_rental_equipment_equipment_id', 'equipment_id'),
     )
 
     def __init__(self, rental_id, equipment_id):
@@ -0,0 +1,36 @@
+import datetime
+
+from . import db
+
+
+class ReportJob(db.Model):
+    """Фонове обчислення звіту: параметри, стан і збережений результат (див. ReportJobService)."""
+    __tablename__ = 'report_job'
+
+    id = db.Column(db.String(32), primary_key=True)
+    report = db.Column(db.String(100), nullable=False)
+    params = db.Column(db.Text, nullable=False)
+    params_key = db.Column(db.String(40), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.now)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    # Пошук готового результату з тими самими параметрами; черга — за станом
+    __table_args__ = (
+        db.Index('ix_report_job_report_key', 'report', 'params_key'),
+        db.Index('ix_report_job_status_created', 'status', 'created_at'),
+    )
+
+    def __init__(self, id, report, params, params_key, client_id, expires_at):
+        self.id = id
+        self.report = report
+        self.params = params
+        self.params_key = params_key
+        self.client_id = client_id
+        self.expires_at = expires_at
+        self.status = 'queued'
@@ -0,0 +1,33 @@
+from . import db
+
+
+class PassDailySales(db.Model):
+    """Продажі абонементів за день і тип: кількість та виручка (див. SalesCubeService)."""
+    __tablename__ = 'pass_daily_sales'
+
+    day = db.Column(db.Date, primary_key=True)
+    pass_type_id = db.Column(db.Integer, db.ForeignKey('pass_type.id'), primary_key=True)
+    passes_sold = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, day, pass_type_id, passes_sold=0, revenue=0):
+        self.day = day
+        self.pass_type_id = pass_type_id
+        self.passes_sold = passes_sold
+        self.revenue = revenue
+
+
+class RentalDailySales(db.Model):
+    """Оренди за день і тип оренди: кількість та виручка (див. SalesCubeService)."""
+    __tablename__ = 'rental_daily_sales'
+
+    day = db.Column(db.Date, primary_key=True)
+    rental_type = db.Column(db.String(100), primary_key=True)
+    rentals = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, day, rental_type, rentals=0, revenue=0):
+        self.day = day
+        self.rental_type = rental_type
+        self.rentals = rentals
+        self.revenue = revenue
@@ -0,0 +1,31 @@
+from . import db
+
+
+class SavedViewSnapshot(db.Model):
+    """Матеріалізований результат збереженого перегляду: рядки, параметри та час обчислення (див. SavedViewService)."""
+    __tablename__ = 'saved_view_snapshot'
+
+    view_id = db.Column(db.Integer, db.ForeignKey('saved_view.id', ondelete='CASCADE'), primary_key=True)
+    schedule = db.Column(db.String(20), nullable=False, default='manual')
+    columns = db.Column(db.Text)
+    rows = db.Column(db.Text)
+    row_count = db.Column(db.Integer)
+    truncated = db.Column(db.Boolean, nullable=False, default=False)
+    params = db.Column(db.Text)
+    computed_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+    error = db.Column(db.Text)
+    next_refresh_at = db.Column(db.DateTime)
+
+    view = db.relationship('SavedView', backref=db.backref('snapshot', uselist=False, cascade='all, delete-orphan'))
+
+    # Планувальник вибирає знімки, час оновлення яких настав
+    __table_args__ = (
+        db.Index('ix_saved_view_snapshot_next_refresh', 'next_refresh_at'),
+    )
+
+    def __init__(self, view_id, schedule, next_refresh_at=None):
+        self.view_id = view_id
+        self.schedule = schedule
+        self.next_refresh_at = next_refresh_at
+        self.truncated = False
@@ -0,0 +1,19 @@
+import datetime
+
+from . import db
+
+
+class ScanJournalCheckpoint(db.Model):
+    """
+    Останній номер запису журналу буфера сканувань, уже записаний у lift_usage (див. ScanBuffer).
+    Оновлюється в тій самій транзакції, що й пачка проходів, тож повтор журналу після збою не дублює поїздки.
+    """
+    __tablename__ = 'scan_journal_checkpoint'
+
+    journal = db.Column(db.String(255), primary_key=True)
+    last_seq = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.now)
+
+    def __init__(self, journal, last_seq=0):
+        self.journal = journal
+        self.last_seq = last_seq
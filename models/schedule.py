@@ -10,6 +10,12 @@ class Schedule(db.Model):
     shift_start = db.Column(db.Time, nullable=False)
     shift_end = db.Column(db.Time, nullable=False)
 
+    # Індекси: хто працює в день, графік працівника
+    __table_args__ = (
+        db.Index('ix_schedule_work_date_employee', 'work_date', 'employee_id'),
+        db.Index('ix_schedule_employee_id', 'employee_id'),
+    )
+
     def __init__(self, employee_id, work_date, shift_start, shift_end):
         self.employee_id = employee_id
         self.work_date = work_date
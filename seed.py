@@ -16,6 +16,8 @@ from models.passes import Pass
 from models.rental import Rental
 from models.rental_equipment import RentalEquipment
 from models.pass_lift_usage import PassLiftUsage
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from services.sales_cube_service import SalesCubeService
 
 
 def seed_data():
@@ -178,6 +180,9 @@ def seed_data():
 
         db.session.add_all([sch1, sch2, pass1, pass2, rent1, lu1, lu2])
         db.session.commit()
+        # Продажі та lift_usage додано напряму, в обхід сервісів — перераховуємо денні агрегати
+        LiftUsageRollupService.rebuild()
+        SalesCubeService.rebuild()
         print("Linked data committed.")
 
         # --- 6. Створення даних для таблиць зв'язку (Junction Tables) ---
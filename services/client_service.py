@@ -5,7 +5,9 @@ from models.key import Key, AccessRight
 from models.lift_usage import LiftUsage
 from models.passes import Pass
 from models.rental import Rental
+from models.report_job import ReportJob
 from models.saved_view import SavedView
+from models.saved_view_snapshot import SavedViewSnapshot
 from utils.query_helper import QueryHelper
 from sqlalchemy import String, Enum
 
@@ -46,7 +48,8 @@ class ClientService:
 
     @staticmethod
     def get_all(sort_by=None, sort_order='asc',
-                filter_cols=None, filter_ops=None, filter_vals=None):  # <-- Тільки нові параметри
+                filter_cols=None, filter_ops=None, filter_vals=None,  # <-- Тільки нові параметри
+                cursor=None, page_size=None, yield_per=None, columns=None):
 
         # 1. Початковий запит з JOIN
         query = db.session.query(Client, Key).join(Key, Client.authorization_fkey == Key.id).filter(
@@ -59,6 +62,15 @@ class ClientService:
 
         # 4. Застосовуємо фільтри та сортування
         query = QueryHelper.apply_filters(query, models_map, filter_cols, filter_ops, filter_vals)
+        if yield_per:
+            # password_hash ніколи не потрапляє в експорт
+            query = QueryHelper.apply_sorting(query, models_map, sort_by, sort_order)
+            export_columns = QueryHelper.model_columns(Client) + [Key.login, Key.access_right]
+            return QueryHelper.stream(query, export_columns, yield_per)
+        if columns:
+            query = QueryHelper.project(query, models_map, columns, sort_by)
+        if page_size:
+            return QueryHelper.paginate(query, models_map, sort_by, sort_order, cursor, page_size)
         query = QueryHelper.apply_sorting(query, models_map, sort_by, sort_order)
 
         return query.all()
@@ -137,7 +149,10 @@ class ClientService:
             # --- ПОЧАТОК ЗМІН ---
             # Каскадне видалення: викликаємо сервіси для всіх залежностей
 
-            # 1. Saved Views (не має дітей)
+            # 1. Saved Views і їх знімки (масовий DELETE не запускає ORM-каскад, а SQLite не виконує ON DELETE)
+            views = db.session.query(SavedView.id).filter_by(client_id=client.id)
+            SavedViewSnapshot.query.filter(SavedViewSnapshot.view_id.in_(views.scalar_subquery())) \
+                .delete(synchronize_session=False)
             SavedView.query.filter_by(client_id=client.id).delete(synchronize_session=False)
 
             # 2. Passes (PassService видалить PassLiftUsage і PassRentalUsage)
@@ -154,6 +169,9 @@ class ClientService:
             usages_to_delete = LiftUsage.query.filter_by(client_id=client.id).all()
             for usage in usages_to_delete:
                 LiftUsageService.delete(usage.id)
+
+            # 5. Фонові звіти (не мають дітей)
+            ReportJob.query.filter_by(client_id=client.id).delete(synchronize_session=False)
             # --- КІНЕЦЬ ЗМІН ---
 
             if key:
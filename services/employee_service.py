@@ -9,7 +9,8 @@ class EmployeeService:
     @staticmethod
     def get_all(sort_by=None, sort_order='asc',
                 filter_cols=None, filter_ops=None, filter_vals=None,
-                filter_by=None, filter_value=None):
+                filter_by=None, filter_value=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
 
         return QueryHelper.get_all(
             Employee,
@@ -19,7 +20,11 @@ class EmployeeService:
             filter_ops,
             filter_vals,
             filter_by=filter_by,  # <-- Передаємо старі
-            filter_value=filter_value  # <-- Передаємо старі
+            filter_value=filter_value,  # <-- Передаємо старі
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -10,7 +10,8 @@ class EquipmentService:
 
     @staticmethod
     def get_all(sort_by=None, sort_order='asc', filter_by=None, filter_value=None,
-                filter_cols=None, filter_ops=None, filter_vals=None):
+                filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
 
         return QueryHelper.get_all(
             Equipment,
@@ -21,6 +22,10 @@ class EquipmentService:
             filter_vals,
             filter_by=filter_by,
             filter_value=filter_value,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
 
@@ -58,7 +63,7 @@ class EquipmentService:
                 except ValueError:
                     pass
             else:
-                query = query.filter(column.ilike(f'%{filter_value}%'))
+                query = query.filter(QueryHelper.contains(column, f'%{filter_value}%'))
 
         if sort_by in sort_filter_options:
             column = sort_filter_options[sort_by]
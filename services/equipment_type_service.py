@@ -8,7 +8,8 @@ class EquipmentTypeService:
 
     @staticmethod
     def get_all(filter_cols=None, filter_ops=None, filter_vals=None,sort_by=None, sort_order='asc',
-                filter_by=None, filter_value=None):
+                filter_by=None, filter_value=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             EquipmentType,
             sort_by,
@@ -18,6 +19,10 @@ class EquipmentTypeService:
             filter_vals,
             filter_by=filter_by,
             filter_value=filter_value,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
 
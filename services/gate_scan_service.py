@@ -0,0 +1,144 @@
+import datetime
+from collections import namedtuple
+
+from sqlalchemy import insert, literal, select, update
+
+from models import db
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.pass_lift_usage import PassLiftUsage
+from models.pass_type import PassType
+from models.passes import Pass
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from utils.pass_validity_cache import PassValidityCache
+
+# Результат зарахованого проходу через турнікет
+GateScan = namedtuple('GateScan', 'lift_usage_id pass_id client_id remaining_lifts')
+
+
+class ScanRejected(ValueError):
+    """Прохід не зараховано: абонемент не знайдено, він недійсний на цю дату або підйоми вичерпано."""
+
+
+def parse_timestamp(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid scan timestamp: {value!r}.")
+
+
+def _rejection_reason(pass_id, day) -> str:
+    """Чому умовне списання не спрацювало — окремий запит лише для відхилених проходів."""
+    row = db.session.execute(
+        select(Pass.valid_from, Pass.valid_to, Pass.remaining_lifts, PassType.limit_lifts)
+        .join(PassType, Pass.pass_type_id == PassType.id)
+        .where(Pass.id == pass_id)
+    ).first()
+    if row is None:
+        return f"Pass with id={pass_id} is not found."
+    if row.limit_lifts <= 0:
+        return f"Pass {pass_id} is not a lift-based pass."
+    if not row.valid_from <= day <= row.valid_to:
+        return f"Pass {pass_id} is not valid on {day.isoformat()}."
+    return f"Pass {pass_id} has no remaining lifts."
+
+
+class GateScanService:
+    """
+    Прийом сканувань з турнікетів. Один прохід — одна транзакція: умовне списання підйому
+    з абонемента, запис lift_usage і pass_lift_usage та денні агрегати. На відміну від
+    LiftUsageService.add + PassLiftUsageService.add тут немає попередніх SELECT і
+    read-modify-write: перевірки виконує сам UPDATE, тож два турнікети, що одночасно
+    сканують той самий абонемент, не можуть списати один і той самий підйом.
+    """
+
+    @staticmethod
+    def validate(pass_id, day, pending=0):
+        """
+        Перевірка абонемента на турнікеті за кешем придатності (БД — лише при промаху).
+        pending — проходи за цим абонементом, підтверджені, але ще не списані в БД.
+        Повертає запис PassValidity або кидає ScanRejected.
+        """
+        entry = PassValidityCache.get(pass_id)
+        if entry is None:
+            raise ScanRejected(f"Pass with id={pass_id} is not found.")
+        if entry.limit_lifts <= 0:
+            raise ScanRejected(f"Pass {pass_id} is not a lift-based pass.")
+        if not entry.is_valid_on(day):
+            raise ScanRejected(f"Pass {pass_id} is not valid on {day.isoformat()}.")
+        if entry.remaining_lifts - pending <= 0:
+            raise ScanRejected(f"Pass {pass_id} has no remaining lifts.")
+        return entry
+
+    @staticmethod
+    def record_scan(pass_id, lift_id, scanned_at, ended_at=None) -> GateScan:
+        """
+        Зараховує прохід за абонементом pass_id на підйомник lift_id у момент scanned_at
+        (datetime або ISO-рядок). ended_at — кінець підйому, якщо турнікет його знає.
+        Кидає ScanRejected, якщо абонемент не можна використати, і ValueError для некоректних даних.
+        """
+        scanned_at = parse_timestamp(scanned_at)
+        ended_at = parse_timestamp(ended_at) if ended_at else scanned_at
+        # Недійсний абонемент відхиляється за кешем, без звернення до БД; для решти остаточне слово — за UPDATE
+        GateScanService.validate(pass_id, scanned_at.date())
+        try:
+            scan = GateScanService.apply_scan(pass_id, lift_id, scanned_at, ended_at)
+        except ValueError:
+            db.session.rollback()
+            # Кеш вважав абонемент придатним, а БД — ні: запис застарів (зміна в іншому процесі)
+            PassValidityCache.invalidate(pass_id)
+            raise
+        LiftUsageRollupService.apply(scanned_at.date(), lift_id, scan.client_id, scanned_at.time(), 1)
+        db.session.commit()
+        PassValidityCache.set_remaining_lifts(pass_id, scan.remaining_lifts)
+        return scan
+
+    @staticmethod
+    def apply_scan(pass_id, lift_id, scanned_at, ended_at) -> GateScan:
+        """
+        Записує один прохід у поточній транзакції без агрегатів і коміту (їх робить викликаючий код,
+        див. також ScanBuffer). Відхилений прохід не залишає змін у транзакції.
+        """
+        day, start_time, end_time = scanned_at.date(), scanned_at.time(), ended_at.time()
+
+        # 1. Списання: рядок змінюється лише якщо абонемент на підйоми, дійсний у цей день і ще не вичерпаний
+        deducted = db.session.execute(
+            update(Pass)
+            .where(
+                Pass.id == pass_id,
+                Pass.remaining_lifts > 0,
+                Pass.valid_from <= day,
+                Pass.valid_to >= day,
+                Pass.pass_type_id.in_(select(PassType.id).where(PassType.limit_lifts > 0)),
+            )
+            .values(remaining_lifts=Pass.remaining_lifts - 1)
+            .returning(Pass.client_id, Pass.remaining_lifts),
+            execution_options={'synchronize_session': False},
+        ).first()
+        if deducted is None:
+            raise ScanRejected(_rejection_reason(pass_id, day))
+        client_id, remaining_lifts = deducted
+
+        # 2. Поїздка: INSERT ... SELECT з lift перевіряє існування підйомника без окремого запиту
+        lift_usage_id = db.session.execute(
+            insert(LiftUsage)
+            .from_select(
+                ['client_id', 'lift_id', 'usage_date', 'usage_time_start', 'usage_time_end'],
+                select(literal(client_id), Lift.id, literal(day), literal(start_time), literal(end_time))
+                .where(Lift.id == lift_id),
+            )
+            .returning(LiftUsage.id)
+        ).scalar()
+        if lift_usage_id is None:
+            # Повертаємо списаний підйом, щоб решта транзакції (пачка ScanBuffer) лишилася коректною
+            db.session.execute(
+                update(Pass).where(Pass.id == pass_id).values(remaining_lifts=Pass.remaining_lifts + 1),
+                execution_options={'synchronize_session': False},
+            )
+            raise ValueError(f"Lift with ID {lift_id} is not found.")
+
+        # 3. Зв'язок поїздки з абонементом
+        db.session.execute(insert(PassLiftUsage).values(pass_id=pass_id, lift_usage_id=lift_usage_id))
+        return GateScan(lift_usage_id, int(pass_id), client_id, remaining_lifts)
@@ -7,7 +7,8 @@ class LiftService:
 
     @staticmethod
     def get_all(sort_by=None, sort_order='asc', filter_by=None, filter_value=None,
-                filter_cols=None, filter_ops=None, filter_vals=None):
+                filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             Lift,
             sort_by,
@@ -17,6 +18,10 @@ class LiftService:
             filter_vals,
             filter_by=filter_by,
             filter_value=filter_value,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -0,0 +1,149 @@
+import csv
+import datetime
+import io
+from collections import namedtuple
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import insert, select
+
+from models import db
+from models.client import Client
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from utils.lift_usage_snapshot import LiftUsageSnapshot
+from utils.report_cache import ReportCache
+
+# Скільки рядків вставляти одним executemany / COPY
+IMPORT_BATCH_SIZE = 10000
+
+# Скільки відхилених рядків описувати в звіті (решта лише рахується)
+MAX_REPORTED_REJECTS = 200
+
+# Колонки журналу турнікетів (рядок заголовка обов'язковий, зайві колонки ігноруються)
+IMPORT_COLUMNS = ('client_id', 'lift_id', 'usage_date', 'usage_time_start', 'usage_time_end')
+
+# Результат імпорту: rejected — [(номер рядка файлу, причина)], не більше MAX_REPORTED_REJECTS
+LiftUsageImport = namedtuple('LiftUsageImport', 'imported rejected_count rejected')
+
+
+def _parse_row(record, client_ids, lift_ids):
+    """Рядок журналу -> словник для INSERT. Кидає ValueError з причиною відхилення."""
+    client_id, lift_id = int(record['client_id']), int(record['lift_id'])
+    if client_id not in client_ids:
+        raise ValueError(f'Client with ID {client_id} is not found.')
+    if lift_id not in lift_ids:
+        raise ValueError(f'Lift with ID {lift_id} is not found.')
+    start = datetime.time.fromisoformat(record['usage_time_start'])
+    end = datetime.time.fromisoformat(record['usage_time_end'])
+    if end < start:
+        raise ValueError('Ride ends before it starts.')
+    return {
+        'client_id': client_id,
+        'lift_id': lift_id,
+        'usage_date': datetime.date.fromisoformat(record['usage_date']),
+        'usage_time_start': start,
+        'usage_time_end': end,
+    }
+
+
+def _copy_batch(batch) -> None:
+    """COPY ... FROM STDIN у з'єднанні поточної транзакції (psycopg2 або psycopg 3)."""
+    cursor = db.session.connection().connection.driver_connection.cursor()
+    statement = f"COPY {LiftUsage.__tablename__} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch:
+                writer.writerow([row[name].isoformat() if hasattr(row[name], 'isoformat') else row[name]
+                                 for name in IMPORT_COLUMNS])
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+        else:
+            with cursor.copy(statement) as copy:
+                for row in batch:
+                    copy.write_row([row[name] for name in IMPORT_COLUMNS])
+    finally:
+        cursor.close()
+
+
+def _write_batch(batch) -> None:
+    if db.session.get_bind().dialect.name == 'postgresql':
+        _copy_batch(batch)
+    else:
+        db.session.execute(insert(LiftUsage), batch)
+
+
+class LiftUsageImportService:
+    """
+    Масове завантаження журналів турнікетів у lift_usage. Файл читається потоково,
+    id клієнтів і підйомників перевіряються за множинами, завантаженими один раз
+    (без get_by_id на кожен рядок), а рядки вставляються пачками: executemany,
+    на PostgreSQL — COPY. Весь імпорт — одна транзакція разом із перерахунком
+    денних агрегатів за дати з файлу.
+    """
+
+    @staticmethod
+    def import_csv(stream, batch_size=IMPORT_BATCH_SIZE) -> LiftUsageImport:
+        """Імпортує CSV з текстового потоку stream. Некоректні рядки пропускаються й описуються у звіті."""
+        reader = csv.DictReader(stream)
+        missing = [name for name in IMPORT_COLUMNS if name not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"The log has no column(s): {', '.join(missing)}.")
+
+        client_ids = set(db.session.scalars(select(Client.id)))
+        lift_ids = set(db.session.scalars(select(Lift.id)))
+
+        imported, rejected_count, rejected = 0, 0, []
+        first_day = last_day = None
+        batch = []
+        try:
+            # Рядок 1 — заголовок, тож перший рядок даних має номер 2
+            for line_number, record in enumerate(reader, start=2):
+                try:
+                    row = _parse_row(record, client_ids, lift_ids)
+                except (TypeError, ValueError) as e:
+                    rejected_count += 1
+                    if len(rejected) < MAX_REPORTED_REJECTS:
+                        rejected.append((line_number, str(e)))
+                    continue
+
+                day = row['usage_date']
+                first_day = day if first_day is None or day < first_day else first_day
+                last_day = day if last_day is None or day > last_day else last_day
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    _write_batch(batch)
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                _write_batch(batch)
+                imported += len(batch)
+
+            if imported:
+                LiftUsageRollupService.rebuild_range(first_day, last_day)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if imported:
+            # COPY проходить повз події сесії, тож кеш звітів і знімок дізнаються про нові рядки явно
+            ReportCache.bump(LiftUsage.__tablename__)
+            LiftUsageSnapshot.invalidate(reload=False)
+        return LiftUsageImport(imported, rejected_count, rejected)
+
+
+@click.command('import-lift-usages')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, default=IMPORT_BATCH_SIZE, show_default=True)
+@with_appcontext
+def import_lift_usages_command(path, batch_size):
+    """Bulk-load a turnstile CSV log into lift_usage."""
+    with open(path, newline='', encoding='utf-8') as f:
+        result = LiftUsageImportService.import_csv(f, batch_size)
+    for line_number, reason in result.rejected:
+        click.echo(f'line {line_number}: {reason}', err=True)
+    click.echo(f'Imported {result.imported} rides, rejected {result.rejected_count} rows.')
@@ -0,0 +1,120 @@
+from collections import Counter
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import case, delete, extract, func, insert, select
+
+from models.lift_usage import LiftUsage, db
+from models.lift_usage_daily import BUCKET_MINUTES, ClientDailyRides, LiftBucketRides, LiftDailyRides, time_bucket
+from utils.rollup import apply_deltas
+
+
+def _rollups(usage_date, lift_id, client_id, start_time):
+    """Рядки агрегатів, яких стосується один підйом: (модель, ключ)."""
+    return (
+        (LiftDailyRides, {'usage_date': usage_date, 'lift_id': lift_id}),
+        (ClientDailyRides, {'usage_date': usage_date, 'client_id': client_id}),
+        (LiftBucketRides, {'usage_date': usage_date, 'lift_id': lift_id, 'bucket': time_bucket(start_time)}),
+    )
+
+
+def _bucket_expression(time_col):
+    # CASE замість ділення: extract() повертає ціле в SQLite, але дробове число в PostgreSQL
+    minute = extract('minute', time_col)
+    quarter = case((minute < 15, 0), (minute < 30, 1), (minute < 45, 2), else_=3)
+    return extract('hour', time_col) * (60 // BUCKET_MINUTES) + quarter
+
+
+class LiftUsageRollupService:
+    """
+    Денні агрегати підйомів (usage_date, lift_id) -> rides, (usage_date, client_id) -> rides
+    і (usage_date, lift_id, 15-хвилинний кошик) -> rides. Оновлюються LiftUsageService у тій самій транзакції, що й lift_usage, тож звіти
+    читають з них замість агрегування всіх сирих рядків сезону.
+    """
+
+    @staticmethod
+    def apply(usage_date, lift_id, client_id, start_time, delta) -> None:
+        """Додає delta підйомів до всіх агрегатів. Коміт робить викликаючий сервіс."""
+        for model_class, key in _rollups(usage_date, lift_id, client_id, start_time):
+            apply_deltas(model_class, key, {'rides': delta}, count_column='rides')
+
+    @staticmethod
+    def apply_many(rides) -> None:
+        """
+        Додає пачку підйомів — ітерований (usage_date, lift_id, client_id, start_time):
+        один upsert на клітинку агрегату, а не на кожен підйом. Коміт робить викликаючий сервіс.
+        """
+        counts = Counter()
+        for usage_date, lift_id, client_id, start_time in rides:
+            for model_class, key in _rollups(usage_date, lift_id, client_id, start_time):
+                counts[model_class, tuple(key.items())] += 1
+        for (model_class, key), rides_count in counts.items():
+            apply_deltas(model_class, dict(key), {'rides': rides_count}, count_column='rides')
+
+    @staticmethod
+    def rebuild() -> dict:
+        """Перераховує всі агрегати з lift_usage. Повертає кількість рядків у кожному."""
+        LiftUsageRollupService._recompute()
+        db.session.commit()
+        return {
+            model_class.__tablename__: db.session.scalar(select(func.count()).select_from(model_class))
+            for model_class in (LiftDailyRides, ClientDailyRides, LiftBucketRides)
+        }
+
+    @staticmethod
+    def rebuild_range(start_date, end_date) -> None:
+        """
+        Перераховує агрегати лише за інклюзивний період дат — після масового завантаження
+        поїздок (див. LiftUsageImportService). Коміт робить викликаючий сервіс.
+        """
+        LiftUsageRollupService._recompute(start_date, end_date)
+
+    @staticmethod
+    def _recompute(start_date=None, end_date=None) -> None:
+        def period(date_col):
+            if start_date is None:
+                return []
+            return [date_col >= start_date, date_col <= end_date]
+
+        for model_class in (LiftDailyRides, ClientDailyRides, LiftBucketRides):
+            db.session.execute(delete(model_class).where(*period(model_class.usage_date)))
+        usages = period(LiftUsage.usage_date)
+        db.session.execute(insert(LiftDailyRides).from_select(
+            ['usage_date', 'lift_id', 'rides'],
+            select(LiftUsage.usage_date, LiftUsage.lift_id, func.count(LiftUsage.id))
+            .where(*usages)
+            .group_by(LiftUsage.usage_date, LiftUsage.lift_id)))
+        db.session.execute(insert(ClientDailyRides).from_select(
+            ['usage_date', 'client_id', 'rides'],
+            select(LiftUsage.usage_date, LiftUsage.client_id, func.count(LiftUsage.id))
+            .where(*usages)
+            .group_by(LiftUsage.usage_date, LiftUsage.client_id)))
+        bucket = _bucket_expression(LiftUsage.usage_time_start)
+        db.session.execute(insert(LiftBucketRides).from_select(
+            ['usage_date', 'lift_id', 'bucket', 'rides'],
+            select(LiftUsage.usage_date, LiftUsage.lift_id, bucket, func.count(LiftUsage.id))
+            .where(*usages)
+            .group_by(LiftUsage.usage_date, LiftUsage.lift_id, bucket)))
+
+    @staticmethod
+    def ensure_built() -> bool:
+        """
+        Заповнює агрегати, якщо вони порожні, а lift_usage — ні (щойно створені таблиці
+        на наявній БД). Повертає True, якщо знадобилося перерахування.
+        """
+        # Кошики перевіряються окремо: на БД, створеній до їх появи, денні агрегати вже заповнені
+        has_rollups = (db.session.scalar(select(LiftDailyRides.lift_id).limit(1)) is not None
+                       and db.session.scalar(select(LiftBucketRides.lift_id).limit(1)) is not None)
+        has_usages = db.session.scalar(select(LiftUsage.id).limit(1)) is not None
+        if has_rollups or not has_usages:
+            return False
+        LiftUsageRollupService.rebuild()
+        return True
+
+
+@click.command('rebuild-rollups')
+@with_appcontext
+def rebuild_rollups_command():
+    """Recompute the daily lift-usage rollup tables from lift_usage."""
+    for table_name, rows in LiftUsageRollupService.rebuild().items():
+        click.echo(f'{table_name}: {rows} rows')
@@ -1,16 +1,19 @@
 import datetime
 
 from models.lift_usage import LiftUsage, db
+from models.lift_usage_daily import time_bucket
 from models.pass_lift_usage import PassLiftUsage
 from services.client_service import ClientService
 from services.lift_service import LiftService
+from services.lift_usage_rollup_service import LiftUsageRollupService
 from utils.query_helper import QueryHelper
 
 
 class LiftUsageService:
 
     @staticmethod
-    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None):
+    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             LiftUsage,
             sort_by,
@@ -18,6 +21,10 @@ class LiftUsageService:
             filter_cols,
             filter_ops,
             filter_vals,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -34,6 +41,7 @@ class LiftUsageService:
             raise ValueError(f"Lift with ID {lift_id} is not found.")
         new_usage = LiftUsage(client_id, lift_id, usage_date, usage_time_start, usage_time_end)
         db.session.add(new_usage)
+        LiftUsageRollupService.apply(usage_date, lift_id, client_id, usage_time_start, 1)
         db.session.commit()
         return new_usage
 
@@ -50,6 +58,11 @@ class LiftUsageService:
         elif not lift:
             raise ValueError(f"Lift with ID {lift_id} is not found.")
 
+        if (usage.usage_date, usage.lift_id, usage.client_id, time_bucket(usage.usage_time_start)) != \
+                (usage_date, lift_id, client_id, time_bucket(usage_time_start)):
+            LiftUsageRollupService.apply(usage.usage_date, usage.lift_id, usage.client_id, usage.usage_time_start, -1)
+            LiftUsageRollupService.apply(usage_date, lift_id, client_id, usage_time_start, 1)
+
         usage.client_id = client_id
         usage.lift_id = lift_id
         usage.usage_date = usage_date
@@ -67,6 +80,7 @@ class LiftUsageService:
             PassLiftUsage.query.filter_by(lift_usage_id=id).delete(synchronize_session=False)
             # --- КІНЕЦЬ ЗМІН ---
 
+            LiftUsageRollupService.apply(usage.usage_date, usage.lift_id, usage.client_id, usage.usage_time_start, -1)
             db.session.delete(usage)
             db.session.commit()
             return True
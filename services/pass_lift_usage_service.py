@@ -2,20 +2,26 @@ from models.pass_lift_usage import PassLiftUsage
 from models import db
 from services.pass_service import PassService
 from services.lift_usage_service import LiftUsageService
+from utils.pass_validity_cache import PassValidityCache
 from utils.query_helper import QueryHelper
 
 
 class PassLiftUsageService:
 
     @staticmethod
-    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None):
+    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             PassLiftUsage,
             sort_by,
             sort_order,
             filter_cols,
             filter_ops,
-            filter_vals
+            filter_vals,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -45,6 +51,7 @@ class PassLiftUsageService:
         new_entry = PassLiftUsage(pass_id=pass_id, lift_usage_id=lift_usage_id)
         db.session.add(new_entry)
         db.session.commit()
+        PassValidityCache.invalidate(pass_id)
         return new_entry
 
     @staticmethod
@@ -80,5 +87,6 @@ class PassLiftUsageService:
 
             db.session.delete(entry)
             db.session.commit()
+            PassValidityCache.invalidate(pass_id)
             return True
         return False
@@ -2,6 +2,7 @@ from models.pass_rental_usage import PassRentalUsage
 from models import db
 from services.pass_service import PassService
 from services.rental_service import RentalService
+from utils.pass_validity_cache import PassValidityCache
 from utils.query_helper import QueryHelper
 from datetime import datetime
 
@@ -9,14 +10,19 @@ from datetime import datetime
 class PassRentalUsageService:
 
     @staticmethod
-    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None):
+    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             PassRentalUsage,
             sort_by,
             sort_order,
             filter_cols,
             filter_ops,
-            filter_vals
+            filter_vals,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -68,6 +74,7 @@ class PassRentalUsageService:
         )
         db.session.add(new_entry)
         db.session.commit()
+        PassValidityCache.invalidate(pass_id)
         return new_entry
 
     @staticmethod
@@ -98,5 +105,6 @@ class PassRentalUsageService:
 
             db.session.delete(entry)
             db.session.commit()
+            PassValidityCache.invalidate(pass_id)
             return True
         return False
\ No newline at end of file
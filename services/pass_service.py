@@ -5,13 +5,21 @@ from models.pass_rental_usage import PassRentalUsage
 from models.passes import Pass, db
 from services.client_service import ClientService
 from services.pass_type_service import PassTypeService
+from services.sales_cube_service import SalesCubeService
+from sqlalchemy.orm import joinedload
+from utils.pass_validity_cache import PassValidityCache
 from utils.query_helper import QueryHelper
 
 
 class PassService:
 
+    # Ліміти типу читають PassLiftUsageService і PassRentalUsageService при кожному списанні й поверненні:
+    # get_by_id вантажить pass_type тим самим запитом. Див. QueryHelper.loader_options.
+    LOAD_POLICY = ((joinedload, 'pass_type'),)
+
     @staticmethod
-    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None):
+    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             Pass,
             sort_by,
@@ -19,11 +27,15 @@ class PassService:
             filter_cols,
             filter_ops,
             filter_vals,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
     def get_by_id(id):
-        return Pass.query.get(id)
+        return db.session.get(Pass, id, options=QueryHelper.loader_options(Pass, PassService.LOAD_POLICY))
 
     @staticmethod
     def add(client_id, pass_type_id, purchase_date, valid_from, valid_to):
@@ -38,6 +50,7 @@ class PassService:
         new_pass = Pass(client_id, pass_type_id, purchase_date, valid_from,
                         valid_to, pass_type.limit_lifts, pass_type.limit_hours)
         db.session.add(new_pass)
+        SalesCubeService.record_pass(purchase_date, pass_type_id)
         db.session.commit()
         return new_pass
 
@@ -55,6 +68,11 @@ class PassService:
         if not pass_type:
             raise ValueError(f"Pass type with ID {pass_type_id} is not found.")
 
+        old_sale = (pass_.purchase_date, pass_.pass_type_id)
+        if old_sale != (purchase_date, pass_type_id):
+            SalesCubeService.record_pass(*old_sale, sign=-1)
+            SalesCubeService.record_pass(purchase_date, pass_type_id)
+
         pass_.client_id = client_id
         pass_.pass_type_id = pass_type_id
         pass_.purchase_date = purchase_date
@@ -63,6 +81,7 @@ class PassService:
         pass_.remaining_lifts = remaining_lifts
         pass_.remaining_hours = remaining_hours
         db.session.commit()
+        PassValidityCache.invalidate(id)
         return pass_
 
     @staticmethod
@@ -71,7 +90,9 @@ class PassService:
         if pass_:
             PassLiftUsage.query.filter_by(pass_id=id).delete(synchronize_session=False)
             PassRentalUsage.query.filter_by(pass_id=id).delete(synchronize_session=False)
+            SalesCubeService.record_pass(pass_.purchase_date, pass_.pass_type_id, sign=-1)
             db.session.delete(pass_)
             db.session.commit()
+            PassValidityCache.invalidate(id)
             return True
         return False
\ No newline at end of file
@@ -1,5 +1,7 @@
 from models.pass_type import PassType, db
 from models.passes import Pass
+from services.sales_cube_service import SalesCubeService
+from utils.pass_validity_cache import PassValidityCache
 from utils.query_helper import QueryHelper
 
 
@@ -7,7 +9,8 @@ class PassTypeService:
 
     @staticmethod
     def get_all(sort_by=None, sort_order='asc', filter_by=None, filter_value=None,
-                filter_cols=None, filter_ops=None, filter_vals=None):
+                filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             PassType,
             sort_by,
@@ -17,6 +20,10 @@ class PassTypeService:
             filter_vals,
             filter_by=filter_by,
             filter_value=filter_value,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
 
@@ -39,7 +46,11 @@ class PassTypeService:
             pass_type.limit_lifts = limit_lifts
             pass_type.limit_hours = limit_hours
             pass_type.price = price
+            # Виручка куба рахується за ціною типу, тож перераховується в тій самій транзакції
+            SalesCubeService.reprice_pass_type(id, price)
             db.session.commit()
+            # Ліміти типу входять у запис кешу кожного абонемента цього типу
+            PassValidityCache.clear()
             return True
         return False
 
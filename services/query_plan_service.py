@@ -0,0 +1,91 @@
+import difflib
+import hashlib
+import json
+
+from models.query_plan import QueryPlan, db
+
+
+def _statement_hash(statement):
+    return hashlib.sha1(' '.join(statement.split()).encode('utf-8')).hexdigest()[:16]
+
+
+def _explain_postgresql(connection, statement, parameters):
+    """EXPLAIN (ANALYZE, BUFFERS) у форматі JSON: план, оцінка/факт рядків та час."""
+    row = connection.exec_driver_sql(
+        f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}', parameters).scalar()
+    result = (json.loads(row) if isinstance(row, str) else row)[0]
+    root = result['Plan']
+    return {
+        'plan': json.dumps(result, indent=2),
+        'estimated_rows': root.get('Plan Rows'),
+        'actual_rows': root.get('Actual Rows'),
+        'planning_ms': result.get('Planning Time'),
+        'execution_ms': result.get('Execution Time'),
+    }
+
+
+def _explain_sqlite(connection, statement, parameters):
+    """EXPLAIN QUERY PLAN: SQLite не дає оцінок рядків, лише дерево кроків."""
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return {'plan': '\n'.join(lines)}
+
+
+_EXPLAINERS = {
+    'postgresql': _explain_postgresql,
+    'sqlite': _explain_sqlite,
+}
+
+
+class QueryPlanService:
+
+    @staticmethod
+    def is_explainable(statement) -> bool:
+        """Пояснюємо лише читання: EXPLAIN ANALYZE реально виконує запит."""
+        return statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+
+    @staticmethod
+    def explain(connection, statement, parameters) -> dict:
+        """Повертає план запиту для поточної СУБД або None, якщо СУБД не підтримується."""
+        explainer = _EXPLAINERS.get(connection.dialect.name)
+        if explainer is None:
+            return None
+        return explainer(connection, statement, parameters)
+
+    @staticmethod
+    def save_all(endpoint, url, captured) -> list:
+        """Зберігає плани, зняті за один HTTP-запит."""
+        plans = [
+            QueryPlan(endpoint=endpoint, url=url, source=item['source'],
+                      statement_hash=_statement_hash(item['statement']), statement=item['statement'],
+                      plan=item['plan'], duration_ms=item['duration_ms'],
+                      estimated_rows=item.get('estimated_rows'), actual_rows=item.get('actual_rows'),
+                      planning_ms=item.get('planning_ms'), execution_ms=item.get('execution_ms'))
+            for item in captured
+        ]
+        db.session.add_all(plans)
+        db.session.commit()
+        return plans
+
+    @staticmethod
+    def get_latest(limit=100):
+        return QueryPlan.query.order_by(QueryPlan.captured_at.desc(), QueryPlan.id.desc()).limit(limit).all()
+
+    @staticmethod
+    def get_history(statement_hash):
+        """Усі зняті плани одного запиту, від найновішого."""
+        return QueryPlan.query.filter_by(statement_hash=statement_hash) \
+            .order_by(QueryPlan.captured_at.desc(), QueryPlan.id.desc()).all()
+
+    @staticmethod
+    def diff(older, newer) -> str:
+        """Unified diff двох планів одного запиту."""
+        return '\n'.join(difflib.unified_diff(
+            older.plan.splitlines(), newer.plan.splitlines(),
+            fromfile=f'#{older.id} {older.captured_at:%Y-%m-%d %H:%M}',
+            tofile=f'#{newer.id} {newer.captured_at:%Y-%m-%d %H:%M}',
+            lineterm=''))
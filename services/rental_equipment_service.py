@@ -8,14 +8,19 @@ from utils.query_helper import QueryHelper
 class RentalEquipmentService:
 
     @staticmethod
-    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None):
+    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             RentalEquipment,
             sort_by,
             sort_order,
             filter_cols,
             filter_ops,
-            filter_vals
+            filter_vals,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -5,20 +5,26 @@ from models.rental import Rental, db
 from models.rental_equipment import RentalEquipment
 from services.client_service import ClientService
 from services.employee_service import EmployeeService
+from services.sales_cube_service import SalesCubeService
 from utils.query_helper import QueryHelper
 
 
 class RentalService:
 
     @staticmethod
-    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None):
+    def get_all(sort_by=None, sort_order='asc', filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             Rental,
             sort_by,
             sort_order,
             filter_cols,
             filter_ops,
-            filter_vals
+            filter_vals,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -35,6 +41,7 @@ class RentalService:
             raise ValueError(f"Employee with ID {employee_id} is not found.")
         new_rental = Rental(client_id, employee_id, rental_date, start_time, end_time, rental_type, total_price)
         db.session.add(new_rental)
+        SalesCubeService.record_rental(rental_date, rental_type, total_price)
         db.session.commit()
         return new_rental
 
@@ -51,6 +58,11 @@ class RentalService:
         elif not employee:
             raise ValueError(f"Employee with ID {employee_id} is not found.")
 
+        old_sale = (rental.rental_date, rental.rental_type, rental.total_price)
+        if old_sale != (rental_date, rental_type, total_price):
+            SalesCubeService.record_rental(*old_sale, sign=-1)
+            SalesCubeService.record_rental(rental_date, rental_type, total_price)
+
         rental.client_id = client_id
         rental.employee_id = employee_id
         rental.rental_date = rental_date
@@ -71,6 +83,7 @@ class RentalService:
             PassRentalUsage.query.filter_by(rental_id=id).delete(synchronize_session=False)
             # --- КІНЕЦЬ ЗМІН ---
 
+            SalesCubeService.record_rental(rental.rental_date, rental.rental_type, rental.total_price, sign=-1)
             db.session.delete(rental)
             db.session.commit()
             return True
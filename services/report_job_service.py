@@ -0,0 +1,297 @@
+import collections
+import datetime
+import decimal
+import enum
+import functools
+import hashlib
+import json
+import threading
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from sqlalchemy import delete, inspect as sa_inspect, update
+from sqlalchemy.engine import Row
+
+from models.report_job import ReportJob, db
+from services.report_service import ReportService, lift_load_heatmap
+from utils.report_executor import ReportExecutor, supports_concurrent_sessions
+
+# Фонові звіти обчислюються в цьому процесі; черга — сама таблиця report_job
+REPORT_JOB_WORKERS = 2
+
+# Скільки зберігається готовий результат (повторне відкриття — без перерахунку)
+REPORT_JOB_TTL = datetime.timedelta(hours=24)
+
+# Завдання в стані running довше цього вважається покинутим (процес зупинився) і ставиться в чергу знову
+REPORT_JOB_TIMEOUT = datetime.timedelta(minutes=30)
+
+
+# --- Серіалізація результатів у JSON ---
+
+def _to_plain(value):
+    """Рядки запитів, ORM-об'єкти, дати та Decimal -> JSON-сумісні значення з мітками типів."""
+    if isinstance(value, Row) or (isinstance(value, tuple) and hasattr(value, '_fields')):
+        # Рядки SQL і namedtuple-рядки колонкового бекенда звітів зберігаються однаково
+        return {'$row': list(value._fields), 'values': [_to_plain(v) for v in value]}
+    if isinstance(value, datetime.datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {'$time': value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _to_plain(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(v) for v in value]
+    state = sa_inspect(value, raiseerr=False)
+    if state is not None and hasattr(state, 'mapper'):
+        return {'$entity': {attr.key: _to_plain(getattr(value, attr.key)) for attr in state.mapper.column_attrs}}
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _row_class(fields):
+    return collections.namedtuple('ReportRow', fields, rename=True)
+
+
+def _from_plain(obj):
+    if '$row' in obj:
+        return _row_class(tuple(obj['$row']))(*obj['values'])
+    if '$entity' in obj:
+        return types.SimpleNamespace(**obj['$entity'])
+    if '$datetime' in obj:
+        return datetime.datetime.fromisoformat(obj['$datetime'])
+    if '$date' in obj:
+        return datetime.date.fromisoformat(obj['$date'])
+    if '$time' in obj:
+        return datetime.time.fromisoformat(obj['$time'])
+    return obj
+
+
+def _encode(value) -> str:
+    return json.dumps(_to_plain(value), ensure_ascii=False, sort_keys=True)
+
+
+def _decode(text):
+    return json.loads(text, object_hook=_from_plain)
+
+
+# --- Звіти, які можна обчислити у фоні: назва -> функція (сервіс, **параметри) -> дані шаблону ---
+
+def _equipment_rental_stats(service, start_date, end_date, specific_date):
+    return ReportExecutor.run(
+        most_rented_weekly=(service.get_most_rented_equipment_weekly, start_date, end_date),
+        count_by_type_daily=(service.get_equipment_count_by_type_daily, specific_date),
+    )
+
+
+def _pass_sales_stats(service, start_date, end_date):
+    return ReportExecutor.run(
+        sales_by_day=(service.get_pass_sales_by_day, start_date, end_date),
+        sales_by_type=(service.get_pass_sales_by_type, start_date, end_date),
+    )
+
+
+def _most_used_lifts(service, start_date, end_date):
+    return {'data': service.get_most_used_lifts_by_period(start_date, end_date)}
+
+
+def _rental_revenue_stats(service, start_date, end_date):
+    return ReportExecutor.run(
+        revenue_by_month=(service.get_rental_revenue_by_month, start_date, end_date),
+        revenue_by_quarter=(service.get_rental_revenue_by_quarter, start_date, end_date),
+    )
+
+
+def _client_pass_stats(service, specific_date):
+    return ReportExecutor.run(
+        exhausted_passes_clients=(service.get_clients_with_exhausted_passes,),
+        over_15_lifts_clients=(service.get_clients_with_over_15_lifts_daily, specific_date),
+    )
+
+
+def _february_unlimited_clients(service, pass_name, year, month):
+    return {'clients': service.get_clients_bought_pass_by_month(pass_name, year, month)}
+
+
+def _client_visit_stats(service, start_date, end_date, visit_threshold):
+    return ReportExecutor.run(
+        clients_in_range=(service.get_clients_visited_in_date_range, start_date, end_date),
+        clients_frequent=(service.get_clients_visited_more_than_x_times, visit_threshold),
+    )
+
+
+def _employee_work_stats(service, specific_date, start_date=None, end_date=None):
+    return ReportExecutor.run(
+        employees_on_date=(service.get_employees_working_on_date, specific_date),
+        employee_summary=(service.get_employee_rental_summary, start_date, end_date),
+    )
+
+
+def _period_comparison(service, comparison, windows, labels):
+    method = {'lift_usage': service.get_lift_usage_comparison,
+              'pass_sales': service.get_pass_sales_comparison}[comparison]
+    return {'rows': method(windows)}
+
+
+def _lift_heatmap(service, start_date, end_date, bucket_minutes):
+    rows = service.get_lift_load_by_time(start_date, end_date, bucket_minutes)
+    return {'heatmap': lift_load_heatmap(rows, bucket_minutes)}
+
+
+REPORT_JOBS = {
+    'equipment_rental_stats': _equipment_rental_stats,
+    'pass_sales_stats': _pass_sales_stats,
+    'most_used_lifts': _most_used_lifts,
+    'rental_revenue_stats': _rental_revenue_stats,
+    'client_pass_stats': _client_pass_stats,
+    'february_unlimited_clients': _february_unlimited_clients,
+    'client_visit_stats': _client_visit_stats,
+    'employee_work_stats': _employee_work_stats,
+    'period_comparison': _period_comparison,
+    'lift_heatmap': _lift_heatmap,
+}
+
+
+def _process_in_app_context(app, job_id):
+    with app.app_context():
+        ReportJobService.process(job_id)
+
+
+class ReportJobService:
+    """
+    Асинхронні звіти: submit() записує завдання в report_job і передає його локальному
+    пулу потоків; результат зберігається в тій самій таблиці на REPORT_JOB_TTL.
+    Зовнішній брокер не потрібен — черга працює на будь-якій БД застосунку, зокрема SQLite.
+    """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    @staticmethod
+    def _get_pool():
+        with ReportJobService._pool_lock:
+            if ReportJobService._pool is None:
+                ReportJobService._pool = ThreadPoolExecutor(max_workers=REPORT_JOB_WORKERS,
+                                                            thread_name_prefix='report-job')
+            return ReportJobService._pool
+
+    @staticmethod
+    def submit(report, params, client_id=None) -> ReportJob:
+        """
+        Ставить звіт у чергу. Якщо цей самий клієнт уже поставив такий звіт із тими самими
+        параметрами і він ще в черзі чи обчислюється — повертає наявне завдання. Готовий
+        результат заново не видається: після нього дані могли змінитися, тож звіт рахується знову.
+        """
+        if report not in REPORT_JOBS:
+            raise ValueError(f"Report '{report}' cannot run in background.")
+
+        ReportJobService.purge_expired()
+        encoded_params = _encode(params)
+        params_key = hashlib.sha1(f'{report}:{encoded_params}'.encode('utf-8')).hexdigest()
+        now = datetime.datetime.now()
+
+        existing = ReportJob.query.filter(
+            ReportJob.report == report,
+            ReportJob.params_key == params_key,
+            ReportJob.client_id == client_id,
+            ReportJob.status.in_(('queued', 'running')),
+        ).order_by(ReportJob.created_at.desc()).first()
+        if existing:
+            return existing
+
+        job = ReportJob(uuid.uuid4().hex, report, encoded_params, params_key, client_id, now + REPORT_JOB_TTL)
+        db.session.add(job)
+        db.session.commit()
+        ReportJobService._dispatch(job.id)
+        return job
+
+    @staticmethod
+    def _dispatch(job_id) -> None:
+        if supports_concurrent_sessions(db.engine):
+            ReportJobService._get_pool().submit(_process_in_app_context, current_app._get_current_object(), job_id)
+        else:
+            # SQLite у пам'яті (тести): окремий потік не побачить ту саму БД безпечно
+            ReportJobService.process(job_id)
+
+    @staticmethod
+    def process(job_id) -> bool:
+        """
+        Обчислює одне завдання. Захоплення умовним UPDATE (queued -> running) гарантує,
+        що завдання обробить лише один потік чи процес. Повертає False, якщо його вже забрали.
+        """
+        claimed = db.session.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == 'queued')
+            .values(status='running', started_at=datetime.datetime.now())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return False
+
+        job = db.session.get(ReportJob, job_id)
+        try:
+            result = REPORT_JOBS[job.report](ReportService(), **_decode(job.params))
+            job.result = _encode(result)
+            job.status = 'done'
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(ReportJob, job_id)
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = datetime.datetime.now()
+        job.expires_at = job.finished_at + REPORT_JOB_TTL
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def get_by_id(job_id):
+        return db.session.get(ReportJob, job_id)
+
+    @staticmethod
+    def get_result(job) -> dict:
+        """Дані для шаблону звіту: параметри завдання разом із обчисленими панелями."""
+        return {**_decode(job.params), **_decode(job.result)}
+
+    @staticmethod
+    def get_recent(client_id=None, limit=50):
+        query = ReportJob.query
+        if client_id is not None:
+            query = query.filter(ReportJob.client_id == client_id)
+        return query.order_by(ReportJob.created_at.desc()).limit(limit).all()
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Видаляє завершені завдання, строк зберігання яких минув."""
+        deleted = db.session.execute(
+            delete(ReportJob).where(ReportJob.expires_at <= datetime.datetime.now(),
+                                    ReportJob.status.in_(('done', 'failed')))
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+    @staticmethod
+    def resume_pending() -> int:
+        """
+        Після перезапуску: повертає в чергу завдання, що зависли в running довше
+        REPORT_JOB_TIMEOUT, і передає пулу всі завдання в черзі. Повертає їх кількість.
+        """
+        db.session.execute(
+            update(ReportJob)
+            .where(ReportJob.status == 'running',
+                   ReportJob.started_at < datetime.datetime.now() - REPORT_JOB_TIMEOUT)
+            .values(status='queued', started_at=None)
+        )
+        db.session.commit()
+        pending = [job_id for (job_id,) in
+                   db.session.query(ReportJob.id).filter(ReportJob.status == 'queued')
+                   .order_by(ReportJob.created_at)]
+        for job_id in pending:
+            ReportJobService._dispatch(job_id)
+        return len(pending)
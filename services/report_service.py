@@ -1,3 +1,11 @@
+import datetime
+
+import click
+from flask.cli import with_appcontext
+from collections import namedtuple
+
+from flask import current_app
+
 from models import db
 from models.client import Client
 from models.employee import Employee
@@ -6,18 +14,141 @@ from models.equipment_type import EquipmentType
 from models.key import Key
 from models.lift import Lift
 from models.lift_usage import LiftUsage
+from models.lift_usage_daily import BUCKET_MINUTES, ClientDailyRides, LiftBucketRides, LiftDailyRides
+from models.sales_daily import PassDailySales, RentalDailySales
 from models.passes import Pass
 from models.pass_type import PassType
-from sqlalchemy import desc, func, extract  # Для сортування
+from sqlalchemy import and_, case, desc, func, extract, or_, select  # Для сортування
 
 from models.rental import Rental
 from models.rental_equipment import RentalEquipment
 from models.schedule import Schedule
 from models.tariff import Tariff
+from utils.query_helper import DEFAULT_PAGE_SIZE, QueryHelper
+from utils.lift_usage_snapshot import LiftUsageSnapshot
+from utils.report_cache import ReportCache
+
+
+def _half_open(start_date, end_date):
+    """
+    Інклюзивний період дат -> напіввідкритий [start, end + 1 день): порівняння
+    самої колонки з межами використовує індекс на ній, на відміну від extract(...).
+    """
+    return start_date, end_date + datetime.timedelta(days=1)
+
+
+def _month_range(year, month):
+    """Напіввідкритий інтервал [перше число місяця, перше число наступного)."""
+    start = datetime.date(int(year), int(month), 1)
+    return start, (start + datetime.timedelta(days=32)).replace(day=1)
+
+
+def _rental_period(start_date, end_date):
+    """Умови на Rental.rental_date для необов'язкового інклюзивного періоду (будь-яка межа може бути відсутня)."""
+    conditions = []
+    if start_date:
+        conditions.append(Rental.rental_date >= start_date)
+    if end_date:
+        conditions.append(Rental.rental_date < end_date + datetime.timedelta(days=1))
+    return conditions
+
+
+# Рядки колонкового бекенда мають ті самі поля, що й рядки відповідних SQL-запитів
+LiftUsageRow = namedtuple('LiftUsageRow', 'lift_name usage_count')
+ClientLiftCountRow = namedtuple('ClientLiftCountRow', 'client_id full_name email lift_count')
+ClientVisitRow = namedtuple('ClientVisitRow', 'Client visit_count')
+
+# Показники панелі на головній сторінці можуть відставати від даних не більше ніж на стільки секунд
+DASHBOARD_KPI_TTL = 30
+
+# Скільки id передавати в один IN (...) при доборі клієнтів до результатів знімка
+_ID_BATCH_SIZE = 500
+
+
+def comparison_windows(start_date, end_date, previous=True, last_season=True) -> list:
+    """
+    Вікна порівняльного звіту: базовий період, попередній період такої ж довжини
+    і той самий період сезон тому (364 дні — щоб збігалися дні тижня).
+    """
+    windows = [(start_date, end_date)]
+    if previous:
+        length = end_date - start_date + datetime.timedelta(days=1)
+        windows.append((start_date - length, end_date - length))
+    if last_season:
+        season = datetime.timedelta(days=364)
+        windows.append((start_date - season, end_date - season))
+    return windows
+
+
+def _windowed_sums(value_col, date_col, windows, name):
+    """
+    Умовна агрегація: одна сума value_col на кожне вікно дат ({name}_0, {name}_1, ...)
+    і різниця базового вікна з кожним іншим ({name}_delta_1, ...) — усе в одному проході.
+    """
+    sums = []
+    for start_date, end_date in windows:
+        start, stop = _half_open(start_date, end_date)
+        in_window = and_(date_col >= start, date_col < stop)
+        sums.append(func.coalesce(func.sum(case((in_window, value_col), else_=0)), 0))
+    columns = [expr.label(f'{name}_{i}') for i, expr in enumerate(sums)]
+    columns += [(sums[0] - expr).label(f'{name}_delta_{i}') for i, expr in enumerate(sums) if i]
+    return columns
+
+
+def _in_any_window(date_col, windows):
+    """Рядки, що потрапляють хоча б в одне вікно: дні між вікнами не читаються."""
+    return or_(*[and_(date_col >= start, date_col < stop)
+                 for start, stop in (_half_open(start_date, end_date) for start_date, end_date in windows)])
+
+
+def lift_load_heatmap(rows, bucket_minutes) -> dict:
+    """
+    Рядки (lift_id, lift_name, slot, rides) -> теплова карта: підписи слотів від першого
+    до останнього непорожнього, по рядку лічильників на підйомник і пікове значення.
+    """
+    if not rows:
+        return {'slots': [], 'lifts': [], 'peak': 0}
+    first, last = min(row.slot for row in rows), max(row.slot for row in rows)
+    minutes = max(1, int(bucket_minutes) // BUCKET_MINUTES) * BUCKET_MINUTES
+    lifts = {}
+    for row in rows:
+        name, counts = lifts.setdefault(row.lift_id, (row.lift_name, [0] * (last - first + 1)))
+        counts[row.slot - first] += row.rides
+    return {
+        'slots': [f'{slot * minutes // 60:02d}:{slot * minutes % 60:02d}' for slot in range(first, last + 1)],
+        'lifts': [(name, counts, sum(counts)) for name, counts in lifts.values()],
+        'peak': max(max(counts) for _, counts in lifts.values()),
+    }
+
+
+def _columnar_backend() -> bool:
+    """Звіти про підйомники читають колонковий знімок, якщо LIFT_ANALYTICS_BACKEND = 'columnar' і є NumPy."""
+    return current_app.config.get('LIFT_ANALYTICS_BACKEND') == 'columnar' and LiftUsageSnapshot.available()
+
+
+def _approved_clients(client_ids, *entities):
+    """Вибрані колонки підтверджених клієнтів з переліку id (частинами, щоб не впертися в ліміт параметрів)."""
+    client_ids = list(client_ids)
+    rows = []
+    for i in range(0, len(client_ids), _ID_BATCH_SIZE):
+        rows.extend(db.session.query(*entities)
+                    .join(Key, Client.authorization_fkey == Key.id)
+                    .filter(Key.is_approved == True, Client.id.in_(client_ids[i:i + _ID_BATCH_SIZE])))
+    return rows
+
+
+def _comparable(rows):
+    """Рядки звіту -> кортежі простих значень (ORM-об'єкт клієнта замінюється його id)."""
+    return [tuple(value.id if isinstance(value, Client) else value for value in row) for row in rows]
 
 
 class ReportService:
 
+    # Методи з @ReportCache.reads кешують результат до зміни перелічених таблиць.
+    # Звіти, що повертають ORM-об'єкти (Запит 9, працівники на дату в Запиті 10), не кешуються:
+    # такі об'єкти прив'язані до сесії конкретного HTTP-запиту.
+
+    @ReportCache.reads('client', 'pass', 'pass_type', 'keys')
     def get_clients_and_passes(self):
         """Запит 1: Отримати клієнтів та їхні придбані абонементи."""
         query = db.session.query(
@@ -40,6 +171,7 @@ class ReportService:
 
         return query.all()
 
+    @ReportCache.reads('equipment', 'equipment_type', 'rental', 'rental_equipment')
     def get_most_rented_equipment_weekly(self, start_date, end_date):
         """Part of Query 2: Get equipment rented most often in the specified period (week)."""
         if not start_date or not end_date:
@@ -57,6 +189,7 @@ class ReportService:
          .order_by(desc('rental_count'), Equipment.model.asc()) # Order by most rented
         return query.all() # Return all results sorted by count
 
+    @ReportCache.reads('equipment', 'equipment_type', 'rental', 'rental_equipment')
     def get_equipment_count_by_type_daily(self, date_):
         """Part of Query 2: Get count of rented equipment by type for a specific day."""
         if not date_:
@@ -75,37 +208,41 @@ class ReportService:
 
 #Query 3: Get the count of passes sold per day in a period. Get the count of passes sold by type in a period.
 
+    @ReportCache.reads('pass_daily_sales')
     def get_pass_sales_by_day(self, start_date, end_date):
         """Part of Query 3: Get the count of passes sold per day in a period."""
         if not start_date or not end_date:
             return []
 
+        start, stop = _half_open(start_date, end_date)
         query = db.session.query(
-            Pass.purchase_date,
-            func.count(Pass.id).label('sales_count')
+            PassDailySales.day.label('purchase_date'),
+            func.sum(PassDailySales.passes_sold).label('sales_count')
         ).filter(
-            Pass.purchase_date >= start_date,
-            Pass.purchase_date <= end_date
+            PassDailySales.day >= start,
+            PassDailySales.day < stop
         ).group_by(
-            Pass.purchase_date
+            PassDailySales.day
         ).order_by(
-            Pass.purchase_date.asc()
+            PassDailySales.day.asc()
         )
         return query.all()
 
+    @ReportCache.reads('pass_daily_sales', 'pass_type')
     def get_pass_sales_by_type(self, start_date, end_date):
         """Part of Query 3: Get the count of passes sold by type in a period."""
         if not start_date or not end_date:
             return []
 
+        start, stop = _half_open(start_date, end_date)
         query = db.session.query(
             PassType.name.label('pass_type_name'),
-            func.count(Pass.id).label('sales_count')
+            func.sum(PassDailySales.passes_sold).label('sales_count')
         ).join(
-            PassType, Pass.pass_type_id == PassType.id
+            PassType, PassDailySales.pass_type_id == PassType.id
         ).filter(
-            Pass.purchase_date >= start_date,
-            Pass.purchase_date <= end_date
+            PassDailySales.day >= start,
+            PassDailySales.day < stop
         ).group_by(
             PassType.name
         ).order_by(
@@ -114,68 +251,170 @@ class ReportService:
         return query.all()
 #query 4: Get most used lifts in the specified period.
 
+    @ReportCache.reads('lift', 'lift_daily_rides')
     def get_most_used_lifts_by_period(self, start_date, end_date):
         """Part of Query 4: Get most used lifts in the specified period."""
         if not start_date or not end_date:
             return []
+        if _columnar_backend():
+            return self._most_used_lifts_columnar(start_date, end_date)
+        return self._most_used_lifts_sql(start_date, end_date)
+
+    def _most_used_lifts_sql(self, start_date, end_date):
+        # Денні агрегати замість сирих lift_usage: рядків не більше, ніж днів x підйомників
+        query = db.session.query(
+            Lift.name.label('lift_name'),
+            func.sum(LiftDailyRides.rides).label('usage_count')
+        ).join(
+            Lift, LiftDailyRides.lift_id == Lift.id
+        ).filter(
+            LiftDailyRides.usage_date >= start_date,
+            LiftDailyRides.usage_date <= end_date
+        ).group_by(
+            Lift.id, Lift.name
+        ).order_by(
+            desc('usage_count'), Lift.name
+        )
+        return query.all()
+
+    def _most_used_lifts_columnar(self, start_date, end_date):
+        counts = LiftUsageSnapshot.rides_by_lift(start_date, end_date)
+        names = dict(db.session.query(Lift.id, Lift.name).filter(Lift.id.in_(list(counts))))
+        rows = [LiftUsageRow(names[lift_id], count) for lift_id, count in counts.items() if lift_id in names]
+        return sorted(rows, key=lambda row: (-row.usage_count, row.lift_name))
+
+    # --- Порівняльні звіти: кілька вікон дат за один прохід ---
+
+    @ReportCache.reads('lift', 'lift_daily_rides')
+    def get_lift_usage_comparison(self, windows):
+        """
+        Query 4 for several date windows at once: rides per lift in every window
+        (rides_0, rides_1, ...) and the difference between the first window and each other one.
+        """
+        if not windows:
+            return []
 
         query = db.session.query(
             Lift.name.label('lift_name'),
-            func.count(LiftUsage.id).label('usage_count')
+            *_windowed_sums(LiftDailyRides.rides, LiftDailyRides.usage_date, windows, 'rides')
         ).join(
-            Lift, LiftUsage.lift_id == Lift.id
+            Lift, LiftDailyRides.lift_id == Lift.id
         ).filter(
-            LiftUsage.usage_date >= start_date,
-            LiftUsage.usage_date <= end_date
+            _in_any_window(LiftDailyRides.usage_date, windows)
         ).group_by(
             Lift.id, Lift.name
         ).order_by(
-            desc('usage_count')
+            desc('rides_0'), Lift.name
+        )
+        return query.all()
+
+    @ReportCache.reads('pass_daily_sales', 'pass_type')
+    def get_pass_sales_comparison(self, windows):
+        """
+        Query 3 (by type) for several date windows at once: passes sold and revenue per
+        pass type in every window, with differences from the first window.
+        """
+        if not windows:
+            return []
+
+        query = db.session.query(
+            PassType.name.label('pass_type_name'),
+            *_windowed_sums(PassDailySales.passes_sold, PassDailySales.day, windows, 'sold'),
+            *_windowed_sums(PassDailySales.revenue, PassDailySales.day, windows, 'revenue')
+        ).join(
+            PassType, PassDailySales.pass_type_id == PassType.id
+        ).filter(
+            _in_any_window(PassDailySales.day, windows)
+        ).group_by(
+            PassType.id, PassType.name
+        ).order_by(
+            PassType.name.asc()
+        )
+        return query.all()
+
+    # --- Теплова карта навантаження підйомників за часом доби ---
+
+    @ReportCache.reads('lift', 'lift_bucket_rides')
+    def get_lift_load_by_time(self, start_date, end_date, bucket_minutes=60):
+        """
+        Lift load heatmap: rides per lift and time-of-day slot (bucket_minutes wide,
+        a multiple of 15) in the period, read from the 15-minute bucket rollup.
+        """
+        if not start_date or not end_date:
+            return []
+
+        buckets_per_slot = max(1, int(bucket_minutes) // BUCKET_MINUTES)
+        slot = LiftBucketRides.bucket // buckets_per_slot
+        start, stop = _half_open(start_date, end_date)
+        query = db.session.query(
+            Lift.id.label('lift_id'),
+            Lift.name.label('lift_name'),
+            slot.label('slot'),
+            func.sum(LiftBucketRides.rides).label('rides')
+        ).join(
+            Lift, LiftBucketRides.lift_id == Lift.id
+        ).filter(
+            LiftBucketRides.usage_date >= start,
+            LiftBucketRides.usage_date < stop
+        ).group_by(
+            Lift.id, Lift.name, slot
+        ).order_by(
+            Lift.name, Lift.id, slot
         )
         return query.all()
 
 # --- Query 5: Get total rental revenue grouped by year and month. ---
 
+    @ReportCache.reads('rental_daily_sales')
     def get_rental_revenue_by_month(self, start_date, end_date):
         """Part of Query 5: Get total rental revenue grouped by year and month."""
         if not start_date or not end_date:
             return []
 
+        # Згортка денного куба: не більше одного рядка на день і тип оренди
+        start, stop = _half_open(start_date, end_date)
+        year = extract('year', RentalDailySales.day)
+        month = extract('month', RentalDailySales.day)
         query = db.session.query(
-            extract('year', Rental.rental_date).label('year'),
-            extract('month', Rental.rental_date).label('month'),
-            func.sum(Rental.total_price).label('total_revenue')
+            year.label('year'),
+            month.label('month'),
+            func.sum(RentalDailySales.revenue).label('total_revenue')
         ).filter(
-            Rental.rental_date.between(start_date, end_date)
+            RentalDailySales.day >= start,
+            RentalDailySales.day < stop
         ).group_by(
-            extract('year', Rental.rental_date),
-            extract('month', Rental.rental_date)
+            year, month
         ).order_by(
-            extract('year', Rental.rental_date).asc(),
-            extract('month', Rental.rental_date).asc()
+            year.asc(), month.asc()
         )
         return query.all()
 
+    @ReportCache.reads('rental_daily_sales')
     def get_rental_revenue_by_quarter(self, start_date, end_date):
         """Part of Query 5: Get total rental revenue grouped by year and quarter."""
         if not start_date or not end_date:
             return []
 
+        start, stop = _half_open(start_date, end_date)
+        year = extract('year', RentalDailySales.day)
+        month = extract('month', RentalDailySales.day)
+        # Квартал із місяця: extract('quarter') не підтримується SQLite
+        quarter = case((month <= 3, 1), (month <= 6, 2), (month <= 9, 3), else_=4)
         query = db.session.query(
-            extract('year', Rental.rental_date).label('year'),
-            extract('quarter', Rental.rental_date).label('quarter'),
-            func.sum(Rental.total_price).label('total_revenue')
+            year.label('year'),
+            quarter.label('quarter'),
+            func.sum(RentalDailySales.revenue).label('total_revenue')
         ).filter(
-            Rental.rental_date.between(start_date, end_date)
+            RentalDailySales.day >= start,
+            RentalDailySales.day < stop
         ).group_by(
-            extract('year', Rental.rental_date),
-            extract('quarter', Rental.rental_date)
+            year, quarter
         ).order_by(
-            extract('year', Rental.rental_date).asc(),
-            extract('quarter', Rental.rental_date).asc()
+            year.asc(), quarter.asc()
         )
         return query.all()
 
+    @ReportCache.reads('client', 'pass', 'pass_type', 'keys')
     def get_clients_with_exhausted_passes(self):
         """Part of Query 6: Get clients with passes that have 0 or fewer remaining lifts."""
         query = db.session.query(
@@ -194,31 +433,44 @@ class ReportService:
 
         return query.all()
 
+    @ReportCache.reads('client', 'client_daily_rides', 'keys')
     def get_clients_with_over_15_lifts_daily(self, specific_date):
         """Part of Query 6: Get clients who used lifts more than 15 times on a specific day."""
         if not specific_date:
             return []
+        if _columnar_backend():
+            return self._clients_over_15_lifts_columnar(specific_date)
+        return self._clients_over_15_lifts_sql(specific_date)
 
+    def _clients_over_15_lifts_sql(self, specific_date):
         query = db.session.query(
             Client.id.label('client_id'),
             Client.full_name,
             Client.email,
-            func.count(LiftUsage.id).label('lift_count')
-        ).join(LiftUsage, Client.id == LiftUsage.client_id) \
+            ClientDailyRides.rides.label('lift_count')
+        ).join(ClientDailyRides, Client.id == ClientDailyRides.client_id) \
             .join(Key, Client.authorization_fkey == Key.id) \
             .filter(Key.is_approved == True) \
-            .filter(LiftUsage.usage_date == specific_date) \
-            .group_by(Client.id, Client.full_name, Client.email) \
-            .having(func.count(LiftUsage.id) > 15) \
-            .order_by(desc('lift_count'), Client.full_name)
+            .filter(ClientDailyRides.usage_date == specific_date) \
+            .filter(ClientDailyRides.rides > 15) \
+            .order_by(desc('lift_count'), Client.full_name, Client.id)
 
         return query.all()
 
+    def _clients_over_15_lifts_columnar(self, specific_date):
+        counts = {client_id: rides for client_id, rides
+                  in LiftUsageSnapshot.rides_by_client(specific_date, specific_date).items() if rides > 15}
+        rows = [ClientLiftCountRow(client_id, full_name, email, counts[client_id])
+                for client_id, full_name, email in _approved_clients(counts, Client.id, Client.full_name, Client.email)]
+        return sorted(rows, key=lambda row: (-row.lift_count, row.full_name, row.client_id))
+
+    @ReportCache.reads('client', 'pass', 'pass_type', 'keys')
     def get_clients_bought_pass_by_month(self, pass_name, year, month):
         """Part of Query 7: Get clients who bought a specific pass type in a specific month and year."""
         if not year or not month or not pass_name:
             return []
 
+        month_start, next_month_start = _month_range(year, month)
         query = db.session.query(
             Client.id.label('client_id'),
             Client.full_name,
@@ -230,12 +482,12 @@ class ReportService:
             .join(Key, Client.authorization_fkey == Key.id) \
             .filter(Key.is_approved == True) \
             .filter(PassType.name.ilike(pass_name)) \
-            .filter(extract('year', Pass.purchase_date) == year) \
-            .filter(extract('month', Pass.purchase_date) == month) \
+            .filter(Pass.purchase_date >= month_start, Pass.purchase_date < next_month_start) \
             .order_by(Client.full_name, Pass.purchase_date)
 
         return query.all()
 
+    @ReportCache.reads('equipment_type', 'tariff')
     def get_equipment_tariffs_with_weekday_discount(self):
         """
         Part of Query 8: Get tariff information for all equipment types,
@@ -274,12 +526,16 @@ class ReportService:
         """Part of Query 9: Get clients who visited (on distinct days) more than X times."""
         if not visit_count_threshold:
             return []
+        if _columnar_backend():
+            return self._clients_visited_more_than_columnar(visit_count_threshold)
+        return self._clients_visited_more_than_sql(visit_count_threshold)
 
-        # Subquery to count distinct visit days per client
+    def _clients_visited_more_than_sql(self, visit_count_threshold):
+        # Subquery to count visit days per client (one rollup row per client and day)
         visit_counts_sq = db.session.query(
-            LiftUsage.client_id,
-            func.count(func.distinct(LiftUsage.usage_date)).label('visit_count')
-        ).group_by(LiftUsage.client_id).subquery()
+            ClientDailyRides.client_id,
+            func.count(ClientDailyRides.usage_date).label('visit_count')
+        ).group_by(ClientDailyRides.client_id).subquery()
 
         # Main query
         query = db.session.query(
@@ -289,14 +545,44 @@ class ReportService:
             .join(Key, Client.authorization_fkey == Key.id) \
             .filter(Key.is_approved == True) \
             .filter(visit_counts_sq.c.visit_count > visit_count_threshold) \
-            .order_by(desc('visit_count'), Client.full_name)
+            .order_by(desc('visit_count'), Client.full_name, Client.id)
 
         return query.all()
 
+    def _clients_visited_more_than_columnar(self, visit_count_threshold):
+        threshold = int(visit_count_threshold)
+        visits = {client_id: days for client_id, days
+                  in LiftUsageSnapshot.visit_days_by_client().items() if days > threshold}
+        rows = [ClientVisitRow(client, visits[client.id]) for client in _approved_clients(visits, Client)]
+        return sorted(rows, key=lambda row: (-row.visit_count, row.Client.full_name, row.Client.id))
+
+    @staticmethod
+    def compare_lift_backends(start_date, end_date, specific_date, visit_count_threshold) -> dict:
+        """
+        Виконує звіти про підйомники через SQL і через колонковий знімок.
+        Повертає {звіт: (рядки SQL, рядки знімка)} лише для звітів, де результати різняться.
+        """
+        service = ReportService()
+        checks = {
+            'most_used_lifts': (service._most_used_lifts_sql, service._most_used_lifts_columnar,
+                                (start_date, end_date)),
+            'clients_over_15_lifts': (service._clients_over_15_lifts_sql, service._clients_over_15_lifts_columnar,
+                                      (specific_date,)),
+            'clients_visited_more_than': (service._clients_visited_more_than_sql,
+                                          service._clients_visited_more_than_columnar, (visit_count_threshold,)),
+        }
+        mismatches = {}
+        for name, (sql, columnar, args) in checks.items():
+            expected, actual = _comparable(sql(*args)), _comparable(columnar(*args))
+            if expected != actual:
+                mismatches[name] = (expected, actual)
+        return mismatches
+
     # --- Query 10: Employee Work Statistics ---
 
-    def get_employee_rental_details(self):
-        """Part of Query 10: Get all employees and the equipment they have issued."""
+    @ReportCache.reads('employee', 'rental', 'rental_equipment', 'equipment', 'equipment_type')
+    def get_employee_rental_details(self, start_date=None, end_date=None):
+        """Part of Query 10: Get all employees and the equipment they have issued (optionally within a period)."""
 
         query = db.session.query(
             Employee.full_name,
@@ -309,10 +595,64 @@ class ReportService:
             .join(RentalEquipment, Rental.id == RentalEquipment.rental_id) \
             .join(Equipment, RentalEquipment.equipment_id == Equipment.id) \
             .join(EquipmentType, Equipment.type_id == EquipmentType.id) \
+            .filter(*_rental_period(start_date, end_date)) \
             .order_by(Employee.full_name, Rental.rental_date)
 
         return query.all()
 
+    @ReportCache.reads('employee', 'rental', 'rental_equipment')
+    def get_employee_rental_summary(self, start_date=None, end_date=None):
+        """
+        Part of Query 10: One row per employee — rentals handled, items issued and revenue
+        for the period (all time if no bounds are given), aggregated in the database.
+        """
+        # Спершу по одному рядку на прокат: інакше сума total_price множилася б на кількість позицій
+        per_rental = db.session.query(
+            Rental.id.label('rental_id'),
+            Rental.employee_id,
+            Rental.total_price,
+            func.count(RentalEquipment.equipment_id).label('item_count')
+        ).outerjoin(RentalEquipment, Rental.id == RentalEquipment.rental_id) \
+            .filter(*_rental_period(start_date, end_date)) \
+            .group_by(Rental.id, Rental.employee_id, Rental.total_price) \
+            .subquery()
+
+        query = db.session.query(
+            Employee.id.label('employee_id'),
+            Employee.full_name,
+            Employee.position,
+            func.count(per_rental.c.rental_id).label('rentals_handled'),
+            func.coalesce(func.sum(per_rental.c.item_count), 0).label('items_issued'),
+            func.coalesce(func.sum(per_rental.c.total_price), 0).label('revenue')
+        ).join(per_rental, Employee.id == per_rental.c.employee_id) \
+            .group_by(Employee.id, Employee.full_name, Employee.position) \
+            .order_by(Employee.full_name)
+
+        return query.all()
+
+    def get_employee_rentals_page(self, employee_id, start_date=None, end_date=None,
+                                  cursor=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Part of Query 10 (drill-down): Items issued by one employee, a page at a time.
+        Keyset pagination on (rental_date, rental_id, equipment_id) follows ix_rental_employee_date.
+        """
+        query = db.session.query(
+            Rental.rental_date,
+            RentalEquipment.rental_id,
+            RentalEquipment.equipment_id,
+            Rental.rental_type,
+            Rental.total_price,
+            Equipment.model,
+            EquipmentType.name.label('equipment_type')
+        ).select_from(RentalEquipment) \
+            .join(Rental, RentalEquipment.rental_id == Rental.id) \
+            .join(Equipment, RentalEquipment.equipment_id == Equipment.id) \
+            .join(EquipmentType, Equipment.type_id == EquipmentType.id) \
+            .filter(Rental.employee_id == employee_id, *_rental_period(start_date, end_date))
+
+        models_map = {'RentalEquipment': RentalEquipment, 'Rental': Rental}
+        return QueryHelper.paginate(query, models_map, 'rental_date', 'asc', cursor, page_size)
+
     def get_employees_working_on_date(self, specific_date):
         """Part of Query 10: Get employees who were scheduled to work on a specific date."""
         if not specific_date:
@@ -326,4 +666,52 @@ class ReportService:
             .filter(Schedule.work_date == specific_date) \
             .order_by(Employee.full_name)
 
-        return query.all()
\ No newline at end of file
+        return query.all()
+
+    @ReportCache.ttl(DASHBOARD_KPI_TTL)
+    def get_dashboard_kpis(self, today=None):
+        """
+        Головні показники курорту одним SELECT зі скалярними підзапитами: підйоми та продажі
+        абонементів за сьогодні, відкриті оренди, виручка з початку місяця та клієнти з
+        вичерпаними абонементами. Поїздки й продажі беруться з денних агрегатів, а не з сирих таблиць.
+        """
+        today = today or datetime.date.today()
+        month_start = today.replace(day=1)
+
+        def total(column, *conditions):
+            return select(func.coalesce(func.sum(column), 0)).where(*conditions).scalar_subquery()
+
+        exhausted = select(func.count(func.distinct(Pass.client_id))) \
+            .join(Client, Client.id == Pass.client_id) \
+            .join(Key, Client.authorization_fkey == Key.id) \
+            .where(Key.is_approved == True, Pass.remaining_lifts <= 0) \
+            .scalar_subquery()
+
+        query = select(
+            total(LiftDailyRides.rides, LiftDailyRides.usage_date == today).label('rides_today'),
+            total(PassDailySales.passes_sold, PassDailySales.day == today).label('passes_sold_today'),
+            total(PassDailySales.revenue, PassDailySales.day == today).label('pass_revenue_today'),
+            select(func.count(Rental.id)).where(Rental.end_time.is_(None)).scalar_subquery().label('open_rentals'),
+            total(PassDailySales.revenue, PassDailySales.day >= month_start,
+                  PassDailySales.day <= today).label('pass_revenue_mtd'),
+            total(RentalDailySales.revenue, RentalDailySales.day >= month_start,
+                  RentalDailySales.day <= today).label('rental_revenue_mtd'),
+            exhausted.label('clients_with_exhausted_passes'),
+        )
+        return db.session.execute(query).one()
+
+
+@click.command('compare-lift-backends')
+@click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']), required=True)
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), required=True)
+@click.option('--day', type=click.DateTime(formats=['%Y-%m-%d']), required=True)
+@click.option('--visit-threshold', type=int, default=3, show_default=True)
+@with_appcontext
+def compare_lift_backends_command(start_date, end_date, day, visit_threshold):
+    """Run the lift reports on SQL and on the columnar snapshot and report any difference."""
+    mismatches = ReportService.compare_lift_backends(start_date.date(), end_date.date(), day.date(), visit_threshold)
+    for name, (expected, actual) in mismatches.items():
+        click.echo(f'{name}: SQL returned {len(expected)} rows, snapshot {len(actual)} rows — results differ')
+    if mismatches:
+        raise SystemExit(1)
+    click.echo('All lift reports match.')
@@ -0,0 +1,99 @@
+import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, insert, select, update
+
+from models.pass_type import PassType
+from models.passes import Pass, db
+from models.rental import Rental
+from models.sales_daily import PassDailySales, RentalDailySales
+from utils.rollup import apply_deltas
+
+
+def _as_date(value):
+    """Дата з форми приходить рядком 'YYYY-MM-DD'."""
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+class SalesCubeService:
+    """
+    Денний куб продажів: (day, pass_type_id) -> passes_sold, revenue та
+    (day, rental_type) -> rentals, revenue. Оновлюється PassService і RentalService
+    у тій самій транзакції, тож місячні та квартальні звіти згортають кілька сотень
+    рядків куба замість сканування всіх продажів.
+    Виручка абонемента — поточна ціна його типу (як і при rebuild): зміна ціни
+    перераховує рядки куба цього типу (reprice_pass_type у PassTypeService.update).
+    """
+
+    @staticmethod
+    def record_pass(purchase_date, pass_type_id, sign=1) -> None:
+        """Враховує (sign=1) або прибирає (sign=-1) продаж одного абонемента."""
+        price = select(PassType.price).where(PassType.id == pass_type_id).scalar_subquery()
+        apply_deltas(PassDailySales,
+                     {'day': _as_date(purchase_date), 'pass_type_id': pass_type_id},
+                     {'passes_sold': sign, 'revenue': sign * price},
+                     count_column='passes_sold')
+
+    @staticmethod
+    def reprice_pass_type(pass_type_id, price) -> None:
+        """Перераховує виручку куба за типом абонемента за новою ціною (у поточній транзакції)."""
+        db.session.execute(
+            update(PassDailySales)
+            .where(PassDailySales.pass_type_id == pass_type_id)
+            .values(revenue=PassDailySales.passes_sold * price),
+            execution_options={'synchronize_session': False},
+        )
+
+    @staticmethod
+    def record_rental(rental_date, rental_type, total_price, sign=1) -> None:
+        """Враховує (sign=1) або прибирає (sign=-1) одну оренду."""
+        apply_deltas(RentalDailySales,
+                     {'day': _as_date(rental_date), 'rental_type': rental_type},
+                     {'rentals': sign, 'revenue': sign * int(total_price)},
+                     count_column='rentals')
+
+    @staticmethod
+    def rebuild() -> dict:
+        """Перераховує куб з pass і rental. Повертає кількість рядків у кожній таблиці."""
+        db.session.execute(delete(PassDailySales))
+        db.session.execute(delete(RentalDailySales))
+        db.session.execute(insert(PassDailySales).from_select(
+            ['day', 'pass_type_id', 'passes_sold', 'revenue'],
+            select(Pass.purchase_date, Pass.pass_type_id, func.count(Pass.id), func.sum(PassType.price))
+            .join(PassType, Pass.pass_type_id == PassType.id)
+            .group_by(Pass.purchase_date, Pass.pass_type_id)))
+        db.session.execute(insert(RentalDailySales).from_select(
+            ['day', 'rental_type', 'rentals', 'revenue'],
+            select(Rental.rental_date, Rental.rental_type, func.count(Rental.id), func.sum(Rental.total_price))
+            .group_by(Rental.rental_date, Rental.rental_type)))
+        db.session.commit()
+        return {
+            PassDailySales.__tablename__: db.session.scalar(select(func.count()).select_from(PassDailySales)),
+            RentalDailySales.__tablename__: db.session.scalar(select(func.count()).select_from(RentalDailySales)),
+        }
+
+    @staticmethod
+    def ensure_built() -> bool:
+        """
+        Заповнює куб, якщо він порожній, а продажі є (щойно створені таблиці на наявній БД).
+        Повертає True, якщо знадобилося перерахування.
+        """
+        has_cube = (db.session.scalar(select(PassDailySales.day).limit(1)) is not None
+                    or db.session.scalar(select(RentalDailySales.day).limit(1)) is not None)
+        has_sales = (db.session.scalar(select(Pass.id).limit(1)) is not None
+                     or db.session.scalar(select(Rental.id).limit(1)) is not None)
+        if has_cube or not has_sales:
+            return False
+        SalesCubeService.rebuild()
+        return True
+
+
+@click.command('rebuild-sales-cube')
+@with_appcontext
+def rebuild_sales_cube_command():
+    """Recompute the daily pass/rental sales cube from pass and rental."""
+    for table_name, rows in SalesCubeService.rebuild().items():
+        click.echo(f'{table_name}: {rows} rows')
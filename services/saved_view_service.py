@@ -1,11 +1,114 @@
+import datetime
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from flask import current_app, session
+from sqlalchemy import delete, update
+from werkzeug.exceptions import HTTPException
+
 from models.saved_view import SavedView, db
+from models.saved_view_snapshot import SavedViewSnapshot
+
+# 'manual' — знімок оновлюється лише кнопкою "Refresh now"; решта — ще й планувальником
+SNAPSHOT_SCHEDULES = ('manual', 'hourly', 'nightly')
+
+# Нічне оновлення — о цій годині (за локальним часом сервера)
+NIGHTLY_REFRESH_HOUR = 3
+
+# Як часто планувальник перевіряє, чи настав час оновити якийсь знімок
+SNAPSHOT_POLL_SECONDS = 60
+
+# Знімок — для швидкого відкриття, а не для вивантаження: більше рядків віддає експорт списку
+SNAPSHOT_MAX_ROWS = 5000
+
+
+def _next_refresh(schedule, now):
+    if schedule == 'hourly':
+        return now + datetime.timedelta(hours=1)
+    if schedule == 'nightly':
+        next_run = now.replace(hour=NIGHTLY_REFRESH_HOUR, minute=0, second=0, microsecond=0)
+        return next_run if next_run > now else next_run + datetime.timedelta(days=1)
+    return None
+
+
+def _view_params(url) -> dict:
+    """Параметри запиту збереженого перегляду без пагінації: {назва: [значення]}."""
+    params = parse_qs(urlsplit(url).query, keep_blank_values=True)
+    for name in ('cursor', 'page_size', 'export', 'explain'):
+        params.pop(name, None)
+    return params
+
+
+def supports_snapshot(url) -> bool:
+    """Чи веде збережена адреса на список, що вміє віддавати рядки (@exportable); звіти — HTML-сторінки."""
+    app = current_app._get_current_object()
+    try:
+        endpoint, _ = app.url_map.bind('localhost').match(urlsplit(url).path, method='GET')
+    except HTTPException:
+        return False
+    return getattr(app.view_functions.get(endpoint), 'supports_export', False)
+
+
+def _fetch_rows(view):
+    """
+    Виконує список збереженого перегляду через його власний ендпоінт у режимі експорту
+    NDJSON — з тими самими фільтрами, сортуванням і правами власника перегляду.
+    Повертає (колонки, рядки, чи обрізано результат).
+    """
+    app = current_app._get_current_object()
+    query_string = {**_view_params(view.url), 'export': ['ndjson']}
+
+    with app.test_request_context(urlsplit(view.url).path, query_string=query_string):
+        session['client_id'] = view.client_id
+        session['access_right'] = view.client.key.access_right.value
+        response = app.full_dispatch_request()
+        try:
+            if response.mimetype != 'application/x-ndjson':
+                raise ValueError(f'The saved view did not return rows (HTTP {response.status_code}).')
+
+            columns, rows, truncated, pending = [], [], False, ''
+            for chunk in response.iter_encoded():
+                pending += chunk.decode('utf-8')
+                *lines, pending = pending.split('\n')
+                for line in lines:
+                    if len(rows) >= SNAPSHOT_MAX_ROWS:
+                        truncated = True
+                        break
+                    record = json.loads(line)
+                    columns = columns or list(record)
+                    rows.append([record.get(name) for name in columns])
+                if truncated:
+                    break
+            return columns, rows, truncated
+        finally:
+            response.close()
+
+
+def _scheduler_loop(app, interval):
+    while True:
+        time.sleep(interval)
+        with app.app_context():
+            try:
+                SavedViewService.refresh_due()
+            except Exception:
+                app.logger.exception('Scheduled refresh of saved views failed')
+
 
 class SavedViewService:
 
+    _scheduler = None
+    _scheduler_lock = threading.Lock()
+
     @staticmethod
     def get_by_client_id(client_id):
         return SavedView.query.filter_by(client_id=client_id).all()
 
+    @staticmethod
+    def get_for_client(view_id, client_id):
+        return SavedView.query.filter_by(id=view_id, client_id=client_id).first()
+
     @staticmethod
     def add(name, url, client_id):
         new_view = SavedView(name=name, url=url, client_id=client_id)
@@ -21,4 +124,117 @@ class SavedViewService:
             db.session.delete(view_to_delete)
             db.session.commit()
             return True
-        return False
\ No newline at end of file
+        return False
+
+    # --- Матеріалізовані знімки ---
+
+    @staticmethod
+    def set_schedule(view, schedule):
+        """
+        Вмикає знімок перегляду з розкладом зі SNAPSHOT_SCHEDULES або вимикає його (schedule=None).
+        Щойно ввімкнений знімок обчислюється одразу. Повертає знімок або None.
+        """
+        if schedule is None:
+            if view.snapshot:
+                db.session.delete(view.snapshot)
+                db.session.commit()
+            return None
+        if schedule not in SNAPSHOT_SCHEDULES:
+            raise ValueError(f"Unknown refresh schedule '{schedule}'.")
+        if not supports_snapshot(view.url):
+            raise ValueError('Only saved list views can keep a snapshot.')
+
+        snapshot = view.snapshot
+        if snapshot is None:
+            snapshot = SavedViewSnapshot(view.id, schedule)
+            db.session.add(snapshot)
+        snapshot.schedule = schedule
+        snapshot.next_refresh_at = _next_refresh(schedule, datetime.datetime.now())
+        db.session.commit()
+        if snapshot.computed_at is None:
+            SavedViewService.refresh(view)
+        return snapshot
+
+    @staticmethod
+    def refresh(view):
+        """Перераховує знімок перегляду зараз. Помилка запиту зберігається в знімку, попередні рядки лишаються."""
+        snapshot = view.snapshot
+        if snapshot is None:
+            snapshot = SavedViewSnapshot(view.id, 'manual')
+            db.session.add(snapshot)
+            db.session.commit()
+
+        started = time.perf_counter()
+        try:
+            columns, rows, truncated = _fetch_rows(view)
+        except Exception as e:
+            db.session.rollback()
+            snapshot = db.session.get(SavedViewSnapshot, view.id)
+            snapshot.error = str(e)
+        else:
+            snapshot = db.session.get(SavedViewSnapshot, view.id)
+            snapshot.columns = json.dumps(columns, ensure_ascii=False)
+            snapshot.rows = json.dumps(rows, ensure_ascii=False)
+            snapshot.row_count = len(rows)
+            snapshot.truncated = truncated
+            snapshot.params = json.dumps(_view_params(view.url), ensure_ascii=False, sort_keys=True)
+            snapshot.computed_at = datetime.datetime.now()
+            snapshot.duration_ms = round((time.perf_counter() - started) * 1000)
+            snapshot.error = None
+        db.session.commit()
+        return snapshot
+
+    @staticmethod
+    def get_snapshot_data(snapshot) -> dict:
+        """Дані знімка для шаблону: колонки, рядки та параметри перегляду."""
+        return {
+            'columns': json.loads(snapshot.columns or '[]'),
+            'rows': json.loads(snapshot.rows or '[]'),
+            'params': json.loads(snapshot.params or '{}'),
+        }
+
+    @staticmethod
+    def refresh_due(now=None) -> int:
+        """
+        Оновлює знімки, час яких настав. Перед оновленням знімок захоплюється умовним
+        UPDATE next_refresh_at, тож кілька процесів застосунку не рахують його двічі.
+        Повертає кількість оновлених знімків.
+        """
+        now = now or datetime.datetime.now()
+        due = db.session.query(SavedViewSnapshot.view_id, SavedViewSnapshot.schedule,
+                               SavedViewSnapshot.next_refresh_at).filter(
+            SavedViewSnapshot.next_refresh_at <= now).order_by(SavedViewSnapshot.next_refresh_at).all()
+
+        refreshed = 0
+        for view_id, schedule, planned_at in due:
+            claimed = db.session.execute(
+                update(SavedViewSnapshot)
+                .where(SavedViewSnapshot.view_id == view_id, SavedViewSnapshot.next_refresh_at == planned_at)
+                .values(next_refresh_at=_next_refresh(schedule, now))
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                continue
+            view = db.session.get(SavedView, view_id)
+            if view is None:
+                # Перегляд видалено в обхід ORM (масовий DELETE): знімок-сирота прибирається
+                db.session.execute(delete(SavedViewSnapshot).where(SavedViewSnapshot.view_id == view_id))
+                db.session.commit()
+                continue
+            SavedViewService.refresh(view)
+            refreshed += 1
+        return refreshed
+
+    @staticmethod
+    def start_scheduler(app, interval=SNAPSHOT_POLL_SECONDS) -> bool:
+        """
+        Запускає локальний планувальник знімків — фоновий потік цього процесу.
+        Повертає False, якщо він уже працює.
+        """
+        with SavedViewService._scheduler_lock:
+            if SavedViewService._scheduler is not None and SavedViewService._scheduler.is_alive():
+                return False
+            SavedViewService._scheduler = threading.Thread(
+                target=_scheduler_loop, args=(app, interval), name='saved-view-scheduler', daemon=True)
+            SavedViewService._scheduler.start()
+            return True
@@ -0,0 +1,328 @@
+import atexit
+import collections
+import datetime
+import json
+import os
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+from models import db
+from models.lift import Lift
+from models.scan_journal import ScanJournalCheckpoint
+from services.gate_scan_service import GateScan, GateScanService, ScanRejected, parse_timestamp
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from utils.pass_validity_cache import PassValidityCache
+from utils.report_executor import supports_concurrent_sessions
+
+# Типові налаштування буферизованого режиму (перевизначаються конфігурацією, див. config.py)
+SCAN_BUFFER_FLUSH_MS = 200
+SCAN_BUFFER_MAX_ROWS = 500
+
+# Скільки останніх відхилених під час запису проходів показувати в метриках
+RECENT_REJECTIONS = 20
+
+
+def _journal_record(scan) -> str:
+    return json.dumps({
+        'seq': scan['seq'],
+        'pass_id': scan['pass_id'],
+        'lift_id': scan['lift_id'],
+        'scanned_at': scan['scanned_at'].isoformat(),
+        'ended_at': scan['ended_at'].isoformat(),
+    })
+
+
+def _read_journal(path) -> list:
+    """Записи журналу; недописаний останній рядок (збій посеред запису) пропускається."""
+    if not os.path.exists(path):
+        return []
+    scans = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            scans.append({
+                'seq': record['seq'],
+                'pass_id': record['pass_id'],
+                'lift_id': record['lift_id'],
+                'scanned_at': datetime.datetime.fromisoformat(record['scanned_at']),
+                'ended_at': datetime.datetime.fromisoformat(record['ended_at']),
+                'queued_at': time.monotonic(),
+            })
+    return scans
+
+
+def _flush_loop(app):
+    while not ScanBufferService._stopping:
+        ScanBufferService._wake.wait(ScanBufferService._flush_interval)
+        ScanBufferService._wake.clear()
+        with app.app_context():
+            try:
+                # Після піку черга може перевищувати пачку в рази — записуємо, доки вона не спорожніє
+                while ScanBufferService.flush():
+                    pass
+            except Exception:
+                app.logger.exception('Flushing the gate scan buffer failed')
+
+
+def _flush_on_exit(app):
+    with app.app_context():
+        ScanBufferService.stop()
+
+
+class ScanBufferService:
+    """
+    Буферизований (write-behind) режим прийому сканувань: прохід перевіряється за кешем
+    придатності абонементів (PassValidityCache) і підтверджується одразу, а запис у lift_usage /
+    pass_lift_usage відбувається пачками у фоновому потоці — кожні SCAN_BUFFER_FLUSH_MS мс
+    або щойно в черзі SCAN_BUFFER_MAX_ROWS проходів.
+
+    Кожен підтверджений прохід спершу дописується в локальний журнал (NDJSON, fsync).
+    Номер останнього записаного проходу зберігається в scan_journal_checkpoint у тій самій
+    транзакції, що й пачка, тож після збою start() повторює з журналу лише незаписані проходи.
+    """
+
+    _lock = threading.Lock()
+    _flush_lock = threading.Lock()
+    _wake = threading.Event()
+    _queue = collections.deque()
+    _pending_by_pass = collections.Counter()
+    _lift_ids = frozenset()
+    _journal = None
+    _journal_path = None
+    _journal_name = None
+    _fsync = True
+    _seq = 0
+    _flush_interval = SCAN_BUFFER_FLUSH_MS / 1000
+    _max_rows = SCAN_BUFFER_MAX_ROWS
+    _thread = None
+    _stopping = False
+    _stats = {}
+
+    @staticmethod
+    def enabled() -> bool:
+        return ScanBufferService._journal is not None
+
+    @staticmethod
+    def start(app, journal_path=None) -> int:
+        """
+        Відкриває журнал, повторює незаписані проходи і запускає фоновий потік запису
+        (для SQLite у пам'яті — без потоку, пачки записує flush()). Повертає кількість повторених проходів.
+        """
+        config = app.config
+        path = os.path.abspath(journal_path or config.get('SCAN_JOURNAL_PATH', 'scan_journal.ndjson'))
+        ScanBufferService._journal_path = path
+        ScanBufferService._journal_name = path[-255:]
+        ScanBufferService._fsync = config.get('SCAN_JOURNAL_FSYNC', True)
+        ScanBufferService._flush_interval = config.get('SCAN_BUFFER_FLUSH_MS', SCAN_BUFFER_FLUSH_MS) / 1000
+        ScanBufferService._max_rows = config.get('SCAN_BUFFER_MAX_ROWS', SCAN_BUFFER_MAX_ROWS)
+        ScanBufferService._stopping = False
+        ScanBufferService._stats = {
+            'enqueued': 0, 'flushed': 0, 'rejected': 0, 'flushes': 0, 'failed_flushes': 0,
+            'replayed': 0, 'last_flush_ms': None, 'max_flush_ms': 0.0, 'total_flush_ms': 0.0,
+            'last_flush_at': None, 'last_error': None,
+            'recent_rejections': collections.deque(maxlen=RECENT_REJECTIONS),
+        }
+
+        ScanBufferService._load_lift_ids()
+        checkpoint = db.session.get(ScanJournalCheckpoint, ScanBufferService._journal_name)
+        flushed_seq = checkpoint.last_seq if checkpoint else 0
+        journal = _read_journal(path)
+        pending = [scan for scan in journal if scan['seq'] > flushed_seq]
+
+        with ScanBufferService._lock:
+            ScanBufferService._seq = max([flushed_seq] + [scan['seq'] for scan in journal])
+            ScanBufferService._queue.clear()
+            ScanBufferService._queue.extend(pending)
+            ScanBufferService._pending_by_pass = collections.Counter(scan['pass_id'] for scan in pending)
+            ScanBufferService._stats['replayed'] = len(pending)
+            # Журнал стискається до незаписаних проходів: тимчасовий файл + атомарна заміна
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.writelines(_journal_record(scan) + '\n' for scan in pending)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+            ScanBufferService._journal = open(path, 'a', encoding='utf-8')
+
+        if pending:
+            app.logger.info('Replaying %d gate scans from %s', len(pending), path)
+        if supports_concurrent_sessions(db.engine):
+            ScanBufferService._thread = threading.Thread(target=_flush_loop, args=(app,),
+                                                         name='scan-buffer-flush', daemon=True)
+            ScanBufferService._thread.start()
+            atexit.register(_flush_on_exit, app)
+        if pending:
+            ScanBufferService._wake.set()
+        return len(pending)
+
+    @staticmethod
+    def stop(flush=True) -> None:
+        """Зупиняє фоновий потік і закриває журнал; з flush=True спершу записує всю чергу."""
+        ScanBufferService._stopping = True
+        ScanBufferService._wake.set()
+        thread = ScanBufferService._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        ScanBufferService._thread = None
+        if flush and ScanBufferService.enabled():
+            while ScanBufferService.flush():
+                pass
+        with ScanBufferService._lock:
+            if ScanBufferService._journal is not None:
+                ScanBufferService._journal.close()
+                ScanBufferService._journal = None
+            ScanBufferService._queue.clear()
+            ScanBufferService._pending_by_pass.clear()
+
+    @staticmethod
+    def _load_lift_ids() -> None:
+        ScanBufferService._lift_ids = frozenset(db.session.scalars(select(Lift.id)))
+
+    @staticmethod
+    def enqueue(pass_id, lift_id, scanned_at, ended_at=None) -> GateScan:
+        """
+        Перевіряє прохід і ставить його в чергу. Повертає підтвердження з оцінкою залишку
+        підйомів (lift_usage_id ще невідомий). Кидає ScanRejected / ValueError, як GateScanService.record_scan.
+        """
+        if not ScanBufferService.enabled():
+            raise RuntimeError('The gate scan buffer is not started.')
+        pass_id, lift_id = int(pass_id), int(lift_id)
+        scanned_at = parse_timestamp(scanned_at)
+        ended_at = parse_timestamp(ended_at) if ended_at else scanned_at
+
+        # Підйомники перевіряються за множиною id з start(); БД читається лише для невідомого id (новий підйомник)
+        if lift_id not in ScanBufferService._lift_ids:
+            ScanBufferService._load_lift_ids()
+            if lift_id not in ScanBufferService._lift_ids:
+                raise ValueError(f"Lift with ID {lift_id} is not found.")
+
+        while True:
+            # Промах кешу читає БД — поза _lock, щоб не затримувати турнікети з іншими абонементами.
+            # Якщо тим часом кеш змінився (запис пачки, зміна абонемента), залишок і черга могли
+            # розійтися з прочитаним записом — перевірка повторюється
+            generation = PassValidityCache.generation()
+            entry = GateScanService.validate(pass_id, scanned_at.date())
+            with ScanBufferService._lock:
+                if PassValidityCache.generation() != generation:
+                    continue
+                # Проходи в черзі ще не списані в БД — враховуємо їх, щоб не підтвердити зайвий
+                remaining = entry.remaining_lifts - ScanBufferService._pending_by_pass[pass_id]
+                if remaining <= 0:
+                    raise ScanRejected(f"Pass {pass_id} has no remaining lifts.")
+                ScanBufferService._append(pass_id, lift_id, scanned_at, ended_at)
+                depth = len(ScanBufferService._queue)
+                break
+
+        if depth >= ScanBufferService._max_rows:
+            ScanBufferService._wake.set()
+        return GateScan(None, pass_id, entry.client_id, remaining - 1)
+
+    @staticmethod
+    def _append(pass_id, lift_id, scanned_at, ended_at) -> None:
+        """Дописує прохід у журнал і чергу; викликається під _lock."""
+        ScanBufferService._seq += 1
+        scan = {'seq': ScanBufferService._seq, 'pass_id': pass_id, 'lift_id': lift_id,
+                'scanned_at': scanned_at, 'ended_at': ended_at, 'queued_at': time.monotonic()}
+        ScanBufferService._journal.write(_journal_record(scan) + '\n')
+        ScanBufferService._journal.flush()
+        if ScanBufferService._fsync:
+            os.fsync(ScanBufferService._journal.fileno())
+        ScanBufferService._queue.append(scan)
+        ScanBufferService._pending_by_pass[pass_id] += 1
+        ScanBufferService._stats['enqueued'] += 1
+
+    @staticmethod
+    def flush(max_rows=None) -> int:
+        """
+        Записує до max_rows (типово SCAN_BUFFER_MAX_ROWS) найстаріших проходів черги однією транзакцією.
+        Прохід, який уже не можна зарахувати (абонемент вичерпано в іншому процесі), пропускається
+        й потрапляє в метрики. Повертає кількість оброблених проходів (0 — черга порожня або запис не вдався).
+        """
+        with ScanBufferService._flush_lock:
+            with ScanBufferService._lock:
+                count = min(len(ScanBufferService._queue), max_rows or ScanBufferService._max_rows)
+                batch = [ScanBufferService._queue[i] for i in range(count)]
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            rides, remaining, rejected = [], {}, []
+            try:
+                for scan in batch:
+                    try:
+                        applied = GateScanService.apply_scan(scan['pass_id'], scan['lift_id'],
+                                                             scan['scanned_at'], scan['ended_at'])
+                    except ValueError as e:
+                        rejected.append((scan, str(e)))
+                        continue
+                    rides.append((scan['scanned_at'].date(), scan['lift_id'], applied.client_id,
+                                  scan['scanned_at'].time()))
+                    remaining[applied.pass_id] = applied.remaining_lifts
+                LiftUsageRollupService.apply_many(rides)
+
+                checkpoint = db.session.get(ScanJournalCheckpoint, ScanBufferService._journal_name)
+                if checkpoint is None:
+                    checkpoint = ScanJournalCheckpoint(ScanBufferService._journal_name)
+                    db.session.add(checkpoint)
+                checkpoint.last_seq = batch[-1]['seq']
+                checkpoint.updated_at = datetime.datetime.now()
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                with ScanBufferService._lock:
+                    ScanBufferService._stats['failed_flushes'] += 1
+                    ScanBufferService._stats['last_error'] = str(e)
+                raise
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with ScanBufferService._lock:
+                # Залишок у кеші і черга змінюються разом: enqueue бачить або обидва до пачки, або обидва після
+                for pass_id, remaining_lifts in remaining.items():
+                    PassValidityCache.set_remaining_lifts(pass_id, remaining_lifts)
+                PassValidityCache.invalidate(*{scan['pass_id'] for scan, _ in rejected})
+                for scan in batch:
+                    ScanBufferService._queue.popleft()
+                    ScanBufferService._pending_by_pass[scan['pass_id']] -= 1
+                ScanBufferService._pending_by_pass += collections.Counter()  # прибирає нулі
+                stats = ScanBufferService._stats
+                stats['flushes'] += 1
+                stats['flushed'] += len(rides)
+                stats['rejected'] += len(rejected)
+                stats['last_flush_ms'] = round(elapsed_ms, 3)
+                stats['max_flush_ms'] = max(stats['max_flush_ms'], round(elapsed_ms, 3))
+                stats['total_flush_ms'] += elapsed_ms
+                stats['last_flush_at'] = datetime.datetime.now()
+                stats['last_error'] = None
+                for scan, reason in rejected:
+                    stats['recent_rejections'].append({'seq': scan['seq'], 'pass_id': scan['pass_id'],
+                                                       'scanned_at': scan['scanned_at'], 'reason': reason})
+                if not ScanBufferService._queue:
+                    # Усе записано й зафіксовано в контрольній точці — журнал можна обнулити
+                    ScanBufferService._journal.truncate(0)
+
+            for scan, reason in rejected:
+                current_app.logger.warning('Buffered gate scan %s was not recorded: %s', scan['seq'], reason)
+            return len(batch)
+
+    @staticmethod
+    def stats() -> dict:
+        """Метрики буфера: глибина черги, вік найстарішого проходу, затримка запису та повтор журналу."""
+        with ScanBufferService._lock:
+            stats = dict(ScanBufferService._stats)
+            stats['recent_rejections'] = list(stats.get('recent_rejections', ()))
+            depth = len(ScanBufferService._queue)
+            oldest = ScanBufferService._queue[0]['queued_at'] if depth else None
+        flushes = stats.get('flushes', 0)
+        stats.update(
+            enabled=ScanBufferService.enabled(),
+            journal=ScanBufferService._journal_path,
+            queue_depth=depth,
+            oldest_pending_ms=round((time.monotonic() - oldest) * 1000, 3) if oldest is not None else None,
+            avg_flush_ms=round(stats.pop('total_flush_ms', 0.0) / flushes, 3) if flushes else None,
+        )
+        return stats
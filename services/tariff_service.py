@@ -9,7 +9,8 @@ class TariffService:
 
     @staticmethod
     def get_all(sort_by=None, sort_order='asc', filter_by=None, filter_value=None,
-                filter_cols=None, filter_ops=None, filter_vals=None):
+                filter_cols=None, filter_ops=None, filter_vals=None,
+                cursor=None, page_size=None, yield_per=None, columns=None):
         return QueryHelper.get_all(
             Tariff,
             sort_by,
@@ -19,6 +20,10 @@ class TariffService:
             filter_vals,
             filter_by=filter_by,
             filter_value=filter_value,
+            cursor=cursor,
+            page_size=page_size,
+            yield_per=yield_per,
+            columns=columns,
         )
 
     @staticmethod
@@ -0,0 +1,85 @@
+import pytest
+from datetime import date, time
+from sqlalchemy import event
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.employee import Employee
+from models.lift import Lift
+from models.pass_type import PassType
+from services.lift_usage_service import LiftUsageService
+from services.pass_service import PassService
+from services.rental_service import RentalService
+from services.report_service import ReportService
+from utils.report_cache import ReportCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+TODAY = date(2025, 2, 10)
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    ReportCache.clear()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def resort(init_database):
+    key = Key(login='manager', access_right=AccessRight.ADMIN, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Manager', 'M1', date(1990, 1, 1), '1', 'm@m.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), PassType('10 Rides', 10, 0, 500),
+                        Employee('Staff', 'Rental Staff', 1000, '2', 's@s.com')])
+    db.session.commit()
+
+    for start in (time(9, 0), time(10, 0), time(11, 0)):
+        LiftUsageService.add(client.id, 1, TODAY, start, time(start.hour, 10))
+    LiftUsageService.add(client.id, 1, date(2025, 2, 9), time(9, 0), time(9, 10))
+    PassService.add(client.id, 1, TODAY, TODAY, TODAY)
+    PassService.add(client.id, 1, date(2025, 2, 1), date(2025, 2, 1), date(2025, 2, 1))
+    PassService.add(client.id, 1, date(2025, 1, 31), date(2025, 1, 31), date(2025, 1, 31))
+    RentalService.add(client.id, 1, TODAY, time(9, 0), None, 'daily', 300)
+    RentalService.add(client.id, 1, date(2025, 2, 3), time(9, 0), time(12, 0), 'hourly', 200)
+    return client
+
+
+def test_kpis_come_from_one_statement(resort):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        kpis = ReportService().get_dashboard_kpis(TODAY)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(statements) == 1
+    assert (kpis.rides_today, kpis.passes_sold_today, kpis.pass_revenue_today) == (3, 1, 500)
+    assert (kpis.open_rentals, kpis.pass_revenue_mtd, kpis.rental_revenue_mtd) == (1, 1000, 500)
+
+
+def test_kpis_are_cached_for_ttl_despite_writes(resort):
+    first = ReportService().get_dashboard_kpis(TODAY)
+    LiftUsageService.add(resort.id, 1, TODAY, time(12, 0), time(12, 10))
+
+    assert ReportService().get_dashboard_kpis(TODAY).rides_today == first.rides_today
+
+    ReportCache.clear()
+    assert ReportService().get_dashboard_kpis(TODAY).rides_today == first.rides_today + 1
+
+
+def test_dashboard_shows_panel_to_admin(app, resort):
+    app.config['SECRET_KEY'] = 'test'
+    http_client = app.test_client()
+    with http_client.session_transaction() as session:
+        session['client_id'] = resort.id
+        session['access_right'] = 'admin'
+
+    assert 'Resort Today' in http_client.get('/clients/dashboard').get_data(as_text=True)
+    assert set(http_client.get('/clients/dashboard/kpis').get_json()) >= {'rides_today', 'open_rentals'}
@@ -0,0 +1,99 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.client import Client
+from models.employee import Employee
+from models.equipment import Equipment
+from models.equipment_type import EquipmentType
+from models.key import Key, AccessRight
+from models.rental import Rental
+from models.rental_equipment import RentalEquipment
+from services.report_service import ReportService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    """Alice видає 5 прокатів по 2 позиції (1-5 січня), Bob — 1 прокат з 1 позицією (10 січня)."""
+    key = Key(login='renter', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Renter', 'R1', date(2000, 1, 1), '1', 'r@r.com', key.id)
+    alice = Employee('Alice', 'Rental Staff', 30000, '111', 'a@t.com')
+    bob = Employee('Bob', 'Manager', 50000, '222', 'b@t.com')
+    skis_type = EquipmentType('Skis', 'For skiing')
+    db.session.add_all([client, alice, bob, skis_type])
+    db.session.flush()
+    skis = Equipment(skis_type.id, 'Atomic Skis', True)
+    poles = Equipment(skis_type.id, 'Leki Poles', True)
+    db.session.add_all([skis, poles])
+    db.session.flush()
+
+    for day in range(1, 6):
+        rental = Rental(client.id, alice.id, date(2025, 1, day), time(9, 0), time(17, 0), 'daily', 100)
+        db.session.add(rental)
+        db.session.flush()
+        db.session.add_all([RentalEquipment(rental.id, skis.id), RentalEquipment(rental.id, poles.id)])
+    rental = Rental(client.id, bob.id, date(2025, 1, 10), time(9, 0), time(17, 0), 'daily', 70)
+    db.session.add(rental)
+    db.session.flush()
+    db.session.add(RentalEquipment(rental.id, skis.id))
+    db.session.commit()
+    return {'alice_id': alice.id, 'bob_id': bob.id}
+
+
+def test_summary_aggregates_per_employee(populated_db):
+    results = ReportService().get_employee_rental_summary()
+
+    summary = {row.full_name: (row.rentals_handled, row.items_issued, row.revenue) for row in results}
+    # Виручка рахується один раз на прокат, а не на кожну видану позицію
+    assert summary == {'Alice': (5, 10, 500), 'Bob': (1, 1, 70)}
+
+
+def test_summary_respects_period(populated_db):
+    results = ReportService().get_employee_rental_summary(date(2025, 1, 2), date(2025, 1, 3))
+
+    assert [(row.full_name, row.rentals_handled, row.items_issued, row.revenue) for row in results] == \
+        [('Alice', 2, 4, 200)]
+
+
+def test_drill_down_pages_cover_all_rows_once(populated_db):
+    service = ReportService()
+    seen, cursor = [], None
+    while True:
+        page = service.get_employee_rentals_page(populated_db['alice_id'], cursor=cursor, page_size=3)
+        seen.extend((row.rental_date, row.rental_id, row.equipment_id) for row in page)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == 10
+    assert seen == sorted(seen) and len(set(seen)) == 10
+
+    previous = service.get_employee_rentals_page(populated_db['alice_id'], cursor=page.prev_cursor, page_size=3)
+    assert [(row.rental_date, row.rental_id, row.equipment_id) for row in previous] == seen[-4:-1]
+
+
+def test_drill_down_page_renders(app, populated_db):
+    app.config['SECRET_KEY'] = 'test'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = 1
+        session['access_right'] = 'authorized'
+
+    response = client.get(f"/reports/employee_work_stats/{populated_db['bob_id']}/rentals?start_date=2025-01-01")
+
+    page = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert 'Atomic Skis' in page and 'Bob' in page
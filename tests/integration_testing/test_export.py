@@ -0,0 +1,68 @@
+import json
+import pytest
+from datetime import date, time
+from models import db
+from models.lift_usage import LiftUsage
+from services.lift_usage_service import LiftUsageService
+from utils.query_helper import EXPORT_BATCH_SIZE
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def usages(init_database):
+    # FK не перевіряються в SQLite, тому клієнт і підйомник тут не потрібні
+    for i in range(1200):
+        db.session.add(LiftUsage(1, 1 + i % 3, date(2025, 1, 1 + i % 28), time(9, 0), time(9, 5)))
+    db.session.commit()
+
+
+@pytest.fixture(scope='function')
+def moderator_client(app):
+    """Тестовий HTTP-клієнт із сесією модератора."""
+    app.config['SECRET_KEY'] = 'test'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = 1
+        session['access_right'] = 'moderator'
+    return client
+
+
+def test_stream_returns_projected_rows(usages):
+    rows = LiftUsageService.get_all(filter_cols=['lift_id'], filter_ops=['eq'], filter_vals=['2'],
+                                    yield_per=EXPORT_BATCH_SIZE)
+
+    result = list(rows)
+    assert len(result) == 400
+    assert not isinstance(result[0], LiftUsage)
+    assert result[0]._fields == ('id', 'client_id', 'lift_id', 'usage_date', 'usage_time_start', 'usage_time_end')
+
+
+def test_csv_export(moderator_client, usages):
+    response = moderator_client.get('/lift_usages/?export=csv&sort_by=id')
+
+    lines = response.get_data(as_text=True).strip().split('\r\n')
+    assert response.mimetype == 'text/csv'
+    assert 'attachment; filename=lift_usages.csv' == response.headers['Content-Disposition']
+    assert lines[0] == 'id,client_id,lift_id,usage_date,usage_time_start,usage_time_end'
+    assert lines[1] == '1,1,1,2025-01-01,09:00:00,09:05:00'
+    assert len(lines) == 1201
+
+
+def test_ndjson_export_keeps_filters(moderator_client, usages):
+    response = moderator_client.get('/lift_usages/?export=ndjson'
+                                    '&filter_col=usage_date&filter_op=eq&filter_val=2025-01-02')
+
+    records = [json.loads(line) for line in response.get_data(as_text=True).strip().split('\n')]
+    assert response.mimetype == 'application/x-ndjson'
+    assert all(r['usage_date'] == '2025-01-02' for r in records)
+    assert len(records) == LiftUsage.query.filter_by(usage_date=date(2025, 1, 2)).count()
@@ -0,0 +1,88 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from services.lift_service import LiftService
+from services.lift_usage_service import LiftUsageService
+from utils.query_helper import QueryHelper
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def usages(init_database):
+    for i in range(12):
+        db.session.add(LiftUsage(1, 1 + i % 3, date(2025, 1, 1 + i % 4), time(9, i), time(9, i + 1)))
+    db.session.commit()
+
+
+def test_plan_is_reused_for_same_signature(usages):
+    QueryHelper.compile_filter_plan.cache_clear()
+
+    first = LiftUsageService.get_all(filter_cols=['lift_id'], filter_ops=['eq'], filter_vals=['1'])
+    second = LiftUsageService.get_all(filter_cols=['lift_id'], filter_ops=['eq'], filter_vals=['2'])
+
+    info = QueryHelper.compile_filter_plan.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+    assert {u.lift_id for u in first} == {1}
+    assert {u.lift_id for u in second} == {2}
+
+
+def test_invalid_value_skips_only_its_filter(usages):
+    result = LiftUsageService.get_all(filter_cols=['usage_date', 'lift_id'], filter_ops=['eq', 'eq'],
+                                      filter_vals=['not-a-date', '3'])
+
+    assert len(result) == 4
+    assert {u.lift_id for u in result} == {3}
+
+
+def test_unknown_column_and_operator_are_ignored(usages):
+    result = LiftUsageService.get_all(filter_cols=['no_such_column', 'lift_id'], filter_ops=['eq', 'like'],
+                                      filter_vals=['1', '1'])
+
+    assert len(result) == 12
+
+
+def test_in_accepts_comma_separated_values(usages):
+    result = LiftUsageService.get_all(filter_cols=['lift_id'], filter_ops=['in'], filter_vals=['1, 3'])
+
+    assert len(result) == 8
+    assert {u.lift_id for u in result} == {1, 3}
+
+
+def test_repeated_in_filters_are_merged(usages):
+    result = LiftUsageService.get_all(filter_cols=['usage_date', 'usage_date'], filter_ops=['in', 'in'],
+                                      filter_vals=['2025-01-01', '2025-01-03,bad'])
+
+    assert {u.usage_date for u in result} == {date(2025, 1, 1), date(2025, 1, 3)}
+
+
+def test_in_keeps_commas_inside_text_values(init_database):
+    db.session.add_all([Lift('Alpha, upper', 100), Lift('Alpha', 50), Lift('upper', 70), Lift('Beta', 80)])
+    db.session.commit()
+
+    result = LiftService.get_all(filter_cols=['name', 'name'], filter_ops=['in', 'in'],
+                                 filter_vals=['Alpha, upper', 'Beta'])
+
+    assert sorted(lift.name for lift in result) == ['Alpha, upper', 'Beta']
+
+
+def test_long_in_list_uses_temp_table(usages, monkeypatch):
+    monkeypatch.setattr('utils.query_helper.IN_TEMP_TABLE_THRESHOLD', 5)
+    ids = ','.join(str(i) for i in range(2, 2000))
+
+    first = LiftUsageService.get_all(filter_cols=['id'], filter_ops=['in'], filter_vals=[ids], sort_by='id')
+    second = LiftUsageService.get_all(filter_cols=['id'], filter_ops=['in'], filter_vals=['5,6,7,8,9,10'])
+
+    assert [u.id for u in first] == list(range(2, 13))
+    assert sorted(u.id for u in second) == [5, 6, 7, 8, 9, 10]
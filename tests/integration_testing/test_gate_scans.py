@@ -0,0 +1,104 @@
+import pytest
+from datetime import date, datetime, time
+from sqlalchemy import event
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.lift_usage_daily import LiftDailyRides
+from models.pass_lift_usage import PassLiftUsage
+from models.pass_type import PassType
+from models.passes import Pass
+from services.gate_scan_service import GateScanService, ScanRejected
+from utils.pass_validity_cache import PassValidityCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def lift_pass(init_database):
+    key = Key(login='skier', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Skier', 'S1', date(2000, 1, 1), '1', 's@s.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), PassType('2 Rides', 2, 0, 300), PassType('Day', 0, 8, 900)])
+    db.session.flush()
+    db.session.add_all([Pass(client.id, 1, date(2025, 1, 1), date(2025, 1, 1), date(2025, 1, 31), 2, 0),
+                        Pass(client.id, 2, date(2025, 1, 1), date(2025, 1, 1), date(2025, 1, 31), 0, 8)])
+    db.session.commit()
+    return db.session.get(Pass, 1)
+
+
+def test_scan_deducts_and_records_ride_in_one_transaction(lift_pass):
+    PassValidityCache.warm(date(2025, 1, 1))
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        scan = GateScanService.record_scan(lift_pass.id, 1, '2025-01-10T09:15:00')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    # Перевірка — за прогрітим кешем; списання, поїздка, зв'язок і три агрегати — без жодного SELECT
+    assert not [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+    assert (scan.client_id, scan.remaining_lifts) == (lift_pass.client_id, 1)
+    usage = db.session.get(LiftUsage, scan.lift_usage_id)
+    assert (usage.usage_date, usage.usage_time_start) == (date(2025, 1, 10), time(9, 15))
+    assert db.session.get(PassLiftUsage, (lift_pass.id, usage.id)) is not None
+    assert db.session.get(LiftDailyRides, (date(2025, 1, 10), 1)).rides == 1
+
+
+def test_exhausted_pass_is_rejected_without_side_effects(lift_pass):
+    GateScanService.record_scan(lift_pass.id, 1, datetime(2025, 1, 10, 9, 0))
+    GateScanService.record_scan(lift_pass.id, 1, datetime(2025, 1, 10, 9, 20))
+
+    with pytest.raises(ScanRejected, match='no remaining lifts'):
+        GateScanService.record_scan(lift_pass.id, 1, datetime(2025, 1, 10, 9, 40))
+
+    assert db.session.get(Pass, lift_pass.id).remaining_lifts == 0
+    assert LiftUsage.query.count() == 2
+
+
+@pytest.mark.parametrize('pass_id, lift_id, scanned_at, message', [
+    (1, 1, '2025-02-01T09:00:00', 'not valid on 2025-02-01'),
+    (2, 1, '2025-01-10T09:00:00', 'not a lift-based pass'),
+    (99, 1, '2025-01-10T09:00:00', 'not found'),
+])
+def test_invalid_passes_are_rejected(lift_pass, pass_id, lift_id, scanned_at, message):
+    with pytest.raises(ScanRejected, match=message):
+        GateScanService.record_scan(pass_id, lift_id, scanned_at)
+
+
+def test_unknown_lift_rolls_back_deduction(lift_pass):
+    with pytest.raises(ValueError, match='Lift with ID 7'):
+        GateScanService.record_scan(lift_pass.id, 7, '2025-01-10T09:00:00')
+
+    assert db.session.get(Pass, lift_pass.id).remaining_lifts == 2
+    assert LiftUsage.query.count() == 0
+
+
+def test_scan_endpoint(app, lift_pass):
+    app.config['SECRET_KEY'] = 'test'
+    http_client = app.test_client()
+    with http_client.session_transaction() as session:
+        session['client_id'] = lift_pass.client_id
+        session['access_right'] = 'moderator'
+
+    accepted = http_client.post('/gates/scan', json={'pass_id': 1, 'lift_id': 1, 'scanned_at': '2025-01-10T09:00:00'})
+    rejected = http_client.post('/gates/scan', json={'pass_id': 2, 'lift_id': 1, 'scanned_at': '2025-01-10T09:00:00'})
+    malformed = http_client.post('/gates/scan', json={'pass_id': 1, 'lift_id': 1, 'scanned_at': 'yesterday'})
+
+    assert accepted.status_code == 201 and accepted.get_json()['remaining_lifts'] == 1
+    assert rejected.status_code == 409 and not rejected.get_json()['accepted']
+    assert malformed.status_code == 400
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import inspect as sa_inspect, text
+from models import db
+from utils.indexes import IndexManager, create_indexes_command
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+def _index_names(table_name):
+    return {index['name'] for index in sa_inspect(db.engine).get_indexes(table_name)}
+
+
+def test_create_all_builds_declared_indexes(init_database):
+    assert IndexManager.missing_indexes(db.engine) == []
+    assert {'ix_lift_usage_date_lift', 'ix_lift_usage_client_date'} <= _index_names('lift_usage')
+
+
+def test_missing_indexes_are_created(init_database):
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_lift_usage_date_lift'))
+        connection.execute(text('DROP INDEX ix_rental_equipment_equipment_id'))
+
+    missing = [index.name for index in IndexManager.missing_indexes(db.engine)]
+    created = IndexManager.create_missing(db.engine)
+
+    assert missing == created == ['ix_lift_usage_date_lift', 'ix_rental_equipment_equipment_id']
+    assert 'ix_lift_usage_date_lift' in _index_names('lift_usage')
+    assert IndexManager.missing_indexes(db.engine) == []
+
+
+def test_cli_dry_run_does_not_create(app, init_database):
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_pass_client_id'))
+
+    result = app.test_cli_runner().invoke(create_indexes_command, ['--dry-run'])
+
+    assert 'missing: ix_pass_client_id' in result.output
+    assert 'ix_pass_client_id' not in _index_names('pass')
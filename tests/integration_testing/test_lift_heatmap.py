@@ -0,0 +1,79 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.lift_usage_daily import LiftBucketRides
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from services.lift_usage_service import LiftUsageService
+from services.report_service import ReportService, lift_load_heatmap
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+DAY = date(2025, 1, 10)
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    """Alpha: 9:05, 9:20, 9:50 і 10:40; Bravo: 9:10."""
+    key = Key(login='rider', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Rider', 'R1', date(2000, 1, 1), '1', 'r@r.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), Lift('Bravo', 200)])
+    db.session.commit()
+    for lift_id, start in ((1, time(9, 5)), (1, time(9, 20)), (1, time(9, 50)), (1, time(10, 40)), (2, time(9, 10))):
+        LiftUsageService.add(client.id, lift_id, DAY, start, time(start.hour, start.minute + 5))
+    return client
+
+
+def _buckets():
+    return {(r.lift_id, r.bucket): r.rides for r in LiftBucketRides.query.all()}
+
+
+def test_buckets_follow_writes_and_match_rebuild(populated_db):
+    assert _buckets() == {(1, 36): 1, (1, 37): 1, (1, 39): 1, (1, 42): 1, (2, 36): 1}
+
+    moved = LiftUsageService.add(populated_db.id, 2, DAY, time(11, 0), time(11, 5))
+    LiftUsageService.update(moved.id, populated_db.id, 2, DAY, time(9, 14), time(9, 20))
+    assert _buckets()[(2, 36)] == 2 and (2, 44) not in _buckets()
+
+    incremental = _buckets()
+    LiftUsageRollupService.rebuild()
+    assert _buckets() == incremental
+
+
+def test_hourly_heatmap(populated_db):
+    rows = ReportService().get_lift_load_by_time(DAY, DAY, 60)
+
+    heatmap = lift_load_heatmap(rows, 60)
+
+    assert heatmap['slots'] == ['09:00', '10:00']
+    assert heatmap['lifts'] == [('Alpha', [3, 1], 4), ('Bravo', [1, 0], 1)]
+    assert heatmap['peak'] == 3
+
+
+def test_quarter_hour_heatmap_page(app, populated_db):
+    app.config['SECRET_KEY'] = 'test'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = populated_db.id
+        session['access_right'] = 'authorized'
+
+    response = client.post('/reports/lift_heatmap',
+                           data={'start_date': '2025-01-01', 'end_date': '2025-01-31', 'bucket_minutes': '15'})
+
+    page = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert '09:00' in page and '10:30' in page and 'Bravo' in page
@@ -0,0 +1,87 @@
+import io
+import pytest
+from datetime import date
+from models import db
+from models.client import Client
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.lift_usage_daily import ClientDailyRides, LiftBucketRides, LiftDailyRides
+from services.lift_usage_import_service import LiftUsageImportService
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from services.report_service import ReportService
+from utils.report_cache import ReportCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+LOG = """client_id,lift_id,usage_date,usage_time_start,usage_time_end,gate
+1,1,2025-01-10,09:00:00,09:08:00,A
+1,2,2025-01-10,09:20:00,09:30:00,B
+2,1,2025-01-11,10:00,10:05,A
+7,1,2025-01-11,10:00,10:05,A
+1,9,2025-01-11,10:00,10:05,A
+1,1,2025-13-01,10:00,10:05,A
+1,1,2025-01-11,10:05,10:00,A
+1,1
+"""
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    ReportCache.clear()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def resort(init_database):
+    # FK клієнта не перевіряється в SQLite, тож достатньо рядків client з потрібними id
+    db.session.add_all([Client(f'Client {i}', f'D{i}', date(2000, 1, 1), str(i), f'{i}@c.com', i) for i in (1, 2)])
+    db.session.add_all([Lift('Alpha', 100), Lift('Beta', 200)])
+    db.session.commit()
+
+
+def test_import_loads_valid_rows_and_reports_rejects(resort):
+    result = LiftUsageImportService.import_csv(io.StringIO(LOG), batch_size=2)
+
+    assert (result.imported, result.rejected_count) == (3, 5)
+    assert [line for line, _ in result.rejected] == [5, 6, 7, 8, 9]
+    assert 'Client with ID 7' in result.rejected[0][1] and 'Lift with ID 9' in result.rejected[1][1]
+    assert LiftUsage.query.count() == 3
+
+
+def test_import_keeps_rollups_and_reports_consistent(resort):
+    ReportService().get_most_used_lifts_by_period(date(2025, 1, 1), date(2025, 1, 31))
+
+    LiftUsageImportService.import_csv(io.StringIO(LOG))
+
+    imported = {model.__tablename__: sorted(tuple(r) for r in db.session.query(*model.__table__.c))
+                for model in (LiftDailyRides, ClientDailyRides, LiftBucketRides)}
+    LiftUsageRollupService.rebuild()
+    rebuilt = {model.__tablename__: sorted(tuple(r) for r in db.session.query(*model.__table__.c))
+               for model in (LiftDailyRides, ClientDailyRides, LiftBucketRides)}
+    assert imported == rebuilt
+    rows = ReportService().get_most_used_lifts_by_period(date(2025, 1, 1), date(2025, 1, 31))
+    assert [(r.lift_name, r.usage_count) for r in rows] == [('Alpha', 2), ('Beta', 1)]
+
+
+def test_log_without_required_columns_is_refused(resort):
+    with pytest.raises(ValueError, match='usage_time_end'):
+        LiftUsageImportService.import_csv(io.StringIO('client_id,lift_id,usage_date,usage_time_start\n1,1,2025-01-10,09:00\n'))
+
+
+def test_admin_upload(app, resort):
+    app.config['SECRET_KEY'] = 'test'
+    http_client = app.test_client()
+    with http_client.session_transaction() as session:
+        session['client_id'] = 1
+        session['access_right'] = 'admin'
+
+    response = http_client.post('/lift_usages/import', content_type='multipart/form-data',
+                                data={'log_file': (io.BytesIO(LOG.encode('utf-8')), 'gates-2025-01-10.csv')})
+
+    page = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert 'Imported 3 rides, rejected 5 rows.' in page and 'Lift with ID 9' in page
@@ -0,0 +1,93 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.lift_usage_daily import ClientDailyRides, LiftDailyRides
+from services.lift_usage_rollup_service import LiftUsageRollupService
+from services.lift_usage_service import LiftUsageService
+from services.report_service import ReportService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+DAY1 = date(2025, 1, 10)
+DAY2 = date(2025, 1, 11)
+T1, T2 = time(9, 0), time(9, 10)
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    key = Key(login='rider', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Rider', 'R1', date(2000, 1, 1), '1', 'r@r.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), Lift('Bravo', 200)])
+    db.session.commit()
+    return client
+
+
+def _rollup_rows():
+    lifts = {(r.usage_date, r.lift_id): r.rides for r in LiftDailyRides.query.all()}
+    clients = {(r.usage_date, r.client_id): r.rides for r in ClientDailyRides.query.all()}
+    return lifts, clients
+
+
+def test_add_update_delete_keep_rollups_in_sync(populated_db):
+    client_id = populated_db.id
+    first = LiftUsageService.add(client_id, 1, DAY1, T1, T2)
+    LiftUsageService.add(client_id, 1, DAY1, T1, T2)
+    LiftUsageService.add(client_id, 2, DAY2, T1, T2)
+    assert _rollup_rows() == ({(DAY1, 1): 2, (DAY2, 2): 1}, {(DAY1, client_id): 2, (DAY2, client_id): 1})
+
+    LiftUsageService.update(first.id, client_id, 2, DAY2, T1, T2)
+    assert _rollup_rows() == ({(DAY1, 1): 1, (DAY2, 2): 2}, {(DAY1, client_id): 1, (DAY2, client_id): 2})
+
+    LiftUsageService.delete(LiftUsage.query.filter_by(usage_date=DAY1).one().id)
+    assert _rollup_rows() == ({(DAY2, 2): 2}, {(DAY2, client_id): 2})
+
+
+def test_rebuild_matches_incremental(populated_db):
+    for i in range(5):
+        LiftUsageService.add(populated_db.id, 1 + i % 2, DAY1 if i < 3 else DAY2, T1, T2)
+    incremental = _rollup_rows()
+
+    counts = LiftUsageRollupService.rebuild()
+
+    assert _rollup_rows() == incremental
+    assert counts == {'lift_daily_rides': 4, 'client_daily_rides': 2, 'lift_bucket_rides': 4}
+
+
+def test_ensure_built_fills_empty_rollups(populated_db):
+    # Рядки, додані в обхід сервісу (як у seed.py), агрегатів не оновлюють
+    db.session.add_all([LiftUsage(populated_db.id, 1, DAY1, T1, T2) for _ in range(3)])
+    db.session.commit()
+
+    assert LiftUsageRollupService.ensure_built() is True
+    assert LiftUsageRollupService.ensure_built() is False
+    results = ReportService().get_most_used_lifts_by_period(DAY1, DAY2)
+    assert [(r.lift_name, r.usage_count) for r in results] == [('Alpha', 3)]
+
+
+def test_reports_read_rollups(populated_db):
+    for _ in range(16):
+        LiftUsageService.add(populated_db.id, 2, DAY1, T1, T2)
+    LiftUsageService.add(populated_db.id, 1, DAY2, T1, T2)
+    report_service = ReportService()
+
+    busy = report_service.get_clients_with_over_15_lifts_daily(DAY1)
+    visits = report_service.get_clients_visited_more_than_x_times(1)
+
+    assert [(r.full_name, r.lift_count) for r in busy] == [('Rider', 16)]
+    assert [(client.full_name, count) for client, count in visits] == [('Rider', 2)]
@@ -0,0 +1,90 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from services.lift_usage_service import LiftUsageService
+from services.report_service import ReportService
+from utils.report_cache import ReportCache
+
+np = pytest.importorskip('numpy')
+from utils.lift_usage_snapshot import LiftUsageSnapshot  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+DAY1 = date(2025, 1, 10)
+DAY2 = date(2025, 1, 11)
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    """Rider: 16 поїздок на Alpha 10 січня о 9:xx і одна на Bravo 11 січня о 14:00; Walker: 2 поїздки 10 січня."""
+    clients = []
+    for login, name in (('rider', 'Rider'), ('walker', 'Walker')):
+        key = Key(login=login, access_right=AccessRight.AUTHORIZED, is_approved=True)
+        key.set_password('pass')
+        db.session.add(key)
+        db.session.flush()
+        clients.append(Client(name, login, date(2000, 1, 1), '1', f'{login}@r.com', key.id))
+    db.session.add_all([*clients, Lift('Alpha', 100), Lift('Bravo', 200)])
+    db.session.commit()
+    rider, walker = clients
+
+    for minute in range(16):
+        LiftUsageService.add(rider.id, 1, DAY1, time(9, minute), time(9, minute + 10))
+    LiftUsageService.add(rider.id, 2, DAY2, time(14, 0), time(14, 3))
+    LiftUsageService.add(walker.id, 1, DAY1, time(10, 0), time(10, 7))
+    LiftUsageService.add(walker.id, 1, DAY1, time(11, 0), time(11, 7))
+    return rider, walker
+
+
+def test_vectorized_aggregates(populated_db):
+    rider, walker = populated_db
+
+    assert LiftUsageSnapshot.rides_by_lift() == {1: 18, 2: 1}
+    assert LiftUsageSnapshot.rides_by_lift(DAY2, DAY2) == {2: 1}
+    hours = LiftUsageSnapshot.rides_by_lift_hour()
+    assert (hours[1][9], hours[1][10], hours[1][11], hours[2][14]) == (16, 1, 1, 1)
+    assert LiftUsageSnapshot.visit_days_by_client() == {rider.id: 2, walker.id: 1}
+    assert LiftUsageSnapshot.top_clients(1) == [(rider.id, 17)]
+    assert dict(LiftUsageSnapshot.duration_histogram(5)) == {0: 1, 5: 2, 10: 16}
+
+
+def test_refresh_follows_inserts_updates_and_deletes(populated_db):
+    rider, walker = populated_db
+    LiftUsageSnapshot.refresh()
+
+    usage = LiftUsageService.add(walker.id, 2, DAY2, time(15, 0), time(15, 5))
+    assert LiftUsageSnapshot.rides_by_lift(DAY2, DAY2) == {2: 2}
+
+    LiftUsageService.update(usage.id, walker.id, 1, DAY2, time(15, 0), time(15, 5))
+    assert LiftUsageSnapshot.rides_by_lift(DAY2, DAY2) == {1: 1, 2: 1}
+
+    LiftUsageService.delete(usage.id)
+    assert LiftUsageSnapshot.rides_by_lift(DAY2, DAY2) == {2: 1}
+
+
+def test_columnar_backend_matches_sql(app, populated_db, monkeypatch):
+    report_service = ReportService()
+    assert ReportService.compare_lift_backends(DAY1, DAY2, DAY1, 1) == {}
+
+    sql_lifts = report_service.get_most_used_lifts_by_period(DAY1, DAY2)
+    ReportCache.clear()
+    monkeypatch.setitem(app.config, 'LIFT_ANALYTICS_BACKEND', 'columnar')
+    columnar_lifts = report_service.get_most_used_lifts_by_period(DAY1, DAY2)
+    busy = report_service.get_clients_with_over_15_lifts_daily(DAY1)
+    visits = report_service.get_clients_visited_more_than_x_times(1)
+
+    assert [tuple(row) for row in columnar_lifts] == [tuple(row) for row in sql_lifts] == [('Alpha', 18), ('Bravo', 1)]
+    assert [(row.full_name, row.lift_count) for row in busy] == [('Rider', 16)]
+    assert [(client.full_name, count) for client, count in visits] == [('Rider', 2)]
@@ -0,0 +1,86 @@
+import pytest
+from datetime import date, time
+from sqlalchemy import event
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.employee import Employee
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.pass_type import PassType
+from models.passes import Pass
+from models.rental import Rental
+from services.pass_service import PassService
+from services.pass_lift_usage_service import PassLiftUsageService
+from services.pass_rental_usage_service import PassRentalUsageService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    key = Key(login='loader', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Loader', 'L1', date(2000, 1, 1), '1', 'l@l.com', key.id)
+    lift = Lift('Alpha', 100)
+    employee = Employee('Emp', 'Renter', 100, '1', 'e@e.com')
+    lifts_type = PassType('Lifts', 10, 0, 100)
+    hours_type = PassType('Hours', 0, 5, 100)
+    db.session.add_all([client, lift, employee, lifts_type, hours_type])
+    db.session.flush()
+
+    for i in range(6):
+        pass_type = lifts_type if i % 2 else hours_type
+        db.session.add(Pass(client.id, pass_type.id, date(2025, 1, 1), date(2025, 1, 1), date(2025, 3, 1),
+                            pass_type.limit_lifts, pass_type.limit_hours))
+        db.session.add(LiftUsage(client.id, lift.id, date(2025, 1, 2), time(9, i), time(9, i + 1)))
+    db.session.add(Rental(client.id, employee.id, date(2025, 1, 2), time(10, 0), time(12, 0), 'hourly', 100))
+    db.session.commit()
+    db.session.expunge_all()
+    return db
+
+
+@pytest.fixture
+def statements():
+    """Збирає всі SQL-запити, виконані під час тесту."""
+    executed = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', collect)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', collect)
+
+
+def test_pass_by_id_loads_pass_type(populated_db, statements):
+    pass_ = PassService.get_by_id(2)
+
+    assert pass_.pass_type.limit_lifts == 10
+    assert len(statements) == 1
+
+
+def test_add_lift_usage_reads_pass_type_without_extra_query(populated_db, statements):
+    PassLiftUsageService.add(2, 1)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+    assert len(selects) == 2
+    assert db.session.get(Pass, 2).remaining_lifts == 9
+
+
+def test_projected_list_is_one_statement(populated_db, statements):
+    rows = PassRentalUsageService.get_all(columns=('pass_id', 'rental_id'))
+
+    assert rows == []
+    assert len(statements) == 1
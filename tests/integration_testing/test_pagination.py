@@ -0,0 +1,119 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.employee import Employee
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.rental import Rental
+from services.client_service import ClientService
+from services.lift_usage_service import LiftUsageService
+from services.rental_service import RentalService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    """15 підйомів на 5 днів (по 3 на день) + 7 прокатів, частина без end_time."""
+    key = Key(login='pager', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Pager', 'P1', date(2000, 1, 1), '1', 'p@p.com', key.id)
+    lift = Lift('Alpha', 100)
+    employee = Employee('Emp', 'Renter', 100, '1', 'e@e.com')
+    db.session.add_all([client, lift, employee])
+    db.session.flush()
+
+    for i in range(15):
+        db.session.add(LiftUsage(client.id, lift.id, date(2025, 1, 1 + i // 3), time(9, i), time(9, i + 1)))
+    for i in range(7):
+        end = time(12, i) if i % 2 else None
+        db.session.add(Rental(client.id, employee.id, date(2025, 1, 1), time(10, i), end, 'hourly', 100))
+    db.session.commit()
+    return db
+
+
+def _walk_forward(fetch, page_size):
+    pages = []
+    page = fetch(None, page_size)
+    pages.append(page)
+    while page.has_next:
+        page = fetch(page.next_cursor, page_size)
+        pages.append(page)
+    return pages
+
+
+class TestKeysetPagination:
+
+    def test_first_page_is_bounded(self, populated_db):
+        page = LiftUsageService.get_all(sort_by='usage_date', page_size=4)
+
+        assert len(page) == 4
+        assert page.has_next
+        assert not page.has_prev
+
+    def test_walk_forward_covers_all_rows_once(self, populated_db):
+        fetch = lambda cursor, size: LiftUsageService.get_all(
+            sort_by='usage_date', sort_order='desc', cursor=cursor, page_size=size)
+        pages = _walk_forward(fetch, 4)
+
+        ids = [usage.id for page in pages for usage in page]
+        expected = [u.id for u in LiftUsage.query.order_by(LiftUsage.usage_date.desc(), LiftUsage.id.desc())]
+        assert ids == expected
+        assert [len(p) for p in pages] == [4, 4, 4, 3]
+        assert not pages[-1].has_next
+
+    def test_prev_cursor_returns_previous_page(self, populated_db):
+        first = LiftUsageService.get_all(sort_by='usage_date', page_size=4)
+        second = LiftUsageService.get_all(sort_by='usage_date', cursor=first.next_cursor, page_size=4)
+        back = LiftUsageService.get_all(sort_by='usage_date', cursor=second.prev_cursor, page_size=4)
+
+        assert [u.id for u in back] == [u.id for u in first]
+        assert not back.has_prev
+        assert back.next_cursor is not None
+
+    def test_nullable_sort_column(self, populated_db):
+        fetch = lambda cursor, size: RentalService.get_all(sort_by='end_time', cursor=cursor, page_size=size)
+        pages = _walk_forward(fetch, 2)
+
+        ids = [rental.id for page in pages for rental in page]
+        assert sorted(ids) == sorted(r.id for r in Rental.query.all())
+        assert len(ids) == len(set(ids))
+
+    def test_cursor_for_other_sort_is_ignored(self, populated_db):
+        first = LiftUsageService.get_all(sort_by='usage_date', page_size=4)
+        page = LiftUsageService.get_all(sort_by='lift_id', cursor=first.next_cursor, page_size=4)
+
+        assert not page.has_prev
+        assert len(page) == 4
+
+    def test_broken_cursor_falls_back_to_first_page(self, populated_db):
+        page = LiftUsageService.get_all(cursor='not-a-cursor', page_size=5)
+
+        assert [u.id for u in page] == [1, 2, 3, 4, 5]
+
+    def test_joined_query_pagination(self, populated_db):
+        page = ClientService.get_all(sort_by='full_name', page_size=10)
+
+        assert len(page) == 1
+        client, key = page.items[0]
+        assert client.full_name == 'Pager'
+        assert not page.has_next
+
+    def test_without_page_size_returns_list(self, populated_db):
+        result = LiftUsageService.get_all(sort_by='usage_date')
+
+        assert isinstance(result, list)
+        assert len(result) == 15
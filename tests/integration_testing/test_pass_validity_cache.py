@@ -0,0 +1,105 @@
+import pytest
+from datetime import date, datetime, time
+from sqlalchemy import event
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.employee import Employee
+from models.lift import Lift
+from models.pass_type import PassType
+from services.gate_scan_service import GateScanService, ScanRejected
+from services.lift_usage_service import LiftUsageService
+from services.pass_lift_usage_service import PassLiftUsageService
+from services.pass_rental_usage_service import PassRentalUsageService
+from services.pass_service import PassService
+from services.pass_type_service import PassTypeService
+from services.rental_service import RentalService
+from utils.pass_validity_cache import PassValidity, PassValidityCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+DAY = date(2025, 1, 10)
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def passes(init_database):
+    key = Key(login='skier', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Skier', 'S1', date(2000, 1, 1), '1', 's@s.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), PassType('2 Rides', 2, 0, 300), PassType('Hours', 0, 8, 900),
+                        Employee('Staff', 'Rental Staff', 1000, '2', 'e@e.com')])
+    db.session.commit()
+    return (PassService.add(client.id, 1, DAY, date(2025, 1, 1), date(2025, 1, 31)).id,
+            PassService.add(client.id, 2, DAY, date(2025, 1, 1), date(2025, 1, 31)).id,
+            PassService.add(client.id, 1, DAY, date(2024, 12, 1), date(2024, 12, 31)).id)
+
+
+def _statements(fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return statements
+
+
+def test_warm_loads_current_passes_into_slotted_records(passes):
+    lift_pass, hours_pass, expired_pass = passes
+
+    assert PassValidityCache.warm(DAY) == 2
+
+    entry = PassValidityCache.get(lift_pass)
+    assert isinstance(entry, PassValidity) and not hasattr(entry, '__dict__')
+    assert (entry.remaining_lifts, entry.limit_lifts, entry.limit_hours) == (2, 2, 0)
+    assert _statements(lambda: GateScanService.validate(lift_pass, DAY)) == []
+    # Прострочений абонемент не прогрівається, але читається з БД при промаху
+    assert PassValidityCache.get(expired_pass).valid_to == date(2024, 12, 31)
+
+
+def test_write_paths_keep_cache_coherent(passes):
+    lift_pass, hours_pass, _ = passes
+    PassValidityCache.warm(DAY)
+    usage = LiftUsageService.add(1, 1, DAY, time(9, 0), time(9, 10))
+
+    PassLiftUsageService.add(lift_pass, usage.id)
+    assert PassValidityCache.get(lift_pass).remaining_lifts == 1
+
+    PassLiftUsageService.delete(lift_pass, usage.id)
+    assert PassValidityCache.get(lift_pass).remaining_lifts == 2
+
+    rental = RentalService.add(1, 1, DAY, time(9, 0), time(12, 0), 'hourly', 300)
+    PassRentalUsageService.add(hours_pass, rental.id)
+    assert PassValidityCache.get(hours_pass).remaining_hours == 5
+
+    PassTypeService.update(1, '2 Rides', 5, 0, 300)
+    assert PassValidityCache.get(lift_pass).limit_lifts == 5
+
+    PassService.delete(lift_pass)
+    assert PassValidityCache.get(lift_pass) is None
+
+
+def test_gate_scans_update_cached_remaining_lifts(passes):
+    lift_pass = passes[0]
+    PassValidityCache.warm(DAY)
+
+    GateScanService.record_scan(lift_pass, 1, datetime(2025, 1, 10, 9, 0))
+    GateScanService.record_scan(lift_pass, 1, datetime(2025, 1, 10, 9, 20))
+
+    assert PassValidityCache.get(lift_pass).remaining_lifts == 0
+    # Вичерпаний абонемент відхиляється без жодного запиту до БД
+    statements = _statements(lambda: pytest.raises(ScanRejected, GateScanService.record_scan,
+                                                   lift_pass, 1, datetime(2025, 1, 10, 9, 40)))
+    assert statements == []
@@ -0,0 +1,102 @@
+import pytest
+from datetime import date, time
+from sqlalchemy import event
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.pass_type import PassType
+from services.lift_usage_service import LiftUsageService
+from services.pass_service import PassService
+from services.report_service import ReportService, comparison_windows
+from utils.report_cache import ReportCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+# Тиждень 12-18 січня 2026, попередній тиждень і той самий тиждень сезон тому (13-19 січня 2025)
+WINDOWS = comparison_windows(date(2026, 1, 12), date(2026, 1, 18))
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    key = Key(login='rider', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Rider', 'R1', date(2000, 1, 1), '1', 'r@r.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), Lift('Bravo', 200), PassType('Day Pass', 0, 8, 900)])
+    db.session.commit()
+
+    rides = {date(2026, 1, 12): (1, 1, 1, 2), date(2026, 1, 7): (1, 2), date(2025, 1, 19): (1, 1, 1, 1),
+             date(2025, 12, 1): (2, 2)}  # останній день не входить у жодне вікно
+    for day, lift_ids in rides.items():
+        for lift_id in lift_ids:
+            LiftUsageService.add(client.id, lift_id, day, time(9, 0), time(9, 10))
+    for day in (date(2026, 1, 18), date(2026, 1, 18), date(2025, 1, 13)):
+        PassService.add(client.id, 1, day, day, day)
+    return client
+
+
+def _count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return statements, lambda: event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_windows():
+    assert WINDOWS == [(date(2026, 1, 12), date(2026, 1, 18)), (date(2026, 1, 5), date(2026, 1, 11)),
+                       (date(2025, 1, 13), date(2025, 1, 19))]
+
+
+def test_lift_comparison_in_one_statement(populated_db):
+    ReportCache.clear()
+    statements, stop = _count_statements()
+    try:
+        rows = ReportService().get_lift_usage_comparison(WINDOWS)
+    finally:
+        stop()
+
+    assert len(statements) == 1
+    assert [tuple(row) for row in rows] == [
+        # lift, rides per window, base minus previous, base minus last season
+        ('Alpha', 3, 1, 4, 2, -1),
+        ('Bravo', 1, 1, 0, 0, 1),
+    ]
+
+
+def test_pass_sales_comparison(populated_db):
+    rows = ReportService().get_pass_sales_comparison(WINDOWS)
+
+    row = rows[0]
+    assert (row.pass_type_name, row.sold_0, row.sold_1, row.sold_2) == ('Day Pass', 2, 0, 1)
+    assert (row.revenue_0, row.revenue_delta_1, row.revenue_delta_2) == (1800, 1800, 900)
+
+
+def test_comparison_page_and_background_job(app, populated_db):
+    app.config['SECRET_KEY'] = 'test'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = populated_db.id
+        session['access_right'] = 'authorized'
+    form = {'report': 'lift_usage', 'start_date': '2026-01-12', 'end_date': '2026-01-18',
+            'previous': '1', 'last_season': '1'}
+
+    page = client.post('/reports/period_comparison', data=form).get_data(as_text=True)
+    assert 'Same period last season' in page and '+2' in page
+
+    response = client.post('/reports/period_comparison', data=dict(form, background='1'))
+    job_page = client.get(response.headers['Location']).get_data(as_text=True)
+    assert 'Alpha' in job_page and '+2' in job_page
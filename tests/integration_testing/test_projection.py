@@ -0,0 +1,66 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift_usage import LiftUsage
+from services.client_service import ClientService
+from services.lift_usage_service import LiftUsageService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    for i, role in enumerate([AccessRight.AUTHORIZED, AccessRight.MODERATOR]):
+        key = Key(login=f'user{i}', access_right=role, is_approved=True)
+        key.set_password('pass')
+        db.session.add(key)
+        db.session.flush()
+        db.session.add(Client(f'Client {i}', f'D{i}', date(1990, 1, 1), '1', f'c{i}@ski.ua', key.id))
+    for i in range(9):
+        db.session.add(LiftUsage(1, 1 + i % 3, date(2025, 1, 1 + i), time(9, 0), time(9, 5)))
+    db.session.commit()
+    return db
+
+
+def test_rows_are_named_tuples_not_entities(populated_db):
+    rows = LiftUsageService.get_all(columns=('id', 'lift_id'))
+
+    assert len(rows) == 9
+    assert not isinstance(rows[0], LiftUsage)
+    assert rows[0]._fields == ('id', 'lift_id')
+    assert len(db.session.identity_map) == 0
+
+
+def test_unknown_columns_are_skipped(populated_db):
+    rows = LiftUsageService.get_all(columns=('lift_id', 'no_such_column'), sort_by='lift_id')
+
+    assert rows[0]._fields == ('lift_id', 'id')
+
+
+def test_paging_adds_key_columns(populated_db):
+    first = LiftUsageService.get_all(columns=('lift_id',), sort_by='usage_date', sort_order='desc', page_size=4)
+    second = LiftUsageService.get_all(columns=('lift_id',), sort_by='usage_date', sort_order='desc',
+                                      cursor=first.next_cursor, page_size=4)
+
+    assert first.items[0]._fields == ('lift_id', 'usage_date', 'id')
+    assert [row.usage_date.day for row in first] + [row.usage_date.day for row in second] == \
+        [9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def test_client_projection_skips_password_hash(populated_db):
+    page = ClientService.get_all(columns=('id', 'full_name', 'access_right'), sort_by='full_name', page_size=10)
+
+    assert [(row.full_name, row.access_right) for row in page] == \
+        [('Client 0', AccessRight.AUTHORIZED), ('Client 1', AccessRight.MODERATOR)]
+    assert 'password_hash' not in page.items[0]._fields
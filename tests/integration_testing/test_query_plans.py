@@ -0,0 +1,61 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.lift_usage import LiftUsage
+from models.query_plan import QueryPlan
+from services.query_plan_service import QueryPlanService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    db.session.add(LiftUsage(1, 1, date(2025, 1, 1), time(9, 0), time(9, 5)))
+    db.session.commit()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+def _client(app, access_right):
+    app.config['SECRET_KEY'] = 'test'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = 1
+        session['access_right'] = access_right
+    return client
+
+
+def test_admin_explain_stores_plans(app, init_database):
+    response = _client(app, 'admin').get('/lift_usages/?explain=1')
+
+    plans = QueryPlan.query.all()
+    assert response.status_code == 200
+    assert response.headers['X-Query-Plans'] == str(len(plans))
+    assert plans and all(p.endpoint == 'lift_usage.list_lift_usages' for p in plans)
+    assert any('lift_usage' in p.plan for p in plans)
+    assert all(p.statement.lstrip().upper().startswith('SELECT') for p in plans)
+
+
+def test_explain_ignored_for_non_admin(app, init_database):
+    response = _client(app, 'moderator').get('/lift_usages/?explain=1')
+
+    assert response.status_code == 200
+    assert 'X-Query-Plans' not in response.headers
+    assert QueryPlan.query.count() == 0
+
+
+def test_history_groups_by_statement(app, init_database):
+    client = _client(app, 'admin')
+    client.get('/lift_usages/?explain=1')
+    client.get('/lift_usages/?explain=1')
+
+    statement_hash = QueryPlan.query.first().statement_hash
+    history = QueryPlanService.get_history(statement_hash)
+    assert len(history) == 2
+    assert QueryPlanService.diff(history[1], history[0]) == ''
+
+    response = client.get(f'/reports/plans/{statement_hash}')
+    assert response.status_code == 200
@@ -0,0 +1,74 @@
+import pytest
+from models import db
+from models.equipment_type import EquipmentType
+from models.pass_type import PassType
+from models.tariff import Tariff
+from services.report_service import ReportService
+from utils.report_cache import ReportCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    ReportCache.reset_stats()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def skis(init_database):
+    equipment_type = EquipmentType('Skis', 'Alpine skis')
+    db.session.add(equipment_type)
+    db.session.flush()
+    db.session.add(Tariff(equipment_type.id, 10, 50, 5))
+    db.session.commit()
+    return equipment_type
+
+
+def _tariff_names():
+    return [r.equipment_type_name for r in ReportService().get_equipment_tariffs_with_weekday_discount()]
+
+
+def test_repeated_report_is_served_from_cache(skis):
+    report_service = ReportService()
+
+    first = report_service.get_equipment_tariffs_with_weekday_discount()
+    second = report_service.get_equipment_tariffs_with_weekday_discount()
+
+    assert second is first
+    stats = ReportCache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert stats['saved_seconds'] > 0
+
+
+def test_write_to_read_table_invalidates(skis):
+    assert _tariff_names() == ['Skis']
+
+    skis.name = 'Alpine Skis'
+    db.session.commit()
+
+    assert _tariff_names() == ['Alpine Skis']
+    assert ReportCache.stats()['invalidated'] == 1
+
+
+def test_bulk_delete_invalidates(skis):
+    assert _tariff_names() == ['Skis']
+
+    Tariff.query.filter_by(equipment_type_id=skis.id).delete(synchronize_session=False)
+    db.session.commit()
+
+    assert _tariff_names() == []
+
+
+def test_unrelated_write_keeps_entry(skis):
+    _tariff_names()
+
+    db.session.add(PassType('Season', 0, 100, 1000))
+    db.session.commit()
+    _tariff_names()
+
+    assert ReportCache.stats()['hits'] == 1
@@ -0,0 +1,143 @@
+import datetime
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.report_job import ReportJob
+from services.client_service import ClientService
+from services.lift_usage_service import LiftUsageService
+from services.report_job_service import ReportJobService, REPORT_JOBS
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    key = Key(login='visitor', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Visitor', 'V1', date(2000, 1, 1), '1', 'v@v.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100)])
+    db.session.commit()
+    for day in (3, 4, 5):
+        LiftUsageService.add(client.id, 1, date(2025, 1, day), time(9, 0), time(9, 10))
+    return client
+
+
+@pytest.fixture(scope='function')
+def http_client(app, populated_db):
+    app.config['SECRET_KEY'] = 'test'
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = populated_db.id
+        session['access_right'] = 'authorized'
+    return client
+
+
+def test_background_submit_redirects_to_finished_job(http_client):
+    response = http_client.post('/reports/most_used_lifts',
+                                data={'start_date': '2025-01-01', 'end_date': '2025-01-31', 'background': '1'})
+
+    job = ReportJob.query.one()
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f'/reports/jobs/{job.id}')
+    assert job.status == 'done'
+
+    page = http_client.get(f'/reports/jobs/{job.id}').get_data(as_text=True)
+    assert 'Alpha' in page and '2025-01-31' in page
+
+
+def test_same_params_reuse_job(populated_db, monkeypatch):
+    # Завдання лишається в черзі, як до того, як його забере пул
+    monkeypatch.setattr(ReportJobService, '_dispatch', lambda job_id: None)
+    params = {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 31)}
+
+    first = ReportJobService.submit('most_used_lifts', params, populated_db.id)
+    second = ReportJobService.submit('most_used_lifts', dict(params), populated_db.id)
+
+    assert first.id == second.id
+    assert ReportJob.query.count() == 1
+
+
+def test_other_clients_submit_gets_own_job(populated_db, monkeypatch):
+    monkeypatch.setattr(ReportJobService, '_dispatch', lambda job_id: None)
+    params = {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 31)}
+
+    first = ReportJobService.submit('most_used_lifts', params, populated_db.id)
+    second = ReportJobService.submit('most_used_lifts', dict(params), populated_db.id + 1)
+
+    assert first.id != second.id
+    assert second.client_id == populated_db.id + 1
+
+
+def test_finished_job_is_not_reused(populated_db):
+    params = {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 31)}
+    first = ReportJobService.submit('most_used_lifts', params, populated_db.id)
+    LiftUsageService.add(populated_db.id, 1, date(2025, 1, 6), time(9, 0), time(9, 10))
+
+    second = ReportJobService.submit('most_used_lifts', dict(params), populated_db.id)
+
+    assert first.id != second.id
+    assert second.status == 'done'
+    lift = ReportJobService.get_result(second)['data'][0]
+    assert 4 in tuple(lift)
+
+
+def test_entity_rows_survive_round_trip(populated_db):
+    job = ReportJobService.submit('client_visit_stats', {
+        'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 31), 'visit_threshold': 2})
+
+    result = ReportJobService.get_result(job)
+
+    assert result['start_date'] == date(2025, 1, 1)
+    assert [c.full_name for c in result['clients_in_range']] == ['Visitor']
+    client, visit_count = result['clients_frequent'][0]
+    assert (client.full_name, client.date_of_birth, visit_count) == ('Visitor', date(2000, 1, 1), 3)
+
+
+def test_failure_is_recorded(populated_db, monkeypatch):
+    def broken(service, **params):
+        raise RuntimeError('boom')
+    monkeypatch.setitem(REPORT_JOBS, 'most_used_lifts', broken)
+
+    job = ReportJobService.submit('most_used_lifts', {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 2)})
+
+    assert (job.status, job.error) == ('failed', 'boom')
+
+
+def test_expired_jobs_are_purged(populated_db):
+    job = ReportJobService.submit('most_used_lifts', {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 2)})
+    job.expires_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    db.session.commit()
+
+    assert ReportJobService.purge_expired() == 1
+    assert ReportJob.query.count() == 0
+
+
+def test_other_users_job_is_hidden(app, http_client, populated_db):
+    job = ReportJobService.submit('most_used_lifts', {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 2)},
+                                  client_id=populated_db.id + 1)
+
+    response = http_client.get(f'/reports/jobs/{job.id}')
+
+    assert response.status_code == 302
+
+
+def test_deleting_client_removes_their_jobs(populated_db):
+    ReportJobService.submit('most_used_lifts', {'start_date': date(2025, 1, 1), 'end_date': date(2025, 1, 2)},
+                            client_id=populated_db.id)
+
+    assert ClientService.delete(populated_db.id)
+    assert ReportJob.query.count() == 0
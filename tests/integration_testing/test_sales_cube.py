@@ -0,0 +1,113 @@
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.employee import Employee
+from models.pass_type import PassType
+from models.sales_daily import PassDailySales, RentalDailySales
+from services.pass_service import PassService
+from services.pass_type_service import PassTypeService
+from services.rental_service import RentalService
+from services.report_service import ReportService
+from services.sales_cube_service import SalesCubeService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    key = Key(login='buyer', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Buyer', 'B1', date(2000, 1, 1), '1', 'b@b.com', key.id)
+    db.session.add_all([client, Employee('Emp', 'Renter', 100, '1', 'e@e.com'),
+                        PassType('Day', 0, 8, 100), PassType('Season', 0, 500, 900)])
+    db.session.commit()
+
+    PassService.add(client.id, 1, date(2025, 1, 31), date(2025, 2, 1), date(2025, 2, 1))
+    PassService.add(client.id, 1, date(2025, 2, 1), date(2025, 2, 1), date(2025, 2, 1))
+    PassService.add(client.id, 2, date(2025, 2, 28), date(2025, 3, 1), date(2025, 6, 1))
+    for rental_date, price in ((date(2025, 1, 15), 40), (date(2025, 2, 10), 60), (date(2025, 4, 2), 80)):
+        RentalService.add(client.id, 1, rental_date, time(9, 0), time(17, 0), 'daily', price)
+    return client
+
+
+def _cube():
+    passes = {(r.day, r.pass_type_id): (r.passes_sold, r.revenue) for r in PassDailySales.query.all()}
+    rentals = {(r.day, r.rental_type): (r.rentals, r.revenue) for r in RentalDailySales.query.all()}
+    return passes, rentals
+
+
+def test_services_maintain_cube(populated_db):
+    passes, rentals = _cube()
+    assert passes[(date(2025, 2, 28), 2)] == (1, 900)
+    assert rentals[(date(2025, 2, 10), 'daily')] == (1, 60)
+
+    moved = PassService.add(populated_db.id, 1, date(2025, 2, 1), date(2025, 2, 1), date(2025, 2, 1))
+    assert _cube()[0][(date(2025, 2, 1), 1)] == (2, 200)
+    PassService.update(moved.id, populated_db.id, 2, date(2025, 2, 28), date(2025, 3, 1), date(2025, 6, 1), 0, 500)
+    assert _cube()[0][(date(2025, 2, 1), 1)] == (1, 100)
+    assert _cube()[0][(date(2025, 2, 28), 2)] == (2, 1800)
+
+    RentalService.update(3, populated_db.id, 1, date(2025, 4, 2), time(9, 0), time(12, 0), 'hourly', 30)
+    RentalService.delete(1)
+    rentals = _cube()[1]
+    assert (date(2025, 4, 2), 'daily') not in rentals
+    assert rentals[(date(2025, 4, 2), 'hourly')] == (1, 30)
+    assert (date(2025, 1, 15), 'daily') not in rentals
+
+
+def test_rebuild_matches_incremental(populated_db):
+    incremental = _cube()
+
+    counts = SalesCubeService.rebuild()
+
+    assert _cube() == incremental
+    assert counts == {'pass_daily_sales': 3, 'rental_daily_sales': 3}
+
+
+def test_price_change_reprices_cube(populated_db):
+    extra = PassService.add(populated_db.id, 1, date(2025, 2, 1), date(2025, 2, 1), date(2025, 2, 1))
+
+    PassTypeService.update(1, 'Day', 0, 8, 150)
+    assert _cube()[0][(date(2025, 2, 1), 1)] == (2, 300)
+    PassService.delete(extra.id)
+
+    incremental = _cube()
+    assert incremental[0][(date(2025, 2, 1), 1)] == (1, 150)
+    SalesCubeService.rebuild()
+    assert _cube() == incremental
+
+
+def test_reports_roll_up_cube(populated_db):
+    report_service = ReportService()
+    start, end = date(2025, 1, 1), date(2025, 2, 28)
+
+    by_day = report_service.get_pass_sales_by_day(start, end)
+    by_type = report_service.get_pass_sales_by_type(start, end)
+    by_month = report_service.get_rental_revenue_by_month(start, date(2025, 12, 31))
+    by_quarter = report_service.get_rental_revenue_by_quarter(start, date(2025, 12, 31))
+
+    assert [(r.purchase_date, r.sales_count) for r in by_day] == [
+        (date(2025, 1, 31), 1), (date(2025, 2, 1), 1), (date(2025, 2, 28), 1)]
+    assert [(r.pass_type_name, r.sales_count) for r in by_type] == [('Day', 2), ('Season', 1)]
+    assert [(int(r.year), int(r.month), r.total_revenue) for r in by_month] == [
+        (2025, 1, 40), (2025, 2, 60), (2025, 4, 80)]
+    assert [(int(r.year), int(r.quarter), r.total_revenue) for r in by_quarter] == [(2025, 1, 100), (2025, 2, 80)]
+
+
+def test_bought_pass_by_month_uses_month_bounds(populated_db):
+    clients = ReportService().get_clients_bought_pass_by_month('Day', 2025, 2)
+
+    assert [r.purchase_date for r in clients] == [date(2025, 2, 1)]
@@ -0,0 +1,130 @@
+import datetime
+import pytest
+from datetime import date, time
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.saved_view import SavedView
+from models.saved_view_snapshot import SavedViewSnapshot
+from services.client_service import ClientService
+from services.lift_usage_service import LiftUsageService
+from services.saved_view_service import SavedViewService
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def saved_view(app, init_database):
+    app.config['SECRET_KEY'] = 'test'
+    key = Key(login='moderator', access_right=AccessRight.MODERATOR, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Moderator', 'M1', date(1990, 1, 1), '1', 'm@m.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), Lift('Beta', 200)])
+    db.session.commit()
+    for lift_id in (1, 1, 2):
+        LiftUsageService.add(client.id, lift_id, date(2025, 1, 3), time(9, 0), time(9, 10))
+    return SavedViewService.add('Alpha rides', '/lift_usages/?filter_col=lift_id&filter_op=eq&filter_val=1'
+                                '&page_size=1', client.id)
+
+
+@pytest.fixture(scope='function')
+def http_client(app, saved_view):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['client_id'] = saved_view.client_id
+        session['access_right'] = 'moderator'
+    return client
+
+
+def test_snapshot_holds_all_filtered_rows(saved_view):
+    snapshot = SavedViewService.set_schedule(saved_view, 'nightly')
+
+    data = SavedViewService.get_snapshot_data(snapshot)
+    assert snapshot.computed_at is not None and snapshot.error is None
+    # Пагінація збереженого URL не обрізає знімок — у ньому весь відфільтрований список
+    assert snapshot.row_count == 2
+    assert {row[data['columns'].index('lift_id')] for row in data['rows']} == {1}
+    assert data['params']['filter_val'] == ['1'] and 'page_size' not in data['params']
+    assert snapshot.next_refresh_at.hour == 3 and snapshot.next_refresh_at > datetime.datetime.now()
+
+
+def test_open_serves_snapshot_and_refresh_now_recomputes(http_client, saved_view):
+    SavedViewService.set_schedule(saved_view, 'manual')
+    LiftUsageService.add(saved_view.client_id, 1, date(2025, 1, 4), time(10, 0), time(10, 10))
+
+    page = http_client.get(f'/clients/saved_views/{saved_view.id}').get_data(as_text=True)
+    assert 'Snapshot computed' in page and '2025-01-04' not in page
+
+    response = http_client.post(f'/clients/saved_views/{saved_view.id}/refresh')
+    assert response.status_code == 302
+    assert db.session.get(SavedViewSnapshot, saved_view.id).row_count == 3
+    assert '2025-01-04' in http_client.get(f'/clients/saved_views/{saved_view.id}').get_data(as_text=True)
+
+
+def test_view_without_snapshot_opens_live(http_client, saved_view):
+    response = http_client.get(f'/clients/saved_views/{saved_view.id}')
+
+    assert response.status_code == 302
+    assert response.headers['Location'] == saved_view.url
+
+
+def test_scheduler_refreshes_only_due_snapshots(saved_view):
+    snapshot = SavedViewService.set_schedule(saved_view, 'hourly')
+    first_run = snapshot.computed_at
+    LiftUsageService.add(saved_view.client_id, 1, date(2025, 1, 4), time(10, 0), time(10, 10))
+
+    assert SavedViewService.refresh_due() == 0
+    assert SavedViewService.refresh_due(now=snapshot.next_refresh_at) == 1
+
+    snapshot = db.session.get(SavedViewSnapshot, saved_view.id)
+    assert snapshot.row_count == 3 and snapshot.computed_at > first_run
+    assert snapshot.next_refresh_at > datetime.datetime.now() + datetime.timedelta(minutes=59)
+
+
+def test_switching_off_drops_snapshot(saved_view):
+    SavedViewService.set_schedule(saved_view, 'manual')
+
+    SavedViewService.set_schedule(saved_view, None)
+
+    assert SavedViewSnapshot.query.count() == 0
+
+
+def test_report_views_cannot_keep_a_snapshot(saved_view):
+    report = SavedViewService.add('Top lifts', '/reports/most_used_lifts?start_date=2025-01-01', saved_view.client_id)
+
+    with pytest.raises(ValueError, match='Only saved list views'):
+        SavedViewService.set_schedule(report, 'nightly')
+    assert SavedViewSnapshot.query.count() == 0
+
+
+def test_scheduler_skips_views_deleted_in_bulk(saved_view):
+    other = SavedViewService.add('Beta rides', '/lift_usages/?filter_col=lift_id&filter_op=eq&filter_val=2',
+                                 saved_view.client_id)
+    SavedViewService.set_schedule(saved_view, 'hourly')
+    snapshot = SavedViewService.set_schedule(other, 'hourly')
+    due = snapshot.next_refresh_at
+    # Масовий DELETE без ORM-каскаду; SQLite не виконує ON DELETE CASCADE
+    SavedView.query.filter_by(id=saved_view.id).delete(synchronize_session=False)
+    db.session.commit()
+
+    assert SavedViewService.refresh_due(now=due) == 1
+    assert [s.view_id for s in SavedViewSnapshot.query] == [other.id]
+
+
+def test_deleting_client_removes_snapshots(saved_view):
+    SavedViewService.set_schedule(saved_view, 'manual')
+
+    assert ClientService.delete(saved_view.client_id)
+    assert SavedViewSnapshot.query.count() == 0
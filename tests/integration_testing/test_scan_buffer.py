@@ -0,0 +1,152 @@
+import pytest
+from datetime import date, datetime
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.lift import Lift
+from models.lift_usage import LiftUsage
+from models.lift_usage_daily import LiftDailyRides
+from models.pass_lift_usage import PassLiftUsage
+from models.pass_type import PassType
+from models.passes import Pass
+from services.gate_scan_service import ScanRejected
+from services.scan_buffer_service import ScanBufferService
+from utils.pass_validity_cache import PassValidityCache
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+DAY = datetime(2025, 1, 10, 9, 0)
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def lift_pass(init_database):
+    key = Key(login='skier', access_right=AccessRight.AUTHORIZED, is_approved=True)
+    key.set_password('pass')
+    db.session.add(key)
+    db.session.flush()
+    client = Client('Skier', 'S1', date(2000, 1, 1), '1', 's@s.com', key.id)
+    db.session.add_all([client, Lift('Alpha', 100), PassType('3 Rides', 3, 0, 300)])
+    db.session.flush()
+    db.session.add(Pass(client.id, 1, date(2025, 1, 1), date(2025, 1, 1), date(2025, 1, 31), 3, 0))
+    db.session.commit()
+    return db.session.get(Pass, 1)
+
+
+@pytest.fixture(scope='function')
+def journal(app, lift_pass, tmp_path):
+    path = str(tmp_path / 'scans.ndjson')
+    ScanBufferService.start(app, path)
+    yield path
+    ScanBufferService.stop(flush=False)
+
+
+def test_scans_are_acknowledged_then_flushed_in_one_batch(journal, lift_pass):
+    acks = [ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=m)) for m in (0, 20)]
+
+    assert [ack.remaining_lifts for ack in acks] == [2, 1]
+    assert LiftUsage.query.count() == 0 and ScanBufferService.stats()['queue_depth'] == 2
+
+    assert ScanBufferService.flush() == 2
+
+    stats = ScanBufferService.stats()
+    assert (stats['queue_depth'], stats['flushed'], stats['flushes']) == (0, 2, 1)
+    assert stats['last_flush_ms'] is not None
+    assert PassLiftUsage.query.count() == 2
+    assert db.session.get(Pass, lift_pass.id).remaining_lifts == 1
+    assert db.session.get(LiftDailyRides, (date(2025, 1, 10), 1)).rides == 2
+    assert open(journal).read() == ''
+
+
+def test_queued_scans_count_against_remaining_lifts(journal, lift_pass):
+    for minute in (0, 10, 20):
+        ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=minute))
+
+    with pytest.raises(ScanRejected, match='no remaining lifts'):
+        ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=30))
+    with pytest.raises(ValueError, match='Lift with ID 5'):
+        ScanBufferService.enqueue(lift_pass.id, 5, DAY)
+
+
+def test_flush_during_cache_miss_is_not_double_counted(journal, lift_pass, monkeypatch):
+    for minute in (0, 10):
+        ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=minute))
+    PassValidityCache.clear()
+    original_get = PassValidityCache.get
+    calls = []
+
+    def get_raced_by_flush(pass_id):
+        # Промах прочитав залишок 3, але пачка записалася раніше, ніж enqueue взяв _lock
+        entry = original_get(pass_id)
+        if not calls:
+            PassValidityCache._entries.pop(pass_id)
+            ScanBufferService.flush()
+        calls.append(pass_id)
+        return entry
+    monkeypatch.setattr(PassValidityCache, 'get', get_raced_by_flush)
+
+    ack = ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=20))
+
+    assert len(calls) == 2
+    assert ack.remaining_lifts == 0
+    with pytest.raises(ScanRejected, match='no remaining lifts'):
+        ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=30))
+
+
+def test_lift_added_after_start_is_accepted(journal, lift_pass):
+    db.session.add(Lift('Beta', 80))
+    db.session.commit()
+
+    ack = ScanBufferService.enqueue(lift_pass.id, 2, DAY)
+
+    assert ack.remaining_lifts == 2
+
+
+def test_journal_replays_only_unflushed_scans_after_crash(app, journal, lift_pass):
+    for minute in (0, 10, 20):
+        ScanBufferService.enqueue(lift_pass.id, 1, DAY.replace(minute=minute))
+    ScanBufferService.flush(max_rows=1)
+
+    # Збій: черга в пам'яті втрачена, журнал і контрольна точка лишилися
+    ScanBufferService.stop(flush=False)
+    assert ScanBufferService.start(app, journal) == 2
+    assert ScanBufferService.stats()['replayed'] == 2
+
+    ScanBufferService.flush()
+    assert sorted(u.usage_time_start.minute for u in LiftUsage.query) == [0, 10, 20]
+    assert db.session.get(Pass, lift_pass.id).remaining_lifts == 0
+
+
+def test_scan_exhausted_elsewhere_is_reported_at_flush(journal, lift_pass):
+    ScanBufferService.enqueue(lift_pass.id, 1, DAY)
+    lift_pass.remaining_lifts = 0  # інший процес списав останні підйоми
+    db.session.commit()
+
+    assert ScanBufferService.flush() == 1
+
+    stats = ScanBufferService.stats()
+    assert (stats['flushed'], stats['rejected']) == (0, 1)
+    assert 'no remaining lifts' in stats['recent_rejections'][0]['reason']
+    assert LiftUsage.query.count() == 0
+
+
+def test_buffered_endpoint_returns_202(app, journal, lift_pass, monkeypatch):
+    monkeypatch.setitem(app.config, 'GATE_SCAN_MODE', 'buffered')
+    app.config['SECRET_KEY'] = 'test'
+    http_client = app.test_client()
+    with http_client.session_transaction() as session:
+        session['client_id'] = lift_pass.client_id
+        session['access_right'] = 'admin'
+
+    response = http_client.post('/gates/scan', json={'pass_id': 1, 'lift_id': 1, 'scanned_at': '2025-01-10T09:00:00'})
+
+    assert response.status_code == 202 and response.get_json()['queued']
+    assert http_client.get('/gates/buffer').get_json()['queue_depth'] == 1
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import func
+from models import db
+from models.lift_usage import LiftUsage
+from models.lift_usage_daily import LiftDailyRides
+from benchmarks.season import generate_season
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+def test_generated_season_is_consistent(init_database):
+    counts = generate_season(clients=50, lifts=4, lift_usages=2000, employees=3)
+
+    assert counts['client'] == 50 and counts['lift'] == 4
+    assert 1900 <= counts['lift_usage'] == LiftUsage.query.count() <= 2000
+    # Денні агрегати перераховані після масової вставки
+    assert db.session.query(func.sum(LiftDailyRides.rides)).scalar() == counts['lift_usage']
+    with pytest.raises(ValueError):
+        generate_season(clients=1, lifts=1, lift_usages=1)
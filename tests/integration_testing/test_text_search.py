@@ -0,0 +1,80 @@
+import pytest
+from datetime import date
+from models import db
+from models.key import Key, AccessRight
+from models.client import Client
+from models.equipment import Equipment
+from models.equipment_type import EquipmentType
+from models.tariff import Tariff
+from services.client_service import ClientService
+from services.equipment_service import EquipmentService
+from utils.query_helper import QueryHelper
+
+pytestmark = pytest.mark.usefixtures("app_context")
+
+
+@pytest.fixture(scope='function')
+def init_database(app_context):
+    """Створює всі таблиці в пам'яті перед тестом і видаляє їх після."""
+    db.create_all()
+    yield db
+    db.session.remove()
+    db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def populated_db(init_database):
+    names = ['Olena Kovalenko', 'Petro Shevchenko', 'Iryna Koval', 'Taras Bondar']
+    for i, name in enumerate(names):
+        key = Key(login=f'user{i}', access_right=AccessRight.AUTHORIZED, is_approved=True)
+        key.set_password('pass')
+        db.session.add(key)
+        db.session.flush()
+        db.session.add(Client(name, f'D{i}', date(1990, 1, 1), '1', f'user{i}@ski.ua', key.id))
+
+    ski = EquipmentType('Ski', 'Alpine skis')
+    db.session.add(ski)
+    db.session.flush()
+    db.session.add(Tariff(ski.id, 100, 500, 10))
+    db.session.add_all([Equipment(ski.id, 'Rossignol Hero', True), Equipment(ski.id, 'Atomic Redster', True)])
+    db.session.commit()
+    return db
+
+
+def _names(rows):
+    return sorted(client.full_name for client, key in rows)
+
+
+def test_like_filter_goes_through_fts_index():
+    clause = QueryHelper.contains(Client.full_name, '%koval%')
+
+    assert 'client_fts' in str(clause)
+
+
+def test_like_filter_matches_substring_case_insensitive(populated_db):
+    rows = ClientService.get_all(filter_cols=['full_name'], filter_ops=['like'], filter_vals=['KOVAL'])
+
+    assert _names(rows) == ['Iryna Koval', 'Olena Kovalenko']
+
+
+def test_index_follows_updates_and_deletes(populated_db):
+    client = Client.query.filter_by(full_name='Taras Bondar').one()
+    client.full_name = 'Taras Kovalchuk'
+    db.session.delete(Client.query.filter_by(full_name='Iryna Koval').one())
+    db.session.commit()
+
+    rows = ClientService.get_all(filter_cols=['full_name'], filter_ops=['like'], filter_vals=['koval'])
+
+    assert _names(rows) == ['Olena Kovalenko', 'Taras Kovalchuk']
+
+
+def test_short_pattern_still_matches(populated_db):
+    rows = ClientService.get_all(filter_cols=['email'], filter_ops=['like'], filter_vals=['r3'])
+
+    assert _names(rows) == ['Taras Bondar']
+
+
+def test_equipment_joined_model_search(populated_db):
+    rows = EquipmentService.get_all_joined(filter_by='model', filter_value='hero')
+
+    assert [equipment.model for equipment, eq_type, tariff in rows] == ['Rossignol Hero']
@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+from flask import current_app
+
+from utils.report_executor import ReportExecutor
+
+
+@pytest.fixture
+def parallel(app, monkeypatch):
+    """Вмикає паралельне виконання попри SQLite у пам'яті в тестовому конфігу."""
+    monkeypatch.setattr(ReportExecutor, '_parallel_allowed', staticmethod(lambda: True))
+    with app.app_context():
+        yield
+
+
+def test_sub_queries_run_concurrently(parallel):
+    # Обидва виклики чекають один на одного: послідовне виконання впало б по тайм-ауту
+    barrier = threading.Barrier(2, timeout=5)
+
+    def panel(name):
+        barrier.wait()
+        return name, threading.current_thread().name, current_app.name
+
+    results = ReportExecutor.run(first=(panel, 'a'), second=(panel, 'b'))
+
+    assert results['first'][0] == 'a' and results['second'][0] == 'b'
+    assert results['first'][1] != results['second'][1]
+    assert all(thread.startswith('report') for _, thread, _ in results.values())
+
+
+def test_sub_query_error_is_raised_in_caller(parallel):
+    def failing():
+        raise ValueError('bad period')
+
+    with pytest.raises(ValueError, match='bad period'):
+        ReportExecutor.run(ok=(lambda: 1,), broken=(failing,))
+
+
+def test_in_memory_sqlite_runs_sequentially(app):
+    with app.app_context():
+        results = ReportExecutor.run(first=(threading.current_thread,), second=(threading.current_thread,))
+
+    assert results['first'] is results['second'] is threading.current_thread()
@@ -0,0 +1,52 @@
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from middlewares.statement_budget import statement_budget, statement_budget_middleware
+
+
+@pytest.fixture
+def budget_app():
+    app = Flask(__name__)
+    app.config.update(TESTING=True, STATEMENT_BUDGET_CHECK=True)
+    engine = create_engine('sqlite://')
+    statement_budget_middleware(app)
+
+    @app.route('/queries/<int:n>')
+    @statement_budget(3)
+    def run_queries(n):
+        with engine.connect() as connection:
+            for _ in range(n):
+                connection.execute(text('SELECT 1'))
+        return 'ok'
+
+    @app.route('/unlimited/<int:n>')
+    def unlimited(n):
+        return run_queries(n)
+
+    return app
+
+
+def test_within_budget(budget_app):
+    response = budget_app.test_client().get('/queries/3')
+
+    assert response.status_code == 200
+
+
+def test_over_budget_fails(budget_app):
+    with pytest.raises(AssertionError, match='run_queries executed 4 SQL statements, budget is 3'):
+        budget_app.test_client().get('/queries/4')
+
+
+def test_endpoint_without_budget_is_not_checked(budget_app):
+    response = budget_app.test_client().get('/unlimited/10')
+
+    assert response.status_code == 200
+
+
+def test_check_disabled_outside_debug(budget_app):
+    budget_app.config['STATEMENT_BUDGET_CHECK'] = False
+
+    response = budget_app.test_client().get('/queries/10')
+
+    assert response.status_code == 200
@@ -0,0 +1,82 @@
+import csv
+import datetime
+import decimal
+import enum
+import io
+import json
+
+from flask import Response, stream_with_context
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# Скільки рядків накопичувати перед відправкою чергового шматка відповіді
+_FLUSH_EVERY = 500
+
+
+def _plain_value(value):
+    """Перетворює значення колонки у тип, придатний для CSV/JSON."""
+    if isinstance(value, (datetime.date, datetime.time, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def _csv_chunks(rows, header):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    pending = 1
+    for row in rows:
+        writer.writerow([_plain_value(v) for v in row])
+        pending += 1
+        if pending >= _FLUSH_EVERY:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows, header):
+    lines = []
+    for row in rows:
+        record = {name: _plain_value(v) for name, v in zip(header, row)}
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= _FLUSH_EVERY:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def exportable(fn):
+    """
+    Позначає ендпоінт списку, що віддає свої рядки з ?export=csv|ndjson.
+    Лише такі перегляди можна зберегти зі знімком (див. SavedViewService).
+    """
+    fn.supports_export = True
+    return fn
+
+
+def export_response(query, fmt: str, filename: str) -> Response:
+    """
+    Віддає результат потокового запиту (див. QueryHelper.stream) як CSV або NDJSON.
+    Рядки читаються і пишуться у відповідь порціями, тож увесь результат ніколи
+    не тримається в пам'яті.
+    """
+    header = [column['name'] for column in query.column_descriptions]
+
+    if fmt == 'csv':
+        chunks, mimetype = _csv_chunks(query, header), 'text/csv'
+    else:
+        chunks, mimetype = _ndjson_chunks(query, header), 'application/x-ndjson'
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}.{fmt}'},
+    )
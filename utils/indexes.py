@@ -0,0 +1,69 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.schema import CreateIndex
+
+from models import db
+
+
+class IndexManager:
+    """
+    Доводить індекси живої БД до оголошених у моделях (__table_args__).
+    db.create_all() створює індекси лише разом із новою таблицею, тож для
+    наявних таблиць відсутні індекси додаються цим класом.
+    """
+
+    @staticmethod
+    def missing_indexes(engine) -> list:
+        """Індекси з моделей, яких немає в існуючих таблицях БД."""
+        inspector = sa_inspect(engine)
+        existing_tables = set(inspector.get_table_names())
+        missing = []
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            missing.extend(index for index in sorted(table.indexes, key=lambda i: i.name)
+                           if index.name not in existing)
+        return missing
+
+    @staticmethod
+    def create_missing(engine, concurrently: bool = True) -> list:
+        """
+        Створює відсутні індекси по одному. На PostgreSQL — CREATE INDEX CONCURRENTLY
+        поза транзакцією, щоб не блокувати запис у таблиці на живій БД.
+        """
+        created = []
+        concurrent = concurrently and engine.dialect.name == 'postgresql'
+        connection_options = {'isolation_level': 'AUTOCOMMIT'} if concurrent else {}
+
+        for index in IndexManager.missing_indexes(engine):
+            with engine.connect().execution_options(**connection_options) as connection:
+                if concurrent:
+                    index.dialect_options['postgresql']['concurrently'] = True
+                try:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+                finally:
+                    if concurrent:
+                        index.dialect_options['postgresql']['concurrently'] = False
+                if not concurrent:
+                    connection.commit()
+            created.append(index.name)
+        return created
+
+
+@click.command('create-indexes')
+@click.option('--dry-run', is_flag=True, help='Only list the indexes that are missing.')
+@click.option('--no-concurrently', is_flag=True, help='Use plain CREATE INDEX (locks writes on PostgreSQL).')
+@with_appcontext
+def create_indexes_command(dry_run, no_concurrently):
+    """Create the model indexes that are missing in the database."""
+    if dry_run:
+        names = [index.name for index in IndexManager.missing_indexes(db.engine)]
+    else:
+        names = IndexManager.create_missing(db.engine, concurrently=not no_concurrently)
+
+    if not names:
+        click.echo('All indexes are in place.')
+    for name in names:
+        click.echo(f"{'missing' if dry_run else 'created'}: {name}")
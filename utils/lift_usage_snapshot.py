@@ -0,0 +1,242 @@
+import datetime
+import threading
+import time
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from models import db
+from models.lift_usage import LiftUsage
+
+try:
+    import numpy as np
+except ImportError:  # Колонкова аналітика — необов'язкова залежність, без неї звіти працюють через SQL
+    np = None
+
+# Скільки рядків lift_usage читати з БД за один прохід під час завантаження знімка
+SNAPSHOT_BATCH_SIZE = 50000
+
+# Страховка для записів, зроблених в обхід цього процесу: після цього часу знімок звіряє кількість рядків
+SNAPSHOT_MAX_AGE = 300
+
+# День 0 для номерів днів у знімку
+_EPOCH = datetime.date(2000, 1, 1).toordinal()
+
+# Колонки знімка та їх типи: 6 чисел (20 байт) на поїздку замість ORM-об'єкта
+COLUMNS = (
+    ('id', 'int64'),
+    ('client_id', 'int32'),
+    ('lift_id', 'int32'),
+    ('day', 'int32'),
+    ('start_minute', 'int16'),
+    ('end_minute', 'int16'),
+)
+
+
+def day_number(value) -> int:
+    """Дата -> номер дня у знімку."""
+    return value.toordinal() - _EPOCH
+
+
+def _minute(value) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _counts_by(keys) -> dict:
+    """{ключ: кількість} для невід'ємних цілих ключів (bincount замість GROUP BY)."""
+    if not len(keys):
+        return {}
+    counts = np.bincount(keys)
+    present = np.flatnonzero(counts)
+    return dict(zip(present.tolist(), counts[present].tolist()))
+
+
+class LiftUsageSnapshot:
+    """
+    Колонковий знімок lift_usage у масивах NumPy для аналітичних запитів
+    (поїздки за підйомниками й годинами, дні відвідувань, топ клієнтів):
+    групування та підрахунок виконуються векторно, без нового SQL на кожне питання.
+
+    Знімок оновлюється інкрементально — дочитуються рядки з id, більшим за завантажений.
+    Зміна чи видалення наявних поїздок у цьому процесі позначає знімок для повного перезавантаження.
+    """
+
+    _lock = threading.Lock()
+    _columns = None
+    _needs_reload = True
+    _has_new = False
+    _refreshed_at = 0.0
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @staticmethod
+    def refresh(force=False) -> dict:
+        """Актуалізує знімок і повертає його колонки {назва: масив}."""
+        if np is None:
+            raise RuntimeError('NumPy is not installed: the columnar lift analytics backend is unavailable.')
+
+        with LiftUsageSnapshot._lock:
+            columns = LiftUsageSnapshot._columns
+            stale = time.monotonic() - LiftUsageSnapshot._refreshed_at >= SNAPSHOT_MAX_AGE
+
+            if force or columns is None or LiftUsageSnapshot._needs_reload:
+                columns = LiftUsageSnapshot._load()
+            elif LiftUsageSnapshot._has_new or stale:
+                max_id = int(columns['id'][-1]) if len(columns['id']) else 0
+                added = LiftUsageSnapshot._load(max_id)
+                columns = {name: np.concatenate((columns[name], added[name])) for name, _ in COLUMNS}
+                if stale and db.session.query(func.count(LiftUsage.id)).scalar() != len(columns['id']):
+                    # Рядки видалено в іншому процесі — інкрементом це не виправити
+                    columns = LiftUsageSnapshot._load()
+
+            LiftUsageSnapshot._columns = columns
+            LiftUsageSnapshot._needs_reload = LiftUsageSnapshot._has_new = False
+            LiftUsageSnapshot._refreshed_at = time.monotonic()
+            return columns
+
+    @staticmethod
+    def _load(after_id=0) -> dict:
+        stmt = select(
+            LiftUsage.id, LiftUsage.client_id, LiftUsage.lift_id,
+            LiftUsage.usage_date, LiftUsage.usage_time_start, LiftUsage.usage_time_end
+        ).where(LiftUsage.id > after_id).order_by(LiftUsage.id)
+
+        parts = {name: [] for name, _ in COLUMNS}
+        result = db.session.execute(stmt.execution_options(yield_per=SNAPSHOT_BATCH_SIZE))
+        for batch in result.partitions():
+            ids, client_ids, lift_ids, dates, starts, ends = zip(*batch)
+            parts['id'].append(np.array(ids, dtype=np.int64))
+            parts['client_id'].append(np.array(client_ids, dtype=np.int32))
+            parts['lift_id'].append(np.array(lift_ids, dtype=np.int32))
+            parts['day'].append(np.fromiter(map(day_number, dates), dtype=np.int32, count=len(dates)))
+            parts['start_minute'].append(np.fromiter(map(_minute, starts), dtype=np.int16, count=len(starts)))
+            parts['end_minute'].append(np.fromiter(map(_minute, ends), dtype=np.int16, count=len(ends)))
+
+        return {name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+                for name, dtype in COLUMNS}
+
+    @staticmethod
+    def invalidate(reload=True) -> None:
+        with LiftUsageSnapshot._lock:
+            if reload:
+                LiftUsageSnapshot._needs_reload = True
+            else:
+                LiftUsageSnapshot._has_new = True
+
+    @staticmethod
+    def reset() -> None:
+        """Звільняє пам'ять знімка; наступний запит завантажить його заново."""
+        with LiftUsageSnapshot._lock:
+            LiftUsageSnapshot._columns = None
+            LiftUsageSnapshot._needs_reload = True
+
+    @staticmethod
+    def _selected(start_date=None, end_date=None):
+        """Колонки та маска поїздок з інклюзивного періоду (межі необов'язкові)."""
+        columns = LiftUsageSnapshot.refresh()
+        mask = np.ones(len(columns['id']), dtype=bool)
+        if start_date:
+            mask &= columns['day'] >= day_number(start_date)
+        if end_date:
+            mask &= columns['day'] <= day_number(end_date)
+        return columns, mask
+
+    # --- Аналітичні запити ---
+
+    @staticmethod
+    def rides_by_lift(start_date=None, end_date=None) -> dict:
+        """{lift_id: кількість поїздок} за період."""
+        columns, mask = LiftUsageSnapshot._selected(start_date, end_date)
+        return _counts_by(columns['lift_id'][mask])
+
+    @staticmethod
+    def rides_by_client(start_date=None, end_date=None) -> dict:
+        """{client_id: кількість поїздок} за період."""
+        columns, mask = LiftUsageSnapshot._selected(start_date, end_date)
+        return _counts_by(columns['client_id'][mask])
+
+    @staticmethod
+    def rides_by_lift_hour(start_date=None, end_date=None) -> dict:
+        """{lift_id: [поїздки о 0:00, 1:00, ..., 23:00]} за годиною початку поїздки."""
+        columns, mask = LiftUsageSnapshot._selected(start_date, end_date)
+        lift_ids = columns['lift_id'][mask].astype(np.int64)
+        if not len(lift_ids):
+            return {}
+        hours = columns['start_minute'][mask] // 60
+        grid = np.bincount(lift_ids * 24 + hours, minlength=(int(lift_ids.max()) + 1) * 24).reshape(-1, 24)
+        present = np.flatnonzero(grid.sum(axis=1))
+        return {lift_id: grid[lift_id].tolist() for lift_id in present.tolist()}
+
+    @staticmethod
+    def visit_days_by_client(start_date=None, end_date=None) -> dict:
+        """{client_id: кількість різних днів з поїздками} за період."""
+        columns, mask = LiftUsageSnapshot._selected(start_date, end_date)
+        client_ids = columns['client_id'][mask].astype(np.int64)
+        if not len(client_ids):
+            return {}
+        days = columns['day'][mask].astype(np.int64)
+        first_day = days.min()
+        span = int(days.max() - first_day) + 1
+        # Одна пара (клієнт, день) -> одне ціле число; унікальні пари = дні відвідувань
+        visits = np.unique(client_ids * span + (days - first_day))
+        return _counts_by(visits // span)
+
+    @staticmethod
+    def top_clients(limit=10, start_date=None, end_date=None) -> list:
+        """[(client_id, поїздки)] — найактивніші клієнти, за спаданням кількості поїздок."""
+        counts = LiftUsageSnapshot.rides_by_client(start_date, end_date)
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    @staticmethod
+    def duration_histogram(bucket_minutes=5, start_date=None, end_date=None) -> list:
+        """[(початок кошика у хвилинах, кількість поїздок)] — розподіл тривалості поїздок."""
+        columns, mask = LiftUsageSnapshot._selected(start_date, end_date)
+        durations = columns['end_minute'][mask].astype(np.int32) - columns['start_minute'][mask]
+        if not len(durations):
+            return []
+        counts = np.bincount(np.clip(durations, 0, None) // bucket_minutes)
+        return [(bucket * bucket_minutes, count) for bucket, count in enumerate(counts.tolist())]
+
+
+# Як і кеш звітів, знімок дізнається про зміни з подій сесії: нові рядки дочитуються
+# інкрементом, а змінені чи видалені вимагають повного перезавантаження після коміту.
+
+@event.listens_for(Session, 'after_flush')
+def _note_flushed_lift_usage(session, flush_context):
+    if any(isinstance(obj, LiftUsage) for obj in session.new):
+        session.info['lift_snapshot_new'] = True
+    if any(isinstance(obj, LiftUsage) for obj in (*session.dirty, *session.deleted)):
+        session.info['lift_snapshot_reload'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _note_bulk_lift_usage(orm_execute_state):
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is None or table.name != LiftUsage.__tablename__:
+        return
+    if orm_execute_state.is_insert:
+        orm_execute_state.session.info['lift_snapshot_new'] = True
+    elif orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['lift_snapshot_reload'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _refresh_flags_on_commit(session):
+    if session.info.pop('lift_snapshot_reload', False):
+        LiftUsageSnapshot.invalidate(reload=True)
+    if session.info.pop('lift_snapshot_new', False):
+        LiftUsageSnapshot.invalidate(reload=False)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_lift_usage_writes(session):
+    session.info.pop('lift_snapshot_new', None)
+    session.info.pop('lift_snapshot_reload', None)
+
+
+@event.listens_for(db.metadata, 'after_create')
+@event.listens_for(db.metadata, 'after_drop')
+def _reset_on_schema_change(target, connection, **kw):
+    LiftUsageSnapshot.reset()
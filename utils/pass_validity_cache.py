@@ -0,0 +1,128 @@
+import datetime
+import threading
+import time
+
+from sqlalchemy import event, select
+
+from models import db
+from models.pass_type import PassType
+from models.passes import Pass
+
+# Страховка для змін, зроблених в обхід цього процесу (інший воркер, ручний SQL):
+# старіший запис перечитується з БД при наступній перевірці
+PASS_CACHE_MAX_AGE = 60
+
+# Скільки абонементів читати з БД за один прохід під час прогріву
+PASS_CACHE_BATCH_SIZE = 10000
+
+
+class PassValidity:
+    """Компактний запис кешу: лише поля, потрібні для перевірки проходу (без ORM-об'єкта)."""
+
+    __slots__ = ('client_id', 'valid_from', 'valid_to', 'remaining_lifts', 'remaining_hours',
+                 'limit_lifts', 'limit_hours', 'loaded_at')
+
+    def __init__(self, client_id, valid_from, valid_to, remaining_lifts, remaining_hours, limit_lifts, limit_hours):
+        self.client_id = client_id
+        self.valid_from = valid_from
+        self.valid_to = valid_to
+        self.remaining_lifts = remaining_lifts
+        self.remaining_hours = remaining_hours
+        self.limit_lifts = limit_lifts
+        self.limit_hours = limit_hours
+        self.loaded_at = time.monotonic()
+
+    def is_valid_on(self, day) -> bool:
+        return self.valid_from <= day <= self.valid_to
+
+
+def _validity_query():
+    return select(Pass.id, Pass.client_id, Pass.valid_from, Pass.valid_to, Pass.remaining_lifts,
+                  Pass.remaining_hours, PassType.limit_lifts, PassType.limit_hours) \
+        .join(PassType, Pass.pass_type_id == PassType.id)
+
+
+class PassValidityCache:
+    """
+    Кеш придатності абонементів за id для перевірки на турнікеті: перевірка — пошук у словнику,
+    БД читається лише при промаху. Прогрівається на старті дійсними абонементами; сервіси,
+    що змінюють абонементи (PassService, PassLiftUsageService, PassRentalUsageService,
+    PassTypeService, GateScanService), оновлюють або скидають записи після коміту.
+
+    Промах, що читав БД одночасно зі зміною абонемента, свій результат не зберігає —
+    для цього кожна зміна збільшує лічильник поколінь.
+    """
+
+    _lock = threading.Lock()
+    _entries = {}
+    _generation = 0
+
+    @staticmethod
+    def get(pass_id):
+        """PassValidity абонемента або None, якщо його немає в БД."""
+        pass_id = int(pass_id)
+        entry = PassValidityCache._entries.get(pass_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < PASS_CACHE_MAX_AGE:
+            return entry
+
+        generation = PassValidityCache._generation
+        row = db.session.execute(_validity_query().where(Pass.id == pass_id)).first()
+        if row is None:
+            return None
+        entry = PassValidity(*row[1:])
+        with PassValidityCache._lock:
+            if PassValidityCache._generation == generation:
+                PassValidityCache._entries[pass_id] = entry
+        return entry
+
+    @staticmethod
+    def warm(today=None) -> int:
+        """Завантажує всі абонементи, що діють сьогодні або пізніше. Повертає кількість записів."""
+        today = today or datetime.date.today()
+        generation = PassValidityCache._generation
+        stmt = _validity_query().where(Pass.valid_to >= today)
+        entries = {}
+        for batch in db.session.execute(stmt.execution_options(yield_per=PASS_CACHE_BATCH_SIZE)).partitions():
+            for row in batch:
+                entries[row[0]] = PassValidity(*row[1:])
+        with PassValidityCache._lock:
+            if PassValidityCache._generation == generation:
+                PassValidityCache._entries.update(entries)
+        return len(entries)
+
+    @staticmethod
+    def set_remaining_lifts(pass_id, remaining_lifts) -> None:
+        """Залишок підйомів після списання, повернутий самим UPDATE (див. GateScanService)."""
+        with PassValidityCache._lock:
+            PassValidityCache._generation += 1
+            entry = PassValidityCache._entries.get(int(pass_id))
+            if entry is not None:
+                entry.remaining_lifts = remaining_lifts
+
+    @staticmethod
+    def invalidate(*pass_ids) -> None:
+        with PassValidityCache._lock:
+            PassValidityCache._generation += 1
+            for pass_id in pass_ids:
+                PassValidityCache._entries.pop(int(pass_id), None)
+
+    @staticmethod
+    def clear() -> None:
+        with PassValidityCache._lock:
+            PassValidityCache._generation += 1
+            PassValidityCache._entries.clear()
+
+    @staticmethod
+    def generation() -> int:
+        """Лічильник змін кешу: дозволяє помітити зміну між читанням запису і його використанням."""
+        return PassValidityCache._generation
+
+    @staticmethod
+    def size() -> int:
+        return len(PassValidityCache._entries)
+
+
+@event.listens_for(db.metadata, 'after_create')
+@event.listens_for(db.metadata, 'after_drop')
+def _clear_on_schema_change(target, connection, **kw):
+    PassValidityCache.clear()
@@ -1,8 +1,126 @@
+import base64
 import datetime
+import enum
+import functools
+import json
+import operator
+
 from models import db
+from sqlalchemy import Column, MetaData, Table, and_, or_, false, bindparam, select, inspect as sa_inspect
 from sqlalchemy.orm import Query
 from sqlalchemy.exc import ArgumentError
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+# Списки для 'in', довші за цей поріг, йдуть у запит через тимчасову таблицю, а не параметрами
+IN_TEMP_TABLE_THRESHOLD = 1000
+
+
+def _coerce_int(val_str):
+    return int(val_str)
+
+
+def _coerce_date(val_str):
+    return datetime.datetime.strptime(val_str, "%Y-%m-%d").date()
+
+
+def _coerce_time(val_str):
+    return datetime.datetime.strptime(val_str, "%H:%M").time()
+
+
+def _coerce_bool(val_str):
+    return val_str.lower() in ('true', '1', 'yes', 'on')
+
+
+def _coerce_str(val_str):
+    return val_str
+
+
+def _like_pattern(val_str):
+    return f'%{val_str}%'
+
+
+def _split_values(val_str, commas=True):
+    """
+    Розбиває значення фільтра 'in' ("1, 2, 3" або список з нового рядка) на окремі елементи.
+    Для текстових колонок (commas=False) кома — частина значення: роздільник лише новий рядок,
+    а кілька значень передаються ще й повтореними filter_val.
+    """
+    parts = val_str.replace('\n', ',').split(',') if commas else val_str.splitlines()
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _is_text(col_type) -> bool:
+    # Enum у SQLAlchemy — підклас String, але його значення ком не містять
+    return isinstance(col_type, db.String) and not isinstance(col_type, db.Enum)
+
+
+_COMPARISONS = {
+    'eq': operator.eq,
+    'neq': operator.ne,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+}
+
+
+class _ColumnSpec:
+    """Колонка моделі разом із заздалегідь обраним перетворювачем значень."""
+    __slots__ = ('col', 'coerce')
+
+    def __init__(self, col, coerce):
+        self.col = col
+        self.coerce = coerce
+
+
+class _FilterStep:
+    """
+    Один крок скомпільованого плану фільтрації.
+    Для 'in' кілька однакових фільтрів (повторені filter_val) зливаються в один крок.
+    """
+    __slots__ = ('indexes', 'key', 'coerce', 'clause', 'col', 'many')
+
+    def __init__(self, indexes, key, coerce, clause, col, many=False):
+        self.indexes = indexes
+        self.key = key
+        self.coerce = coerce
+        self.clause = clause
+        self.col = col
+        self.many = many
+
+
+# Тимчасові таблиці для довгих списків 'in'; живуть у межах з'єднання з БД
+_temp_metadata = MetaData()
+
+
+class Page:
+    """
+    Одна сторінка результатів keyset-пагінації.
+    Ітерується як звичайний список, тому шаблони можуть працювати з нею без змін.
+    """
+
+    def __init__(self, items, page_size, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
 
 class QueryHelper:
     """
@@ -10,69 +128,174 @@ class QueryHelper:
     сортування та фільтрації до запитів SQLAlchemy.
     """
 
+    # Реєстр колонок: модель -> {ім'я колонки: _ColumnSpec}. Будується один раз при старті.
+    _registry = {}
+    # Індекси пошуку підрядка: (модель, колонка) -> функція, що будує умову за шаблоном LIKE
+    _text_indexes = {}
+
     @staticmethod
-    def _get_column(models_map: dict, col_name: str):
+    def _coercer_for(col_type):
+        """Обирає функцію перетворення рядка з форми у значення потрібного типу."""
+        if isinstance(col_type, db.Integer):
+            return _coerce_int
+        if isinstance(col_type, db.Date):
+            return _coerce_date
+        if isinstance(col_type, db.Time):
+            return _coerce_time
+        if isinstance(col_type, db.Boolean):
+            return _coerce_bool
+        return _coerce_str
+
+    @staticmethod
+    def register_models(models) -> None:
         """
-        Безпечно отримує атрибут колонки з однієї або кількох моделей.
+        Будує реєстр колонок і перетворювачів для переданих моделей.
+        Викликається один раз при старті застосунку.
         """
+        for model_class in models:
+            columns = {}
+            for attr in sa_inspect(model_class).column_attrs:
+                col = getattr(model_class, attr.key)
+                columns[attr.key] = _ColumnSpec(col, QueryHelper._coercer_for(col.type))
+            QueryHelper._registry[model_class] = columns
+
+    @staticmethod
+    def _model_columns(model_class) -> dict:
+        columns = QueryHelper._registry.get(model_class)
+        if columns is None:
+            QueryHelper.register_models([model_class])
+            columns = QueryHelper._registry[model_class]
+        return columns
+
+    @staticmethod
+    def _get_spec(models_map: dict, col_name: str):
         for model_class in models_map.values():
-            if hasattr(model_class, col_name):
-                col = getattr(model_class, col_name)
-                if hasattr(col, 'type'):
-                    return col
+            spec = QueryHelper._model_columns(model_class).get(col_name)
+            if spec is not None:
+                return spec
         return None
 
     @staticmethod
-    def apply_filters(query: Query, models_map: dict, filter_cols: list, filter_ops: list, filter_vals: list) -> Query:
+    def _get_column(models_map: dict, col_name: str):
         """
-        Застосовує список фільтрів до об'єкта Query.
+        Безпечно отримує атрибут колонки з однієї або кількох моделей.
         """
-        if not all([filter_cols, filter_ops, filter_vals]) or \
-                len(filter_cols) != len(filter_ops) or len(filter_ops) != len(filter_vals):
-            return query
+        spec = QueryHelper._get_spec(models_map, col_name)
+        return spec.col if spec is not None else None
 
-        for col_name, op, val_str in zip(filter_cols, filter_ops, filter_vals):
-            col = QueryHelper._get_column(models_map, col_name)
+    @staticmethod
+    def register_text_index(model_class, col_name: str, condition) -> None:
+        """Реєструє індексований шлях для фільтра 'like' по колонці (див. utils.text_search)."""
+        QueryHelper._text_indexes[(model_class, col_name)] = condition
+        QueryHelper.compile_filter_plan.cache_clear()
 
-            if col is None:
+    @staticmethod
+    def contains(col, pattern):
+        """
+        Умова "колонка містить підрядок" без урахування регістру.
+        Якщо для колонки є індекс пошуку, умова йде через нього, інакше — звичайний ILIKE.
+        """
+        condition = QueryHelper._text_indexes.get((col.class_, col.key))
+        return condition(pattern) if condition else col.ilike(pattern)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def compile_filter_plan(models: tuple, filter_cols: tuple, filter_ops: tuple) -> tuple:
+        """
+        Компілює сигнатуру фільтрів (моделі, колонки, оператори) у план —
+        кортеж _FilterStep з виразами на bindparam.
+        Результат кешується, тож на запит лишається тільки підставити значення.
+        """
+        models_map = {model_class.__name__: model_class for model_class in models}
+        plan = []
+        in_steps = {}
+        for index, (col_name, op) in enumerate(zip(filter_cols, filter_ops)):
+            spec = QueryHelper._get_spec(models_map, col_name)
+            if spec is None:
                 continue
 
-            val = None
+            col = spec.col
+            key = f'qh_filter_{index}'
             try:
-                if isinstance(col.type, db.Integer):
-                    val = int(val_str)
-                elif isinstance(col.type, db.Date):
-                    val = datetime.datetime.strptime(val_str, "%Y-%m-%d").date()
-                elif isinstance(col.type, db.Time):
-                    val = datetime.datetime.strptime(val_str, "%H:%M").time()
-                elif isinstance(col.type, db.Boolean):
-                    val = val_str.lower() in ('true', '1', 'yes', 'on')
-                elif isinstance(col.type, db.Enum):
-                    val = val_str
+                if op in _COMPARISONS:
+                    step = _FilterStep((index,), key, spec.coerce, _COMPARISONS[op](col, bindparam(key, type_=col.type)), col)
+                elif op == 'like' and isinstance(col.type, db.String):
+                    clause = QueryHelper.contains(col, bindparam(key, type_=col.type))
+                    step = _FilterStep((index,), key, _like_pattern, clause, col)
+                elif op == 'in':
+                    if col_name in in_steps:
+                        # Повторений фільтр по тій самій колонці лише додає значення до списку
+                        in_steps[col_name].indexes += (index,)
+                        continue
+                    clause = col.in_(bindparam(key, type_=col.type, expanding=True))
+                    step = in_steps[col_name] = _FilterStep((index,), key, spec.coerce, clause, col, many=True)
                 else:
-                    val = val_str
-            except (ValueError, TypeError):
+                    continue
+            except ArgumentError:
                 continue
+            plan.append(step)
+        return tuple(plan)
 
+    @staticmethod
+    def _coerce_many(coerce, raw_values: list) -> list:
+        """Перетворює елементи списку 'in', відкидаючи некоректні та дублікати."""
+        values = {}
+        for raw in raw_values:
             try:
-                if op == 'eq':
-                    query = query.filter(col == val)
-                elif op == 'neq':
-                    query = query.filter(col != val)
-                elif op == 'gt':
-                    query = query.filter(col > val)
-                elif op == 'gte':
-                    query = query.filter(col >= val)
-                elif op == 'lt':
-                    query = query.filter(col < val)
-                elif op == 'lte':
-                    query = query.filter(col <= val)
-                elif op == 'like' and isinstance(col.type, db.String):
-                    query = query.filter(col.ilike(f'%{val}%'))
-                elif op == 'in' and isinstance(col.type, db.String):
-                    query = query.filter(col == val)
-            except ArgumentError:
+                values[coerce(raw)] = None
+            except (ValueError, TypeError, AttributeError):
                 continue
+        return list(values)
+
+    @staticmethod
+    def _values_table(session, step: _FilterStep, values: list) -> Table:
+        """
+        Заповнює тимчасову таблицю значеннями довгого списку 'in'.
+        Таблиця створюється один раз на з'єднання і очищується перед кожним використанням.
+        """
+        name = f'{step.key}_{type(step.col.type).__name__.lower()}'
+        table = _temp_metadata.tables.get(name)
+        if table is None:
+            table = Table(name, _temp_metadata, Column('value', step.col.type, primary_key=True),
+                          prefixes=['TEMPORARY'], postgresql_on_commit='DELETE ROWS')
+
+        table.create(session.connection(), checkfirst=True)
+        session.execute(table.delete())
+        session.execute(table.insert(), [{'value': value} for value in values])
+        return table
+
+    @staticmethod
+    def apply_filters(query: Query, models_map: dict, filter_cols: list, filter_ops: list, filter_vals: list) -> Query:
+        """
+        Застосовує список фільтрів до об'єкта Query.
+        """
+        if not all([filter_cols, filter_ops, filter_vals]) or \
+                len(filter_cols) != len(filter_ops) or len(filter_ops) != len(filter_vals):
+            return query
+
+        plan = QueryHelper.compile_filter_plan(tuple(models_map.values()), tuple(filter_cols), tuple(filter_ops))
+        values = {}
+        for step in plan:
+            if step.many:
+                commas = not _is_text(step.col.type)
+                raw_values = [raw for index in step.indexes
+                              for raw in _split_values(str(filter_vals[index]), commas)]
+                value = QueryHelper._coerce_many(step.coerce, raw_values)
+                if not value:
+                    continue
+                if len(value) > IN_TEMP_TABLE_THRESHOLD and not isinstance(step.col.type, db.Enum):
+                    table = QueryHelper._values_table(query.session, step, value)
+                    query = query.filter(step.col.in_(select(table.c.value)))
+                    continue
+            else:
+                try:
+                    value = step.coerce(filter_vals[step.indexes[0]])
+                except (ValueError, TypeError, AttributeError):
+                    continue
+            values[step.key] = value
+            query = query.filter(step.clause)
+        if values:
+            query = query.params(values)
         return query
 
     @staticmethod
@@ -89,13 +312,258 @@ class QueryHelper:
                     query = query.order_by(col.asc())
         return query
 
+    # --- Keyset-пагінація ---
+
+    @staticmethod
+    def _keyset_columns(models_map: dict, sort_by: str):
+        """
+        Повертає колонки ключа сторінки: активна колонка сортування
+        плюс первинний ключ першої моделі як tie-breaker.
+        """
+        base_model = next(iter(models_map.values()))
+        pk_cols = [getattr(base_model, c.key) for c in sa_inspect(base_model).primary_key]
+
+        sort_col = QueryHelper._get_column(models_map, sort_by) if sort_by else None
+        if sort_col is None:
+            return pk_cols
+        return [sort_col] + [pk for pk in pk_cols if pk is not sort_col]
+
+    @staticmethod
+    def _keyset_parts(key_cols: list):
+        """
+        Розкладає ключ на частини ('null', col) / ('value', col).
+        Для nullable-колонок додається прапорець IS NULL, щоб NULL-и мали стабільне місце в порядку.
+        """
+        parts = []
+        for col in key_cols:
+            if getattr(col, 'nullable', False):
+                parts.append(('null', col))
+            parts.append(('value', col))
+        return parts
+
+    @staticmethod
+    def _part_order(part, ascending: bool):
+        kind, col = part
+        expr = col.is_(None) if kind == 'null' else col
+        return expr.asc() if ascending else expr.desc()
+
+    @staticmethod
+    def _part_after(part, value, ascending: bool):
+        """Умова 'рядок строго після value' для однієї частини ключа (або None, якщо таких немає)."""
+        kind, col = part
+        if kind == 'null':
+            if ascending:
+                return None if value else col.is_(None)
+            return col.isnot(None) if value else None
+        if value is None:
+            return None
+        return col > value if ascending else col < value
+
+    @staticmethod
+    def _part_equal(part, value):
+        kind, col = part
+        if kind == 'null':
+            return col.is_(None) if value else col.isnot(None)
+        return col.is_(None) if value is None else col == value
+
+    @staticmethod
+    def _keyset_condition(parts: list, values: list, ascending: bool):
+        """
+        Лексикографічна умова (k1, k2, ...) > (v1, v2, ...) з урахуванням напрямку.
+        Розгорнута у OR/AND, щоб не залежати від підтримки row values у СУБД.
+        """
+        terms = []
+        prefix = []
+        for part, value in zip(parts, values):
+            after = QueryHelper._part_after(part, value, ascending)
+            if after is not None:
+                terms.append(and_(*prefix, after))
+            prefix.append(QueryHelper._part_equal(part, value))
+        return or_(*terms) if terms else false()
+
+    @staticmethod
+    def _row_value(row, col):
+        """Дістає значення колонки з рядка результату (модель або кортеж моделей)."""
+        owner = getattr(col, 'class_', None)
+        if owner is not None and isinstance(row, owner):
+            return getattr(row, col.key)
+        if isinstance(row, tuple):
+            for entity in row:
+                if owner is not None and isinstance(entity, owner):
+                    return getattr(entity, col.key)
+        return getattr(row, col.key)
+
+    @staticmethod
+    def _part_values(key_cols: list, key_values: list):
+        """Перетворює значення колонок ключа у значення частин (з прапорцями IS NULL)."""
+        values = []
+        for col, value in zip(key_cols, key_values):
+            if getattr(col, 'nullable', False):
+                values.append(value is None)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.date, datetime.time, datetime.datetime)):
+            return value.isoformat()
+        if isinstance(value, enum.Enum):
+            return value.name
+        return value
+
+    @staticmethod
+    def _decode_value(col, raw):
+        if raw is None:
+            return None
+        col_type = col.type
+        if isinstance(col_type, db.DateTime):
+            return datetime.datetime.fromisoformat(raw)
+        if isinstance(col_type, db.Date):
+            return datetime.date.fromisoformat(raw)
+        if isinstance(col_type, db.Time):
+            return datetime.time.fromisoformat(raw)
+        if isinstance(col_type, db.Enum) and col_type.enum_class is not None:
+            return col_type.enum_class[raw]
+        if isinstance(col_type, db.Integer):
+            return int(raw)
+        if isinstance(col_type, db.Float):
+            return float(raw)
+        return raw
+
+    @staticmethod
+    def _sort_signature(key_cols: list, sort_order: str) -> str:
+        names = ','.join(f'{col.class_.__name__}.{col.key}' for col in key_cols)
+        return f"{names}:{'desc' if sort_order == 'desc' else 'asc'}"
+
+    @staticmethod
+    def _encode_cursor(key_cols: list, sort_order: str, row, direction: str) -> str:
+        payload = {
+            's': QueryHelper._sort_signature(key_cols, sort_order),
+            'd': direction,
+            'k': [QueryHelper._encode_value(QueryHelper._row_value(row, col)) for col in key_cols],
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(key_cols: list, sort_order: str, cursor: str):
+        """
+        Повертає (direction, key_values) або None, якщо курсор пошкоджений
+        чи створений для іншого сортування.
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if payload.get('s') != QueryHelper._sort_signature(key_cols, sort_order):
+                return None
+            direction = payload['d']
+            raw_values = payload['k']
+            if direction not in ('next', 'prev') or len(raw_values) != len(key_cols):
+                return None
+            values = [QueryHelper._decode_value(col, raw) for col, raw in zip(key_cols, raw_values)]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+        return direction, values
+
+    @staticmethod
+    def paginate(query: Query, models_map: dict, sort_by: str = None, sort_order: str = 'asc',
+                 cursor: str = None, page_size: int = DEFAULT_PAGE_SIZE) -> Page:
+        """
+        Keyset-пагінація: сортує за активною колонкою + первинним ключем і
+        продовжує з позиції курсора через WHERE, а не OFFSET, тому вартість
+        сторінки не залежить від її глибини.
+        """
+        page_size = max(1, min(int(page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        ascending = sort_order != 'desc'
+
+        key_cols = QueryHelper._keyset_columns(models_map, sort_by)
+        parts = QueryHelper._keyset_parts(key_cols)
+
+        decoded = QueryHelper._decode_cursor(key_cols, sort_order, cursor) if cursor else None
+        direction = decoded[0] if decoded else 'next'
+        scan_ascending = ascending if direction == 'next' else not ascending
+
+        if decoded:
+            values = QueryHelper._part_values(key_cols, decoded[1])
+            query = query.filter(QueryHelper._keyset_condition(parts, values, scan_ascending))
+
+        query = query.order_by(*[QueryHelper._part_order(part, scan_ascending) for part in parts])
+        rows = query.limit(page_size + 1).all()
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == 'prev':
+            rows.reverse()
+
+        next_cursor = prev_cursor = None
+        if rows:
+            has_next = has_more if direction == 'next' else True
+            has_prev = decoded is not None if direction == 'next' else has_more
+            if has_next:
+                next_cursor = QueryHelper._encode_cursor(key_cols, sort_order, rows[-1], 'next')
+            if has_prev:
+                prev_cursor = QueryHelper._encode_cursor(key_cols, sort_order, rows[0], 'prev')
+
+        return Page(rows, page_size, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+    @staticmethod
+    def project(query: Query, models_map: dict, columns, sort_by: str = None) -> Query:
+        """
+        Вибирає лише перелічені колонки (with_entities) замість повних ORM-об'єктів:
+        рядки повертаються як легкі іменовані кортежі без identity map та інструментації.
+        Колонки ключа сторінки додаються автоматично, щоб курсори продовжували працювати.
+        """
+        selected = [QueryHelper._get_column(models_map, name) for name in columns]
+        selected = [col for col in selected if col is not None]
+        names = {col.key for col in selected}
+        for col in QueryHelper._keyset_columns(models_map, sort_by):
+            if col.key not in names:
+                selected.append(col)
+                names.add(col.key)
+        return query.with_entities(*selected)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def loader_options(model_class, policy: tuple) -> tuple:
+        """
+        Перетворює політику завантаження сервісу ((joinedload, 'pass_usage', 'pass_type'), ...)
+        на опції запиту. Будується ліниво, бо при імпорті сервісів маппери ще не сконфігуровані.
+        """
+        options = []
+        for strategy, *path in policy:
+            entity, option = model_class, None
+            for name in path:
+                attr = getattr(entity, name)
+                option = strategy(attr) if option is None else getattr(option, strategy.__name__)(attr)
+                entity = attr.property.mapper.class_
+            options.append(option)
+        return tuple(options)
+
+    @staticmethod
+    def model_columns(model_class, exclude=()) -> list:
+        """Повертає атрибути всіх колонок моделі (для проєкції при експорті)."""
+        return [getattr(model_class, attr.key) for attr in sa_inspect(model_class).column_attrs
+                if attr.key not in exclude]
+
+    @staticmethod
+    def stream(query: Query, columns: list, batch_size: int = EXPORT_BATCH_SIZE) -> Query:
+        """
+        Готує запит до потокового читання: лише потрібні колонки (без гідратації ORM-об'єктів)
+        і server-side курсор через yield_per, тож пам'ять не залежить від кількості рядків.
+        """
+        return query.with_entities(*columns).yield_per(batch_size)
+
     @staticmethod
     def get_all(model_class, sort_by=None, sort_order='asc',
                 filter_cols=None, filter_ops=None, filter_vals=None,  # Новий стиль
-                filter_by=None, filter_value=None):  # Старий стиль
+                filter_by=None, filter_value=None,  # Старий стиль
+                cursor=None, page_size=None, yield_per=None, columns=None):
         """
         Універсальний метод get_all, що підтримує обидва стилі фільтрації.
         Новий стиль (списки) має пріоритет, якщо надано.
+        Якщо передано page_size, повертає Page замість повного списку.
+        Якщо передано yield_per, повертає потоковий запит для експорту.
+        Якщо передано columns, рядки містять лише ці колонки (див. project).
         """
         query = model_class.query
         models_map = {model_class.__name__: model_class}
@@ -122,6 +590,13 @@ class QueryHelper:
 
         # Тепер ми гарантовано маємо або нові фільтри, або нічого
         query = QueryHelper.apply_filters(query, models_map, filter_cols, filter_ops, filter_vals)
+        if yield_per:
+            query = QueryHelper.apply_sorting(query, models_map, sort_by, sort_order)
+            return QueryHelper.stream(query, QueryHelper.model_columns(model_class), yield_per)
+        if columns:
+            query = QueryHelper.project(query, models_map, columns, sort_by)
+        if page_size:
+            return QueryHelper.paginate(query, models_map, sort_by, sort_order, cursor, page_size)
         query = QueryHelper.apply_sorting(query, models_map, sort_by, sort_order)
 
-        return query.all()
\ No newline at end of file
+        return query.all()
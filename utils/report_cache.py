@@ -0,0 +1,198 @@
+import datetime
+import functools
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db
+
+# Скільки результатів звітів тримати в пам'яті (найдавніше використані витісняються)
+REPORT_CACHE_SIZE = 256
+
+# Страховка для записів, зроблених в обхід цього процесу (інший воркер, ручний SQL)
+REPORT_CACHE_MAX_AGE = 300
+
+
+def _normalize(value):
+    """Приводить параметр звіту до канонічного вигляду для ключа кешу."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        # Наприклад, перелік вікон дат порівняльного звіту
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def _cache_key(fn, args, kwargs):
+    return (fn.__name__, tuple(_normalize(a) for a in args),
+            tuple(sorted((k, _normalize(v)) for k, v in kwargs.items())))
+
+
+def _written_tables(session):
+    tables = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, '__table__', None)
+        if table is not None:
+            tables.add(table.name)
+    return tables
+
+
+class ReportCache:
+    """
+    Кеш результатів методів ReportService. Ключ — назва звіту та нормалізовані параметри.
+    Кожен метод оголошує таблиці, які читає (@ReportCache.reads(...)); коміт сервісу,
+    що змінив будь-яку з них, збільшує її лічильник версії, і залежні записи кешу
+    перестають бути дійсними.
+    """
+
+    _lock = threading.Lock()
+    _entries = OrderedDict()  # key -> (версії таблиць, результат, час обчислення, коли обчислено)
+    _versions = defaultdict(int)
+    _stats = {'hits': 0, 'misses': 0, 'invalidated': 0, 'saved_seconds': 0.0}
+
+    @staticmethod
+    def reads(*tables):
+        """Декоратор методу ReportService: кешує результат до зміни будь-якої з таблиць."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                if has_request_context() and 'query_plans' in g:
+                    # Режим explain має побачити справжні запити
+                    return fn(self, *args, **kwargs)
+
+                key = _cache_key(fn, args, kwargs)
+                versions = ReportCache._current_versions(tables)
+                cached = ReportCache._lookup(key, versions)
+                if cached is not None:
+                    return cached
+
+                started = time.perf_counter()
+                result = fn(self, *args, **kwargs)
+                ReportCache._store(key, versions, result, time.perf_counter() - started)
+                return result
+
+            wrapper.report_tables = tables
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def ttl(seconds):
+        """
+        Декоратор для живих показників: кешує результат на seconds секунд незалежно від записів.
+        Таблиці таких показників змінюються щосекунди, тож версійна інвалідація скидала б кеш на кожному запиті.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                if has_request_context() and 'query_plans' in g:
+                    return fn(self, *args, **kwargs)
+
+                key = _cache_key(fn, args, kwargs)
+                cached = ReportCache._lookup(key, (), max_age=seconds)
+                if cached is not None:
+                    return cached
+
+                started = time.perf_counter()
+                result = fn(self, *args, **kwargs)
+                ReportCache._store(key, (), result, time.perf_counter() - started)
+                return result
+
+            wrapper.cache_ttl = seconds
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _current_versions(tables):
+        with ReportCache._lock:
+            return tuple(ReportCache._versions[name] for name in tables)
+
+    @staticmethod
+    def _lookup(key, versions, max_age=REPORT_CACHE_MAX_AGE):
+        with ReportCache._lock:
+            entry = ReportCache._entries.get(key)
+            if entry is not None:
+                entry_versions, result, cost, computed_at = entry
+                if entry_versions == versions and time.monotonic() - computed_at < max_age:
+                    ReportCache._entries.move_to_end(key)
+                    ReportCache._stats['hits'] += 1
+                    ReportCache._stats['saved_seconds'] += cost
+                    return result
+                del ReportCache._entries[key]
+                ReportCache._stats['invalidated'] += 1
+            ReportCache._stats['misses'] += 1
+            return None
+
+    @staticmethod
+    def _store(key, versions, result, cost):
+        with ReportCache._lock:
+            ReportCache._entries[key] = (versions, result, cost, time.monotonic())
+            ReportCache._entries.move_to_end(key)
+            while len(ReportCache._entries) > REPORT_CACHE_SIZE:
+                ReportCache._entries.popitem(last=False)
+
+    @staticmethod
+    def bump(*tables) -> None:
+        """Збільшує версії таблиць: усі записи кешу, що їх читають, стають недійсними."""
+        with ReportCache._lock:
+            for name in tables:
+                ReportCache._versions[name] += 1
+
+    @staticmethod
+    def clear() -> None:
+        with ReportCache._lock:
+            ReportCache._entries.clear()
+
+    @staticmethod
+    def stats() -> dict:
+        """Метрики кешу: влучання, промахи, інвалідації та зекономлений час."""
+        with ReportCache._lock:
+            stats = dict(ReportCache._stats, entries=len(ReportCache._entries))
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def reset_stats() -> None:
+        with ReportCache._lock:
+            ReportCache._stats.update(hits=0, misses=0, invalidated=0, saved_seconds=0.0)
+
+
+# Версії таблиць збільшуються на коміті сесії, у якій сервіс їх змінив.
+# Масові UPDATE/DELETE (Query.delete, update(...)) в session.new/dirty не потрапляють,
+# тож їх таблиці фіксуються окремо в do_orm_execute.
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    session.info.setdefault('report_cache_tables', set()).update(_written_tables(session))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            orm_execute_state.session.info.setdefault('report_cache_tables', set()).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_tables(session):
+    tables = session.info.pop('report_cache_tables', None)
+    if tables:
+        ReportCache.bump(*tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_tables(session):
+    session.info.pop('report_cache_tables', None)
+
+
+@event.listens_for(db.metadata, 'after_create')
+@event.listens_for(db.metadata, 'after_drop')
+def _clear_on_schema_change(target, connection, **kw):
+    ReportCache.clear()
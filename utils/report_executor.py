@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g, has_request_context
+
+from models import db
+
+# Потоки для підзапитів звітів на весь процес. Кожен потік бере власне з'єднання з пулу БД,
+# тож значення має лишатися помітно меншим за pool_size + max_overflow рушія.
+REPORT_WORKERS = 4
+
+
+def supports_concurrent_sessions(engine) -> bool:
+    """SQLite у пам'яті — одне спільне з'єднання на процес, з кількох потоків його використовувати не можна."""
+    return not (engine.url.get_backend_name() == 'sqlite' and engine.url.database in (None, '', ':memory:'))
+
+
+def _run_in_app_context(app, fn, args):
+    # Окремий контекст застосунку = окрема сесія Flask-SQLAlchemy (і з'єднання з пулу);
+    # після виходу з контексту сесія закривається, а з'єднання повертається в пул
+    with app.app_context():
+        return fn(*args)
+
+
+class ReportExecutor:
+    """
+    Виконує незалежні підзапити одного звіту паралельно на обмеженому пулі потоків,
+    щоб звіт із двох панелей займав max(q1, q2), а не q1 + q2.
+    """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    @staticmethod
+    def _get_pool():
+        with ReportExecutor._pool_lock:
+            if ReportExecutor._pool is None:
+                ReportExecutor._pool = ThreadPoolExecutor(max_workers=REPORT_WORKERS,
+                                                          thread_name_prefix='report')
+            return ReportExecutor._pool
+
+    @staticmethod
+    def _parallel_allowed() -> bool:
+        # Режим explain знімає плани у g поточного запиту, тож там підзапити йдуть послідовно
+        if not supports_concurrent_sessions(db.engine):
+            return False
+        return not (has_request_context() and 'query_plans' in g)
+
+    @staticmethod
+    def run(**calls) -> dict:
+        """
+        Приймає іменовані виклики name=(функція, *аргументи) і повертає {name: результат}
+        для передачі в шаблон. Виняток будь-якого підзапиту піднімається у викликаючому потоці.
+        """
+        if len(calls) < 2 or not ReportExecutor._parallel_allowed():
+            return {name: fn(*args) for name, (fn, *args) in calls.items()}
+
+        app = current_app._get_current_object()
+        pool = ReportExecutor._get_pool()
+        futures = {name: pool.submit(_run_in_app_context, app, fn, args)
+                   for name, (fn, *args) in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
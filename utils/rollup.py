@@ -0,0 +1,39 @@
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db
+
+# INSERT ... ON CONFLICT DO UPDATE для СУБД, що його підтримують
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def _where(model_class, key):
+    return [getattr(model_class, name) == value for name, value in key.items()]
+
+
+def apply_deltas(model_class, key, deltas, count_column) -> None:
+    """
+    Додає deltas ({колонка: приріст}) до рядка агрегату з ключем key у поточній транзакції.
+    Рядок створюється за потреби; рядок, у якого count_column впав до нуля, видаляється,
+    щоб кількість рядків агрегату відповідала кількості непорожніх клітинок.
+    """
+    increments = {name: getattr(model_class, name) + delta for name, delta in deltas.items()}
+
+    if deltas[count_column] < 0:
+        db.session.execute(update(model_class).where(*_where(model_class, key)).values(**increments))
+        db.session.execute(
+            delete(model_class).where(*_where(model_class, key), getattr(model_class, count_column) <= 0))
+        return
+
+    make_insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if make_insert is not None:
+        statement = make_insert(model_class).values(**key, **deltas)
+        db.session.execute(statement.on_conflict_do_update(index_elements=list(key), set_=increments))
+        return
+
+    result = db.session.execute(update(model_class).where(*_where(model_class, key)).values(**increments))
+    if result.rowcount == 0:
+        db.session.execute(insert(model_class).values(**key, **deltas))
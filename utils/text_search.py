@@ -0,0 +1,128 @@
+from sqlalchemy import event, select, text, column, table, inspect as sa_inspect
+from sqlalchemy.exc import DBAPIError
+
+from utils.query_helper import QueryHelper
+
+
+def _fts_name(table_name):
+    return f'{table_name}_fts'
+
+
+def _sqlite_ddl(table_name, pk_name, columns):
+    """FTS5-таблиця з триграмним токенізатором та тригери, що тримають її в синхроні з основною."""
+    fts = _fts_name(table_name)
+    cols = ', '.join(columns)
+    new_vals = ', '.join(f'new.{c}' for c in columns)
+    old_vals = ', '.join(f'old.{c}' for c in columns)
+    delete_row = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk_name}, {old_vals});"
+    insert_row = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk_name}, {new_vals});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table_name}', content_rowid='{pk_name}', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN {insert_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN {delete_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name} BEGIN {delete_row} {insert_row} END",
+    ]
+
+
+def _postgresql_ddl(table_name, pk_name, columns):
+    """GIN-індекси pg_trgm: ILIKE '%...%' використовує їх без змін у запиті."""
+    statements = ['CREATE EXTENSION IF NOT EXISTS pg_trgm']
+    for col in columns:
+        statements.append(f'CREATE INDEX IF NOT EXISTS ix_{table_name}_{col}_trgm '
+                          f'ON {table_name} USING gin ({col} gin_trgm_ops)')
+    return statements
+
+
+_DDL_BUILDERS = {
+    'sqlite': _sqlite_ddl,
+    'postgresql': _postgresql_ddl,
+}
+
+
+class TextSearch:
+    """
+    Індекси для пошуку підрядка ('like') у моделях з атрибутом __searchable__.
+    PostgreSQL: триграмні GIN-індекси (pg_trgm).
+    SQLite: FTS5-таблиця <table>_fts з токенізатором trigram, синхронізована тригерами.
+    """
+
+    @staticmethod
+    def searchable_models(models) -> list:
+        return [model_class for model_class in models if getattr(model_class, '__searchable__', None)]
+
+    @staticmethod
+    def _statements(model_class, dialect_name) -> list:
+        build = _DDL_BUILDERS.get(dialect_name)
+        if build is None:
+            return []
+        pk_name = sa_inspect(model_class).primary_key[0].name
+        return build(model_class.__tablename__, pk_name, model_class.__searchable__)
+
+    @staticmethod
+    def attach(models) -> None:
+        """
+        Прив'язує створення/видалення індексів до create_all/drop_all таблиць моделей.
+        Викликається до першого db.create_all().
+        """
+        for model_class in TextSearch.searchable_models(models):
+            def after_create(target, connection, model_class=model_class, **kw):
+                try:
+                    with connection.begin_nested():
+                        for statement in TextSearch._statements(model_class, connection.dialect.name):
+                            connection.execute(text(statement))
+                except DBAPIError:
+                    # Таблиця створюється і без індексу, пошук піде звичайним ILIKE
+                    pass
+
+            def before_drop(target, connection, model_class=model_class, **kw):
+                if connection.dialect.name == 'sqlite':
+                    connection.execute(text(f'DROP TABLE IF EXISTS {_fts_name(model_class.__tablename__)}'))
+
+            event.listen(model_class.__table__, 'after_create', after_create)
+            event.listen(model_class.__table__, 'before_drop', before_drop)
+
+    @staticmethod
+    def install(engine, models) -> None:
+        """
+        Створює індекси для вже існуючих таблиць (create_all їх не чіпає) і вмикає
+        в QueryHelper пошук через FTS5 там, де він доступний.
+        """
+        for model_class in TextSearch.searchable_models(models):
+            try:
+                with engine.begin() as connection:
+                    TextSearch._install_model(connection, model_class)
+            except DBAPIError:
+                # Немає FTS5/trigram або прав на розширення — лишається звичайний ILIKE
+                continue
+
+    @staticmethod
+    def _install_model(connection, model_class) -> None:
+        dialect_name = connection.dialect.name
+        table_name = model_class.__tablename__
+
+        if dialect_name == 'sqlite':
+            fts = _fts_name(table_name)
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': fts}
+            ).first()
+            for statement in TextSearch._statements(model_class, dialect_name):
+                connection.execute(text(statement))
+            if not exists:
+                # Заповнюємо індекс рядками, що з'явилися до його створення
+                connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+            for col_name in model_class.__searchable__:
+                QueryHelper.register_text_index(model_class, col_name, TextSearch._fts_condition(model_class, col_name))
+        else:
+            for statement in TextSearch._statements(model_class, dialect_name):
+                connection.execute(text(statement))
+
+    @staticmethod
+    def _fts_condition(model_class, col_name):
+        """Будує умову 'id IN (SELECT rowid FROM <table>_fts WHERE col LIKE шаблон)'."""
+        fts = table(_fts_name(model_class.__tablename__), column('rowid'), column(col_name))
+        pk = sa_inspect(model_class).primary_key[0]
+
+        def condition(pattern):
+            return pk.in_(select(fts.c.rowid).where(fts.c[col_name].like(pattern)))
+        return condition